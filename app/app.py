@@ -1,21 +1,145 @@
 # app/app.py
 from dash import Dash
+import flask
 import os
+import threading
 
-from app.layout import layout
-from app.callbacks import register_callbacks
+from app.layout import MODEL_TABS, layout, model_tab, year_bounds
+from app.callbacks import UNMEMOIZED_OUTPUTS, register_callbacks
+from app.export import export_response
+from app.jobs import background_manager
+from app.profiling import CallbackProfiler, MemoryTracker
+from app.responses import CallbackMemo, layout_payload
 
-# If any callbacks reference components not in the initial layout (tabs/pages),
-# keep suppress_callback_exceptions=True.
-app = Dash(__name__, suppress_callback_exceptions=True)
-server = app.server 
+# Replays identical callback requests without running the callback.
+callback_memo = CallbackMemo(exclude=UNMEMOIZED_OUTPUTS)
+# Samples callback stacks when PROFILE_CALLBACKS or PROFILE_TOKEN is set.
+callback_profiler = CallbackProfiler()
+# Traces per-callback peak and retained memory and RSS growth when MEMORY_METRICS=1.
+memory_tracker = MemoryTracker()
 
-app.title = "NHL Salary Inequality Analysis"
-app.layout = layout
-register_callbacks(app)
+# Set once warm-up has finished; /ready reports 503 until then.
+ready = threading.Event()
+
+
+class SalaryDash(Dash):
+    """
+    Dash application that serves /_dash-layout from a pre-encoded payload.
+
+    The layout JSON, its gzip/brotli encodings and its ETag are built once per
+    data version, so a layout request is a dictionary lookup and a write.
+    """
+
+    def serve_layout(self):
+        return layout_payload(self).response(flask.request)
+
+
+def warm_up(app):
+    """
+    Builds the per-version caches and default-selection figures ahead of traffic.
+
+    Runs the same builders the first page view would (layout, default year and
+    first team), then pushes one layout and dependency request through Flask so
+    Dash's own lazy setup is done too. Sets `ready` when finished.
+
+    Args:
+        app (Dash): Application to warm up.
+    """
+    from app.contracts import get_contract_points
+    from app.cube import get_salary_cube
+    from app.figures import (
+        get_team_options,
+        gini_vs_row_by_year,
+        glm_curve_fig,
+        salary_histogram,
+        team_series_matrix,
+        team_trend_figures,
+    )
+    from app.lorenz import get_lorenz_curves
+    from app.players import get_player_index
+    from app.similar import get_similar_rosters
+
+    default_year, max_year = year_bounds()
+    team_options = get_team_options()
+    with app.server.app_context():
+        layout_payload(app)
+        for tab in MODEL_TABS:
+            model_tab(tab)
+        for build in (
+            get_player_index,
+            get_salary_cube,
+            get_lorenz_curves,
+            get_similar_rosters,
+            get_contract_points,
+        ):
+            build()
+        team_series_matrix("ROW")
+        team_series_matrix("Gini")
+        gini_vs_row_by_year(default_year, "Gini")
+        glm_curve_fig()
+        if team_options:
+            team = team_options[0]["value"]
+            salary_histogram(team, default_year)
+            team_trend_figures(team, [default_year, max_year], "Gini")
+
+    client = app.server.test_client()
+    for path in ("/", "/_dash-layout", "/_dash-dependencies"):
+        client.get(path)
+    ready.set()
+
+
+def create_app(warm: bool = True) -> Dash:
+    """
+    Builds the Dash application.
+
+    Data is loaded when app.data is first imported, so with `gunicorn --preload`
+    the master loads and warms everything once and forked workers share it.
+
+    Args:
+        warm (bool): Run warm_up before returning. When False, /ready stays
+            503 until warm_up is called.
+
+    Returns:
+        Dash: Configured application.
+    """
+    # If any callbacks reference components not in the initial layout (tabs/pages),
+    # keep suppress_callback_exceptions=True.
+    app = SalaryDash(
+        __name__,
+        suppress_callback_exceptions=True,
+        background_callback_manager=background_manager,
+    )
+    app.title = "NHL Salary Inequality Analysis"
+    app.layout = layout
+    register_callbacks(app)
+    callback_memo.install(app)
+    callback_profiler.install(app)
+    memory_tracker.install(app)
+
+    @app.server.route("/ready")
+    def _ready():
+        if ready.is_set():
+            return "ready", 200
+        return "warming up", 503
+
+    @app.server.route("/export/<dataset>.<fmt>")
+    def _export(dataset, fmt):
+        return export_response(dataset, fmt, flask.request.args)
+
+    @app.server.route("/metrics")
+    def _metrics():
+        return flask.jsonify(memo=callback_memo.stats(), memory=memory_tracker.report())
+
+    if warm:
+        warm_up(app)
+    return app
+
+
+app = create_app(warm=os.getenv("SKIP_WARMUP") != "1")
+server = app.server
 
 if __name__ == "__main__":
-    app.run_server(
+    app.run(
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8050)),
         debug=True
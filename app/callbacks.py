@@ -1,51 +1,321 @@
-from dash import Input, Output
+from dash import Input, Output, State, ctx, no_update
+from app.contracts import contract_scatter_fig
 from app.figures import *
+from app.layout import MODEL_TABS, model_tab
+from app.lorenz import lorenz_fig
+from app.players import get_player_index, player_career_fig
+from app.views import (
+    export_links_view,
+    roster_builder_view,
+    row_simulation_view,
+    salary_trend_view,
+    similar_rosters_view,
+    team_salary_view,
+    team_trends_view,
+    whatif_view,
+)
+from app.whatif import RosterGini, sessions
 
 
+# Outputs that depend on server-side what-if sessions or run as background
+# jobs; their responses are never memoized.
+UNMEMOIZED_OUTPUTS = {
+    "wi-session.data",
+    "wi-player.options",
+    "wi-info-line.children",
+    "wi-cap-hit.value",
+    "wi-sim-graph.figure",
+    "wi-sim-line.children",
+    "rb-graph.figure",
+    "rb-info-line.children",
+    "rb-detail-line.children",
+    # Dash's own cancel callbacks for the roster builder job.
+    "rb-cancel.id",
+    "rb-year.id",
+    "rb-target.id",
+    "rb-size.id",
+    "rb-prev-row.id",
+}
+
+
+# Inputs that redraw only the team trend charts.
+TREND_INPUTS = {"trend-metric", "trend-compare", "trend-compare-all"}
+
+
+def _clicked_team(click_data) -> tuple:
+    """Returns the (team, year) of the logo scatter point clicked, or (None, None)."""
+    points = (click_data or {}).get("points") or [{}]
+    custom = points[0].get("customdata")
+    if not isinstance(custom, list) or len(custom) != 2:
+        return None, None
+    return custom[0], int(custom[1])
+
+
+def _whatif_reset(team, year) -> tuple:
+    """Returns the what-if outputs for a team's unedited roster, with no session."""
+    if not team or not year:
+        return None, [], "", no_update, no_update
+    roster = RosterGini.from_team(team, int(year))
+    return (
+        None,
+        *whatif_view(roster, team, int(year)),
+        *row_simulation_view(roster, team, int(year)),
+    )
+
+
+# The layout is rendered with every default selection's outputs already in
+# place, so no callback needs to run on page load.
 def register_callbacks(app):
     @app.callback(
         Output("logo-scatter-graph", "figure"),
+        Output("logo-year-dropdown", "disabled"),
         Input("logo-year-dropdown", "value"),
+        Input("logo-metric-dropdown", "value"),
+        Input("logo-animate", "value"),
+        prevent_initial_call=True,
     )
-    def _update_logo_scatter(year):
-        return gini_vs_row_by_year(year)
+    def _update_logo_scatter(year, metric, animate):
+        if animate:
+            # Seasons are frames of one cached figure; the year dropdown is idle.
+            if ctx.triggered_id == "logo-year-dropdown":
+                return no_update, True
+            return logo_scatter_animation(metric or "Gini"), True
+        return gini_vs_row_by_year(year, metric or "Gini"), False
 
+    # Every panel keyed by the selected team is served by this one callback:
+    # picking a team in either dropdown, or clicking a logo, keeps both
+    # dropdowns in sync and redraws the affected panels in a single request.
+    # Outputs an input cannot change are returned as no_update. A consumed
+    # click is cleared so later requests (and their memo keys) don't carry it.
+    # A new team or year also resets the what-if panel to the unedited roster
+    # here, without a session, so no further callback chains off the click.
     @app.callback(
+        Output("logo-scatter-graph", "clickData"),
+        Output("ts-team", "value"),
+        Output("ts-year", "value"),
+        Output("trend-team", "value"),
         Output("ts-graph", "figure"),
         Output("ts-info-line", "children"),
         Output("ts-roster-line", "children"),
+        Output("ts-similar-table", "data"),
+        Output("row-trend-graph", "figure"),
+        Output("gini-trend-graph", "figure"),
+        Output("salary-trend-graph", "figure"),
+        Output("salary-trend-line", "children"),
+        Output("export-salary-csv", "href"),
+        Output("export-salary-parquet", "href"),
+        Output("export-teams-csv", "href"),
+        Output("export-teams-parquet", "href"),
+        Output("wi-session", "data", allow_duplicate=True),
+        Output("wi-player", "options", allow_duplicate=True),
+        Output("wi-info-line", "children", allow_duplicate=True),
+        Output("wi-sim-graph", "figure", allow_duplicate=True),
+        Output("wi-sim-line", "children", allow_duplicate=True),
+        Input("logo-scatter-graph", "clickData"),
         Input("ts-team", "value"),
         Input("ts-year", "value"),
+        Input("trend-team", "value"),
+        Input("trend-years", "value"),
+        Input("trend-metric", "value"),
+        Input("trend-compare", "value"),
+        Input("trend-compare-all", "value"),
+        prevent_initial_call=True,
+    )
+    def _select_team(click, ts_team, year, trend_team, year_range, metric, compare, compare_all):
+        trigger = ctx.triggered_id
+        if trigger == "logo-scatter-graph":
+            team, clicked_year = _clicked_team(click)
+            if team is None:
+                return (None,) + (no_update,) * 20
+            year = clicked_year
+        else:
+            team = trend_team if trigger == "trend-team" else ts_team
+        selected = trigger in ("logo-scatter-graph", "ts-team", "trend-team")
+        if selected:
+            ts_team = trend_team = team
+
+        selection = (
+            None if trigger == "logo-scatter-graph" else no_update,
+            ts_team if trigger in ("logo-scatter-graph", "trend-team") else no_update,
+            year if trigger == "logo-scatter-graph" else no_update,
+            trend_team if trigger in ("logo-scatter-graph", "ts-team") else no_update,
+        )
+        salary = (no_update,) * 4
+        whatif = (no_update,) * 5
+        if selected or trigger == "ts-year":
+            salary = (*team_salary_view(ts_team, year), similar_rosters_view(ts_team, year))
+            whatif = _whatif_reset(ts_team, year)
+        trends = (no_update,) * 2
+        if selected or trigger == "trend-years" or trigger in TREND_INPUTS:
+            trends = team_trends_view(trend_team, year_range, metric, compare, compare_all)
+        distribution = (no_update,) * 6
+        if selected or trigger == "trend-years":
+            distribution = (
+                *salary_trend_view(trend_team, year_range),
+                *export_links_view(trend_team, year_range),
+            )
+        return (*selection, *salary, *trends, *distribution, *whatif)
+
+    @app.callback(
+        Output("wi-session", "data"),
+        Output("wi-player", "options"),
+        Output("wi-info-line", "children"),
+        Output("wi-sim-graph", "figure"),
+        Output("wi-sim-line", "children"),
+        Input("wi-reset", "n_clicks"),
+        Input("wi-cap-hit", "value"),
+        Input("wi-add", "n_clicks"),
+        Input("wi-remove", "n_clicks"),
+        State("ts-team", "value"),
+        State("ts-year", "value"),
+        State("wi-session", "data"),
+        State("wi-player", "value"),
+        State("wi-new-player", "value"),
+        State("wi-new-cap-hit", "value"),
+        prevent_initial_call=True,
     )
-    def update_team_salary(team, year):
-        year = int(year)
+    def _update_whatif(
+        _reset, cap_hit, _add, _remove, team, year, state, player, new_player, new_cap_hit
+    ):
         if not team or not year:
-            return {}, "", ""
-        fig = salary_histogram(team, int(year))
-        name = TEAM_NAME_MAP.get(team, team)
-        g = get_gini(team, year)
-        roster_size = get_roster_size(team, year)
-        info = f"{name} — Gini Coefficient: {g:.3f}" if g == g else f"{name}"
-        roster = (
-            f"Roster Size: {roster_size} players" if roster_size else "Roster Size: N/A"
+            return None, [], "", no_update, no_update
+        trigger = ctx.triggered_id
+        started = (
+            state is None
+            or trigger == "wi-reset"
+            or (state["team"], state["year"]) != (team, int(year))
+        )
+        if started:
+            # The page arrives without a session; the first edit opens one.
+            state = sessions.start(team, int(year))
+        if trigger == "wi-cap-hit" and player and cap_hit is not None and cap_hit >= 0:
+            roster = sessions.edit(state, player, float(cap_hit))
+        elif trigger == "wi-add" and new_player and new_cap_hit is not None and new_cap_hit >= 0:
+            roster = sessions.edit(state, new_player.strip(), float(new_cap_hit))
+        elif trigger == "wi-remove" and player:
+            roster = sessions.edit(state, player, None)
+        elif started:
+            roster = sessions.get(state)
+        else:
+            return (no_update,) * 5
+        return (
+            state,
+            *whatif_view(roster, team, int(year)),
+            *row_simulation_view(roster, team, int(year)),
         )
-        return fig, info, roster
 
     @app.callback(
-        Output("row-trend-graph", "figure"),
-        Output("gini-trend-graph", "figure"),
-        Input("trend-team", "value"),
-        Input("trend-years", "value"),
+        Output("wi-cap-hit", "value"),
+        Input("wi-player", "value"),
+        State("wi-session", "data"),
+        State("ts-team", "value"),
+        State("ts-year", "value"),
+        prevent_initial_call=True,
+    )
+    def _fill_whatif_cap_hit(player, state, team, year):
+        if not player:
+            return no_update
+        if state:
+            roster = sessions.get(state)
+        elif team and year:
+            roster = RosterGini.from_team(team, int(year))
+        else:
+            return no_update
+        return roster.salaries.get(player, no_update)
+
+    @app.callback(
+        Output("player-search", "options"),
+        Input("player-search", "search_value"),
+        State("player-search", "value"),
+        prevent_initial_call=True,
+    )
+    def _search_players(search, selected):
+        if not search:
+            return no_update
+        names = get_player_index().search(search)
+        if selected and selected not in names:
+            names = [selected] + names
+        return [{"label": name, "value": name} for name in names]
+
+    @app.callback(
+        Output("player-career-graph", "figure"),
+        Input("player-search", "value"),
+        prevent_initial_call=True,
+    )
+    def _update_player_career(player):
+        if not player:
+            return {}
+        return player_career_fig(player)
+
+    @app.callback(
+        Output("contracts-graph", "figure"),
+        Input("contracts-x", "value"),
+        Input("contracts-graph", "relayoutData"),
+        prevent_initial_call=True,
     )
-    def _update_team_trends(team, year_range):
-        if not team or not year_range:
-            return {}, {}
-        return team_trend_figures(team, year_range)
+    def _update_contract_scatter(column, relayout_data):
+        if ctx.triggered_id == "contracts-x":
+            relayout_data = None
+        return contract_scatter_fig(column or "ROW", relayout_data)
+
+    @app.callback(
+        Output("lorenz-graph", "figure"),
+        Input("lorenz-teams", "value"),
+        Input("lorenz-years", "value"),
+        prevent_initial_call=True,
+    )
+    def _update_lorenz(teams, years):
+        if not years:
+            return {}
+        return lorenz_fig(teams or [], years)
+
+    @app.callback(
+        Output("model-tab-content", "children"),
+        Input("model-tabs", "value"),
+        prevent_initial_call=True,
+    )
+    def _load_model_tab(tab):
+        return model_tab(tab if tab in MODEL_TABS else "overview")
 
     @app.callback(
         Output("glm-plot", "figure"),
         Output("glm-table", "data"),
         Input("logo-year-dropdown", "value"),
+        prevent_initial_call=True,
     )
     def _refresh_glm(_):
         return glm_curve_fig(), glm_table_records()
+
+    @app.callback(
+        Output("rb-graph", "figure"),
+        Output("rb-info-line", "children"),
+        Output("rb-detail-line", "children"),
+        Input("rb-run", "n_clicks"),
+        State("rb-year", "value"),
+        State("rb-target", "value"),
+        State("rb-size", "value"),
+        State("rb-prev-row", "value"),
+        background=True,
+        running=[
+            (Output("rb-run", "disabled"), True, False),
+            (Output("rb-cancel", "disabled"), False, True),
+        ],
+        # Editing any setting abandons a build that no longer matches the form.
+        cancel=[
+            Input("rb-cancel", "n_clicks"),
+            Input("rb-year", "value"),
+            Input("rb-target", "value"),
+            Input("rb-size", "value"),
+            Input("rb-prev-row", "value"),
+        ],
+        progress=[Output("rb-progress", "value"), Output("rb-progress", "max")],
+        prevent_initial_call=True,
+    )
+    def _build_roster(set_progress, _, year, target, size_range, row_prev):
+        return roster_builder_view(
+            year,
+            target,
+            size_range,
+            row_prev,
+            progress=lambda done, total: set_progress((str(done), str(total))),
+        )
@@ -5,3 +5,30 @@ GRID = "#E2E8F0"
 ACCENT = "#A8D8FF"
 DARK_RED = "#B22222"
 LIGHT_RED = "#C8102E"
+
+OPTIMAL_GINI = 0.408
+
+# NHL upper salary cap by season start year (USD)
+SALARY_CAP = {
+    2015: 71_400_000,
+    2016: 73_000_000,
+    2017: 75_000_000,
+    2018: 79_500_000,
+    2019: 81_500_000,
+    2020: 81_500_000,
+    2021: 81_500_000,
+    2022: 82_500_000,
+    2023: 83_500_000,
+    2024: 88_000_000,
+}
+
+# Display names for the team-season inequality metrics
+METRIC_LABELS = {
+    "Gini": "Gini Coefficient",
+    "Theil": "Theil Index",
+    "Atkinson0.5": "Atkinson Index (ε = 0.5)",
+    "Atkinson1": "Atkinson Index (ε = 1)",
+    "HHI": "Herfindahl Index",
+    "Top3Share": "Top-3 Cap Share",
+    "CV": "Coefficient of Variation",
+}
@@ -0,0 +1,200 @@
+"""
+League-wide contract scatter for the NHL Salary Inequality Analysis Dash app.
+
+Plots every player-season cap hit against its team's ROW or inequality metric.
+The points are held as NumPy arrays per data version. When the visible axis
+range holds more than MAX_POINTS contracts, the server bins them onto a fixed
+2D grid and sends a heatmap instead, so the browser never receives more than
+max(MAX_POINTS, BINS²) marks however many seasons accumulate. Zooming re-bins
+the visible window through the graph's relayoutData.
+"""
+
+# app/contracts.py
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from app.constants import METRIC_LABELS, NAVY
+from app.data import per_version
+from app.pipeline import INEQUALITY_METRICS
+from app.themes import apply_plot_style
+
+MAX_POINTS = 5_000
+BINS = 60
+
+
+class ContractPoints:
+    """
+    Player-season cap hits joined to their team-season columns.
+
+    Built one salary frame at a time. Hover labels are kept as player, team and
+    season codes and only formatted for the points a figure actually draws.
+
+    Args:
+        seasons (iterable): Cleaned salary frames, e.g. SalaryPartitions.iter_seasons().
+        teams (pd.DataFrame): Team panel.
+    """
+
+    def __init__(self, seasons, teams):
+        columns = ["Team", "Year", "ROW"] + INEQUALITY_METRICS
+        panel = teams[columns]
+        self._teams = np.array(sorted(panel["Team"].unique()), dtype=object)
+        player_ids, self._players = {}, []
+        parts = {c: [] for c in ["Cap Hit", "Player", "Team", "Year"] + columns[2:]}
+        for salary in seasons:
+            joined = salary[salary["Cap Hit"] > 0].merge(panel, on=["Team", "Year"], how="inner")
+            names, inverse = np.unique(joined["Player"].to_numpy(dtype=object), return_inverse=True)
+            for name in names:
+                if name not in player_ids:
+                    player_ids[name] = len(self._players)
+                    self._players.append(name)
+            codes = np.array([player_ids[name] for name in names], dtype=np.int32)
+            parts["Player"].append(codes[inverse])
+            parts["Team"].append(np.searchsorted(self._teams, joined["Team"].to_numpy(dtype=object)))
+            parts["Year"].append(joined["Year"].to_numpy(dtype=np.int32))
+            for c in ["Cap Hit"] + columns[2:]:
+                parts[c].append(joined[c].to_numpy(dtype=float))
+        arrays = {c: np.concatenate(v) if v else np.array([]) for c, v in parts.items()}
+        # Team-major order, as in the salary table, whatever order the seasons come in.
+        order = np.lexsort((arrays["Year"], arrays["Team"]))
+        self.cap_hit = arrays["Cap Hit"][order]
+        self.columns = {c: arrays[c][order] for c in columns[2:]}
+        self._player = arrays["Player"][order].astype(np.int32)
+        self._team = arrays["Team"][order].astype(np.int32)
+        self._year = arrays["Year"][order].astype(np.int32)
+
+    def labels(self, rows) -> np.ndarray:
+        """
+        Returns "Player — Team Year" hover labels for some contracts.
+
+        Args:
+            rows (np.ndarray): Row positions.
+
+        Returns:
+            np.ndarray: Labels as an object array.
+        """
+        return np.array(
+            [
+                f"{self._players[p]} — {self._teams[t]} {y}"
+                for p, t, y in zip(self._player[rows], self._team[rows], self._year[rows])
+            ],
+            dtype=object,
+        )
+
+    def window(self, column: str, x_range=None, y_range=None) -> np.ndarray:
+        """
+        Returns positions of contracts with a known x value inside the axis ranges.
+
+        Args:
+            column (str): Team panel column on the x-axis.
+            x_range (list): [min, max] on the x-axis, or None for all.
+            y_range (list): [min, max] cap hit, or None for all.
+
+        Returns:
+            np.ndarray: Row positions.
+        """
+        x = self.columns[column]
+        mask = ~np.isnan(x)
+        if x_range:
+            mask &= (x >= x_range[0]) & (x <= x_range[1])
+        if y_range:
+            mask &= (self.cap_hit >= y_range[0]) & (self.cap_hit <= y_range[1])
+        return np.flatnonzero(mask)
+
+
+@per_version
+def get_contract_points(data) -> ContractPoints:
+    """
+    Returns the contract points for the current data version, building them once.
+
+    Returns:
+        ContractPoints: Points over the current salary table, built season by season.
+    """
+    return ContractPoints(data.salary.iter_seasons(), data.teams)
+
+
+def parse_relayout(relayout_data) -> tuple:
+    """
+    Extracts zoomed axis ranges from a graph's relayoutData.
+
+    Args:
+        relayout_data (dict): Graph relayoutData, possibly None.
+
+    Returns:
+        tuple: (x_range, y_range); each None when that axis is autoranged.
+    """
+    ranges = []
+    for axis in ("xaxis", "yaxis"):
+        data = relayout_data or {}
+        if f"{axis}.range[0]" in data:
+            ranges.append([data[f"{axis}.range[0]"], data[f"{axis}.range[1]"]])
+        elif f"{axis}.range" in data:
+            ranges.append(list(data[f"{axis}.range"]))
+        else:
+            ranges.append(None)
+    return tuple(ranges)
+
+
+def _edges(bounds) -> np.ndarray:
+    """Returns BINS + 1 bin edges spanning bounds, widened if the span is empty."""
+    lo, hi = float(bounds[0]), float(bounds[1])
+    if hi <= lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, BINS + 1)
+
+
+def contract_scatter_fig(column: str = "ROW", relayout_data=None):
+    """
+    Creates the cap hit vs team column plot, binned when the view is dense.
+
+    Args:
+        column (str): "ROW" or one of INEQUALITY_METRICS for the x-axis.
+        relayout_data (dict): Graph relayoutData carrying the current zoom.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Plotly figure object.
+    """
+    points = get_contract_points()
+    x_range, y_range = parse_relayout(relayout_data)
+    rows = points.window(column, x_range, y_range)
+    x, y = points.columns[column][rows], points.cap_hit[rows]
+    label = METRIC_LABELS.get(column, "Regulation + Overtime Wins")
+    x_fmt = ".0f" if column == "ROW" else ".3f"
+
+    if len(rows) > MAX_POINTS:
+        x_edges = _edges(x_range or (x.min(), x.max()))
+        y_edges = _edges(y_range or (y.min(), y.max()))
+        counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+        fig = go.Figure(
+            go.Heatmap(
+                x=(x_edges[:-1] + x_edges[1:]) / 2,
+                y=(y_edges[:-1] + y_edges[1:]) / 2,
+                z=np.where(counts.T > 0, counts.T, np.nan),
+                colorscale=[[0, "#A8D8FF"], [1, NAVY]],
+                colorbar=dict(title="Contracts"),
+                hovertemplate=f"{column} %{{x:{x_fmt}}}<br>Cap Hit $%{{y:,.0f}}<br>%{{z}} contracts<extra></extra>",
+            )
+        )
+        mode = f"{len(rows):,} contracts, binned"
+    else:
+        fig = go.Figure(
+            go.Scattergl(
+                x=x,
+                y=y,
+                text=points.labels(rows),
+                mode="markers",
+                marker=dict(color=NAVY, size=5, opacity=0.5),
+                hovertemplate=f"%{{text}}<br>{column} %{{x:{x_fmt}}}<br>Cap Hit $%{{y:,.0f}}<extra></extra>",
+            )
+        )
+        mode = f"{len(rows):,} contracts"
+
+    fig.update_xaxes(title=label)
+    fig.update_yaxes(tickprefix="$", separatethousands=True, title="Cap Hit (USD)")
+    if x_range:
+        fig.update_xaxes(range=x_range)
+    if y_range:
+        fig.update_yaxes(range=y_range)
+    fig = apply_plot_style(fig, title=f"Player Cap Hits vs Team {label} ({mode})")
+    fig.update_layout(uirevision=column)
+    return fig
@@ -0,0 +1,257 @@
+"""
+Team × season salary aggregate cube for the NHL Salary Inequality Analysis Dash app.
+
+Every (Team, Year) cell holds mergeable summaries of its cap hits: count, sum,
+sum of squares and a log-bucketed quantile sketch. Bucket k covers
+(gamma^(k-1), gamma^k] with gamma = (1 + ALPHA) / (1 - ALPHA), so any quantile
+read from the sketch is within ALPHA relative error of a true cap hit. All four
+summaries merge by addition, so a team over a year range, or the whole league in
+one season, is a sum over a slice of cells instead of a rescan of the salary rows.
+"""
+
+# app/cube.py
+import numpy as np
+import plotly.graph_objects as go
+
+from app.constants import LIGHT_RED, NAVY
+from app.data import per_version
+from app.themes import apply_plot_style
+
+ALPHA = 0.01
+GAMMA = (1 + ALPHA) / (1 - ALPHA)
+TREND_QUANTILES = (0.1, 0.5, 0.9)
+
+
+def _cells(salary):
+    """
+    Summarizes one salary frame's team-season cells.
+
+    Returns:
+        tuple or None: (teams, years, count, total, sumsq, sketch, min_key), with
+        the cell arrays shaped (len(teams), len(years)) and the sketch holding
+        buckets min_key, min_key + 1, ... on its last axis; None if the frame
+        has no positive cap hits.
+    """
+    salary = salary[salary["Cap Hit"] > 0]
+    if salary.empty:
+        return None
+    teams, t = np.unique(salary["Team"].to_numpy(dtype=object), return_inverse=True)
+    years, y = np.unique(salary["Year"].to_numpy(), return_inverse=True)
+    x = salary["Cap Hit"].to_numpy(dtype=float)
+    keys = np.ceil(np.log(x) / np.log(GAMMA)).astype(int)
+    min_key = int(keys.min())
+    n_keys = int(keys.max()) - min_key + 1
+
+    shape = (len(teams), len(years))
+    cell = np.ravel_multi_index((t, y), shape)
+    size = int(np.prod(shape))
+    count = np.bincount(cell, minlength=size).reshape(shape)
+    total = np.bincount(cell, weights=x, minlength=size).reshape(shape)
+    sumsq = np.bincount(cell, weights=x * x, minlength=size).reshape(shape)
+    sketch = np.bincount(cell * n_keys + keys - min_key, minlength=size * n_keys).reshape(
+        shape + (n_keys,)
+    )
+    return teams, years, count, total, sumsq, sketch, min_key
+
+
+class SalaryCube:
+    """
+    Count, sum, sum-of-squares and quantile-sketch summaries per team-season.
+
+    The cells are additive, so the cube is built one salary frame at a time
+    and any split of the rows (normally one frame per season) gives the same
+    cube.
+
+    Args:
+        seasons (iterable): Cleaned salary frames, e.g. SalaryPartitions.iter_seasons().
+    """
+
+    def __init__(self, seasons):
+        parts = [_cells(salary) for salary in seasons]
+        parts = [part for part in parts if part is not None]
+        self.teams = sorted(set().union(*(part[0] for part in parts)))
+        self.years = np.unique(np.concatenate([part[1] for part in parts])).astype(int)
+        self._team_ids = {team: i for i, team in enumerate(self.teams)}
+        self._min_key = min(part[6] for part in parts)
+        n_keys = max(part[6] + part[5].shape[-1] for part in parts) - self._min_key
+
+        shape = (len(self.teams), len(self.years))
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.total = np.zeros(shape)
+        self.sumsq = np.zeros(shape)
+        self.sketch = np.zeros(shape + (n_keys,), dtype=np.int32)
+        for teams, years, count, total, sumsq, sketch, min_key in parts:
+            cells = np.ix_(np.searchsorted(self.teams, teams), np.searchsorted(self.years, years))
+            self.count[cells] += count
+            self.total[cells] += total
+            self.sumsq[cells] += sumsq
+            lo = min_key - self._min_key
+            self.sketch[cells + (slice(lo, lo + sketch.shape[-1]),)] += sketch.astype(np.int32)
+        self._bucket_values = 2 * GAMMA ** np.arange(self._min_key, self._min_key + n_keys) / (
+            GAMMA + 1
+        )
+
+    def _slices(self, team, year_range):
+        teams = slice(None) if team is None else self._team_ids.get(team, len(self.teams))
+        lo, hi = year_range if year_range else (self.years[0], self.years[-1])
+        years = slice(
+            np.searchsorted(self.years, int(lo)), np.searchsorted(self.years, int(hi), "right")
+        )
+        return teams, years
+
+    def _quantiles(self, sketch, quantiles):
+        """Reads quantiles off sketches whose last axis is the bucket axis."""
+        cum = np.cumsum(sketch, axis=-1)
+        n = cum[..., -1:]
+        ranks = np.asarray(quantiles) * np.maximum(n - 1, 0)
+        idx = (cum[..., None, :] <= ranks[..., None]).sum(axis=-1)
+        values = self._bucket_values[np.minimum(idx, len(self._bucket_values) - 1)]
+        return np.where(n > 0, values, np.nan)
+
+    def summary(self, team=None, year_range=None, quantiles=TREND_QUANTILES) -> dict:
+        """
+        Merges the cells for one team (or the league) over a range of seasons.
+
+        Args:
+            team (str): Team abbreviation, or None for every team.
+            year_range (list): [start_year, end_year], or None for all seasons.
+            quantiles (tuple): Probabilities in [0, 1].
+
+        Returns:
+            dict: count, total, mean, std and quantile -> cap hit.
+        """
+        teams, years = self._slices(team, year_range)
+        if teams == len(self.teams):
+            return {"count": 0, "total": 0.0, "mean": np.nan, "std": np.nan}
+        n = int(self.count[teams, years].sum())
+        total = float(self.total[teams, years].sum())
+        sumsq = float(self.sumsq[teams, years].sum())
+        sketch = self.sketch[teams, years].reshape(-1, self.sketch.shape[-1]).sum(axis=0)
+        mean = total / n if n else np.nan
+        result = {
+            "count": n,
+            "total": total,
+            "mean": mean,
+            "std": np.sqrt(max(sumsq / n - mean * mean, 0.0)) if n else np.nan,
+        }
+        result.update(zip(quantiles, self._quantiles(sketch, quantiles).tolist()))
+        return result
+
+    def quantile_trend(self, team=None, year_range=None, quantiles=TREND_QUANTILES):
+        """
+        Returns cap hit quantiles for each season of a team (or the league).
+
+        Args:
+            team (str): Team abbreviation, or None for every team.
+            year_range (list): [start_year, end_year], or None for all seasons.
+            quantiles (tuple): Probabilities in [0, 1].
+
+        Returns:
+            tuple: (years, array of shape (len(years), len(quantiles))).
+        """
+        teams, years = self._slices(team, year_range)
+        if teams == len(self.teams):
+            return self.years[years], np.full((0, len(quantiles)), np.nan)
+        sketch = self.sketch[teams, years]
+        if team is None:
+            sketch = sketch.sum(axis=0)
+        return self.years[years], self._quantiles(sketch, quantiles)
+
+
+@per_version
+def get_salary_cube(data) -> SalaryCube:
+    """
+    Returns the salary cube for the current data version, building it once.
+
+    Returns:
+        SalaryCube: Cube over the current salary table, built season by season.
+    """
+    return SalaryCube(data.salary.iter_seasons())
+
+
+def salary_range_summary(team: str, year_range: list) -> str:
+    """
+    Summarizes a team's cap hits over a range of seasons in one line.
+
+    Args:
+        team (str): Team abbreviation.
+        year_range (list): [start_year, end_year].
+
+    Returns:
+        str: Contract count, mean, median and 90th percentile cap hit.
+    """
+    s = get_salary_cube().summary(team, year_range)
+    if not s["count"]:
+        return "No contracts in the selected seasons."
+    return (
+        f"{year_range[0]}–{year_range[1]}: {s['count']} contracts · "
+        f"mean ${s['mean']:,.0f} · median ${s[0.5]:,.0f} · "
+        f"90th percentile ${s[0.9]:,.0f}"
+    )
+
+
+def salary_distribution_trend_fig(team: str, year_range: list, name: str = None):
+    """
+    Creates a cap hit distribution trend: the team's 10th–90th percentile band
+    and median per season against the league median.
+
+    Args:
+        team (str): Team abbreviation.
+        year_range (list): [start_year, end_year].
+        name (str): Display name for the title. Defaults to the abbreviation.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Plotly figure object.
+    """
+    cube = get_salary_cube()
+    years, q = cube.quantile_trend(team, year_range)
+    league_years, league_q = cube.quantile_trend(None, year_range)
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(
+            x=years, y=q[:, 2], mode="lines", line=dict(width=0), showlegend=False,
+            hoverinfo="skip",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=years,
+            y=q[:, 0],
+            mode="lines",
+            line=dict(width=0),
+            fill="tonexty",
+            fillcolor="rgba(0, 34, 68, 0.15)",
+            name="10th–90th percentile",
+            hoverinfo="skip",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=years,
+            y=q[:, 1],
+            mode="lines+markers",
+            line=dict(color=NAVY),
+            marker=dict(color=NAVY),
+            name="Team median",
+            customdata=q[:, [0, 2]],
+            hovertemplate=(
+                "Year %{x}<br>Median $%{y:,.0f}<br>"
+                "P10 $%{customdata[0]:,.0f} · P90 $%{customdata[1]:,.0f}<extra></extra>"
+            ),
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=league_years,
+            y=league_q[:, 1],
+            mode="lines",
+            line=dict(color=LIGHT_RED, dash="dash"),
+            name="League median",
+            hovertemplate="Year %{x}<br>League median $%{y:,.0f}<extra></extra>",
+        )
+    )
+    fig.update_xaxes(dtick=1, title=None)
+    fig.update_yaxes(tickprefix="$", separatethousands=True, title="Cap Hit (USD)")
+    fig = apply_plot_style(fig, title=f"{name or team} Cap Hit Distribution Over Time")
+    return fig
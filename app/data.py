@@ -0,0 +1,453 @@
+"""
+Versioned data access for the NHL Salary Inequality Analysis Dash app.
+
+The team panel and player salaries are held in an immutable Dataset snapshot.
+The team panel is loaded whole; the salary table stays partitioned by season
+and each season is read from data/processed/ when first asked for, so no
+request path and no startup step holds the whole salary history at once.
+Request handlers read the active snapshot through current(); ingesting a season
+builds a new snapshot, persists the CSVs and bumps data/VERSION. Every worker
+process notices the new version on its next read (checked at most once per
+RELOAD_INTERVAL seconds) and swaps snapshots with a single reference
+assignment, so in-flight requests keep the snapshot they started with. The
+pipeline never rewrites a salary partition in place and keeps superseded files
+until the following version is published, so a worker still on the previous
+snapshot reads that snapshot's own rows until it reloads.
+
+Snapshot frames are handed out as copy-on-write views, so an in-place edit in
+one request never leaks into another thread. Anything derived from a snapshot
+is cached through per_version, which builds each entry once per data version
+under a lock.
+"""
+
+# app/data.py
+import csv
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from app.pipeline import (
+    DATA_DIR,
+    SALARY_FILE,
+    SALARY_SCHEMA,
+    TEAM_SCHEMA,
+    TEAMS_FILE,
+    build,
+    clean_salary,
+    read_partition,
+    read_processed,
+    run,
+    team_season_stats,
+    write_processed,
+)
+
+# Copy-on-write is always on from pandas 3; older versions opt in.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+VERSION_FILE = "VERSION"
+RELOAD_INTERVAL = 2.0
+SEASON_CACHE = 4
+
+SALARY_COLUMNS = ["Season", "Player", "Year", "Team", "Cap Hit"]
+STANDINGS_COLUMNS = ["Team", "Year", "GP", "ROW"]
+TEAM_COLUMNS = [
+    "Team",
+    "Year",
+    "GP",
+    "ROW",
+    "Ave.Salary",
+    "Salary.Variation",
+    "Gini",
+    "Gini2",
+    "RosterSize",
+    "Team.Name",
+    "ROW_prev_actual",
+]
+
+
+def empty_salary() -> pd.DataFrame:
+    """Returns a salary table with no rows and the salary schema."""
+    return pd.DataFrame({c: pd.Series(dtype=t) for c, t in SALARY_SCHEMA.items()})
+
+
+class SalaryPartitions(Mapping):
+    """
+    Read-only map of season -> that season's salary rows.
+
+    A season is either a frame held in memory or a Parquet partition read on
+    first access; the SEASON_CACHE most recently used partitions stay loaded.
+    iter_seasons() streams every season without touching the cache, so an
+    aggregate built from it holds one season at a time. Frames are handed out
+    as shallow copies, like the Dataset's.
+
+    Args:
+        sources (dict): Season -> pd.DataFrame or partition path.
+        cache_size (int): Number of loaded partitions to keep.
+    """
+
+    def __init__(self, sources: dict, cache_size: int = SEASON_CACHE):
+        self._sources = {int(year): sources[year] for year in sorted(sources)}
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def __getitem__(self, year) -> pd.DataFrame:
+        year = int(year)
+        source = self._sources[year]
+        if isinstance(source, pd.DataFrame):
+            return source.copy(deep=False)
+        with self._lock:
+            frame = self._cache.get(year)
+            if frame is not None:
+                self._cache.move_to_end(year)
+                return frame.copy(deep=False)
+        frame = read_partition(source)
+        with self._lock:
+            self._cache[year] = frame
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return frame.copy(deep=False)
+
+    def __contains__(self, year) -> bool:
+        try:
+            return int(year) in self._sources
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        return iter(self._sources)
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def season(self, year) -> pd.DataFrame:
+        """
+        Returns one season's rows, or an empty salary table if it is absent.
+
+        Args:
+            year (int): Season start year.
+
+        Returns:
+            pd.DataFrame: Salary rows of the season.
+        """
+        return self[year] if year in self else empty_salary()
+
+    def iter_seasons(self, years=None):
+        """
+        Yields each season's rows in season order, reading uncached partitions
+        without caching them.
+
+        Args:
+            years (tuple): (start_year, end_year) to limit the seasons, or None
+                for every season.
+
+        Yields:
+            pd.DataFrame: Salary rows of one season.
+        """
+        for year, source in list(self._sources.items()):
+            if years is not None and not years[0] <= year <= years[1]:
+                continue
+            if isinstance(source, pd.DataFrame):
+                yield source.copy(deep=False)
+                continue
+            with self._lock:
+                frame = self._cache.get(year)
+            yield (frame if frame is not None else read_partition(source)).copy(deep=False)
+
+    def replace(self, year, season: pd.DataFrame) -> "SalaryPartitions":
+        """
+        Returns a copy with one season's rows replaced (dropped if empty).
+
+        Args:
+            year (int): Season start year.
+            season (pd.DataFrame): New rows of the season.
+
+        Returns:
+            SalaryPartitions: New map sharing the other seasons' sources.
+        """
+        sources = dict(self._sources)
+        sources.pop(int(year), None)
+        if not season.empty:
+            sources[int(year)] = season.reset_index(drop=True)
+        return SalaryPartitions(sources, self._cache_size)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """
+    Immutable snapshot of the team panel and player salaries.
+
+    Each frame property returns a fresh shallow copy. Under pandas
+    copy-on-write these share the snapshot's buffers until written to, so a
+    caller that edits its frame gets a private copy and the shared snapshot
+    never changes underneath another thread. The salary table is a
+    SalaryPartitions map keyed by season.
+    """
+
+    _teams: pd.DataFrame
+    _salary: SalaryPartitions
+    _model_sample: pd.DataFrame
+    version: int
+
+    @property
+    def teams(self) -> pd.DataFrame:
+        return self._teams.copy(deep=False)
+
+    @property
+    def salary(self) -> SalaryPartitions:
+        return self._salary
+
+    @property
+    def model_sample(self) -> pd.DataFrame:
+        return self._model_sample.copy(deep=False)
+
+
+def _build(teams: pd.DataFrame, salary: SalaryPartitions, version: int) -> Dataset:
+    model_sample = teams[
+        teams["Gini"].notnull()
+        & teams["ROW"].notnull()
+        & teams["ROW_prev_actual"].notnull()
+    ].copy()
+    return Dataset(teams, salary, model_sample, version)
+
+
+def read_version(data_dir: Path = DATA_DIR) -> int:
+    """
+    Reads the data version stamp; a missing stamp is version 0.
+
+    Args:
+        data_dir (Path): Directory holding the data files.
+
+    Returns:
+        int: Data version.
+    """
+    try:
+        return int((data_dir / VERSION_FILE).read_text().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def load_dataset(data_dir: Path = DATA_DIR) -> Dataset:
+    """
+    Loads the processed dataset, rebuilding it from the raw CSVs if it is stale.
+
+    The rebuild streams the raw salary CSV through the chunked pipeline; the
+    in-memory build is only used when data/processed/ cannot be written. Only
+    the team panel is read here; salary seasons are read on demand.
+
+    Args:
+        data_dir (Path): Directory holding the data files.
+
+    Returns:
+        Dataset: Fresh snapshot stamped with the on-disk version.
+    """
+    version = read_version(data_dir)
+    processed = read_processed(version, data_dir)
+    if processed is None:
+        try:
+            run(data_dir, version)
+            processed = read_processed(version, data_dir)
+        except OSError:
+            pass
+    if processed is None:
+        standings = pd.read_csv(data_dir / TEAMS_FILE)
+        standings.columns = standings.columns.str.strip()
+        teams, salary = build(pd.read_csv(data_dir / SALARY_FILE), standings)
+        seasons = {year: season.reset_index(drop=True) for year, season in salary.groupby("Year")}
+        processed = teams, seasons
+    teams, seasons = processed
+    return _build(teams, SalaryPartitions(seasons), version)
+
+
+_lock = threading.Lock()
+_current = load_dataset()
+_last_check = time.monotonic()
+
+
+def current() -> Dataset:
+    """
+    Returns the active data snapshot, swapping in a newer on-disk version if one exists.
+
+    Returns:
+        Dataset: Active snapshot.
+    """
+    global _current, _last_check
+    now = time.monotonic()
+    if now - _last_check < RELOAD_INTERVAL:
+        return _current
+    with _lock:
+        if now - _last_check >= RELOAD_INTERVAL:
+            _last_check = now
+            if read_version() != _current.version:
+                _current = load_dataset()
+    return _current
+
+
+def per_version(build):
+    """
+    Caches a value derived from the data snapshot, once per data version.
+
+    The decorated function receives the active Dataset followed by its own
+    arguments; callers pass only those arguments. Entries are built under a
+    lock, so concurrent requests share one build, and are dropped when the
+    data version changes.
+
+    Args:
+        build (callable): build(data, *args) -> value.
+
+    Returns:
+        callable: Function of *args returning the cached value.
+    """
+    lock = threading.Lock()
+    entries = {}
+
+    @functools.wraps(build)
+    def cached(*args):
+        data = current()
+        key = (data.version,) + args
+        with lock:
+            if key not in entries:
+                if any(k[0] != data.version for k in entries):
+                    entries.clear()
+                entries[key] = build(data, *args)
+            return entries[key]
+
+    return cached
+
+
+def _format_cell(value) -> str:
+    """Formats one Teams.csv cell the way R's write.csv does."""
+    if isinstance(value, str):
+        return f'"{value}"'
+    if pd.isna(value):
+        return "NA"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _write_teams(teams: pd.DataFrame, path: Path):
+    lines = [",".join(f'"{c}"' for c in TEAM_COLUMNS)]
+    for row in teams[TEAM_COLUMNS].itertuples(index=False):
+        lines.append(",".join(_format_cell(v) for v in row))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _write_atomic(path: Path, write):
+    tmp = path.with_name(f".{path.name}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _replace_raw_season(source: Path, year: int, contracts: pd.DataFrame, path: Path):
+    """
+    Copies the raw salary CSV to path line by line, swapping one season's rows.
+
+    Other seasons' lines are copied verbatim, so a rewrite only changes the
+    ingested season's rows.
+    """
+    with (
+        open(source, encoding="utf-8-sig", newline="") as src,
+        open(path, "w", encoding="utf-8-sig", newline="") as dst,
+    ):
+        header = src.readline()
+        dst.write(header)
+        column = next(csv.reader([header])).index("Year")
+        line = header
+        for line in src:
+            if not _in_season(next(csv.reader([line]))[column], year):
+                dst.write(line)
+        if not line.endswith("\n"):
+            dst.write("\n")
+        contracts.to_csv(dst, index=False, header=False, lineterminator="\n")
+
+
+def _in_season(field: str, year: int) -> bool:
+    try:
+        return float(field) == year
+    except ValueError:
+        return False
+
+
+def ingest_season(
+    contracts: pd.DataFrame, standings: pd.DataFrame, data_dir: Path = DATA_DIR
+) -> Dataset:
+    """
+    Appends (or replaces) one season of contracts and standings and publishes it.
+
+    Only the ingested season's derived columns (including its inequality
+    metrics) are computed, plus the following season's ROW_prev_actual when
+    that season is already present.
+
+    Args:
+        contracts (pd.DataFrame): Player, Team, Year and Cap Hit (Season optional).
+        standings (pd.DataFrame): Team, Year, GP and ROW (Team.Name optional).
+        data_dir (Path): Directory holding the data files.
+
+    Returns:
+        Dataset: The newly published snapshot.
+    """
+    global _current, _last_check
+    missing = set(SALARY_COLUMNS[1:]) - set(contracts.columns)
+    missing |= set(STANDINGS_COLUMNS) - set(standings.columns)
+    if missing:
+        raise ValueError(f"Missing columns: {sorted(missing)}")
+    years = set(contracts["Year"].astype(int)) | set(standings["Year"].astype(int))
+    if len(years) != 1:
+        raise ValueError("Contracts and standings must cover exactly one season.")
+    year = years.pop()
+
+    with _lock:
+        base = load_dataset(data_dir) if data_dir != DATA_DIR else _current
+        contracts = contracts.copy()
+        contracts["Year"] = year
+        if "Season" not in contracts:
+            contracts["Season"] = f"{year}-{(year + 1) % 100:02d}"
+        season_salary = clean_salary(contracts)
+        salary = base.salary.replace(year, season_salary)
+        teams = base.teams[base.teams["Year"] != year]
+        names = teams.drop_duplicates("Team", keep="last").set_index("Team")["Team.Name"]
+        season = standings.copy()
+        season["Year"] = year
+        if "Team.Name" not in season:
+            season["Team.Name"] = season["Team"].map(names)
+        prev_row = teams[teams["Year"] == year - 1].set_index("Team")["ROW"]
+        season["ROW_prev_actual"] = season["Team"].map(prev_row)
+        season = season.merge(
+            team_season_stats(season_salary).astype({"Year": "int64"}),
+            on=["Team", "Year"],
+            how="left",
+        )
+
+        next_row = teams["Year"] == year + 1
+        teams = teams.copy()
+        teams.loc[next_row, "ROW_prev_actual"] = teams.loc[next_row, "Team"].map(
+            season.set_index("Team")["ROW"]
+        )
+        teams = (
+            pd.concat([teams, season[list(TEAM_SCHEMA)].astype(TEAM_SCHEMA)], ignore_index=True)
+            .sort_values(["Team", "Year"])
+            .reset_index(drop=True)
+        )
+
+        version = max(read_version(data_dir), base.version) + 1
+        _write_atomic(
+            data_dir / SALARY_FILE,
+            lambda p: _replace_raw_season(data_dir / SALARY_FILE, year, contracts[SALARY_COLUMNS], p),
+        )
+        _write_atomic(data_dir / TEAMS_FILE, lambda p: _write_teams(teams, p))
+        write_processed(teams, salary, version, data_dir, seasons=[year])
+        _write_atomic(data_dir / VERSION_FILE, lambda p: p.write_text(f"{version}\n"))
+
+        dataset = _build(teams, salary, version)
+        if data_dir == DATA_DIR:
+            _current, _last_check = dataset, time.monotonic()
+    return dataset
@@ -0,0 +1,236 @@
+"""
+Streaming data export for the NHL Salary Inequality Analysis Dash app.
+
+Serves the salary table (one team, or every team) and the team panel for a
+range of seasons as CSV or Parquet. Team panel rows are located through a
+per-version index of positions sorted by team and season, so a filter is two
+binary searches rather than a scan. Salary rows are read one season partition
+at a time, in season order, and filtered to the team within that season. The
+response body is produced by a generator that encodes CHUNK_ROWS rows at a
+time, so memory held per export is bounded by one season and one chunk
+whatever the export size, and the snapshot taken at the start keeps a long
+download consistent if a season is ingested meanwhile.
+"""
+
+# app/export.py
+import io
+from urllib.parse import urlencode
+
+import flask
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from dash import get_relative_path
+
+from app.data import current, empty_salary, per_version
+
+CHUNK_ROWS = 2_000
+DATASETS = ("salary", "teams")
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+class ExportIndex:
+    """
+    Row positions of one table ordered by (Team, Year) and by Year.
+
+    Holds the table it indexes, so positions are always read against the
+    snapshot they were computed from.
+
+    Args:
+        frame (pd.DataFrame): Table with Team and Year columns.
+        version (int): Data version of the table.
+    """
+
+    def __init__(self, frame, version: int):
+        self.frame = frame
+        self.version = version
+        teams = frame["Team"].to_numpy(dtype=object)
+        years = frame["Year"].to_numpy(dtype=int)
+        self.by_year = np.argsort(years, kind="stable")
+        self.years = years[self.by_year]
+        self.by_team = np.lexsort((years, teams))
+        self.team_years = years[self.by_team]
+        sorted_teams = teams[self.by_team]
+        names, starts = np.unique(sorted_teams, return_index=True)
+        ends = np.r_[starts[1:], len(sorted_teams)]
+        self._spans = {name: (int(s), int(e)) for name, s, e in zip(names, starts, ends)}
+
+    def positions(self, team=None, year_range=None) -> np.ndarray:
+        """
+        Returns the positions of rows for a team (or all teams) in a season range.
+
+        Args:
+            team (str): Team abbreviation, or None for every team.
+            year_range (tuple): (start_year, end_year), or None for all seasons.
+
+        Returns:
+            np.ndarray: Row positions, ordered by team then season (or by season).
+        """
+        if team is None:
+            order, years, lo, hi = self.by_year, self.years, 0, len(self.years)
+        else:
+            lo, hi = self._spans.get(team, (0, 0))
+            order, years = self.by_team, self.team_years
+        if year_range is not None:
+            lo, hi = (
+                lo + int(np.searchsorted(years[lo:hi], year_range[0], "left")),
+                lo + int(np.searchsorted(years[lo:hi], year_range[1], "right")),
+            )
+        return order[lo:hi]
+
+
+@per_version
+def get_export_index(data, dataset: str) -> ExportIndex:
+    """
+    Returns the export index of one table for the current data version.
+
+    Args:
+        dataset (str): "teams".
+
+    Returns:
+        ExportIndex: Index over the table.
+    """
+    return ExportIndex(getattr(data, dataset), data.version)
+
+
+def salary_selections(salary, team=None, year_range=None):
+    """
+    Yields the selected salary rows one season partition at a time.
+
+    Args:
+        salary (SalaryPartitions): Salary table keyed by season.
+        team (str): Team abbreviation, or None for every team.
+        year_range (tuple): (start_year, end_year), or None for all seasons.
+
+    Yields:
+        tuple: (season frame, row positions), in season order.
+    """
+    for season in salary.iter_seasons(year_range):
+        if team is None:
+            yield season, np.arange(len(season))
+        else:
+            yield season, np.flatnonzero(season["Team"].to_numpy(dtype=object) == team)
+
+
+def _chunks(selections):
+    """Yields the selected rows in order as frames of CHUNK_ROWS rows, the last shorter."""
+    pending, size = [], 0
+    for frame, positions in selections:
+        start = 0
+        while start < len(positions):
+            take = positions[start : start + CHUNK_ROWS - size]
+            pending.append(frame.take(take))
+            size += len(take)
+            start += len(take)
+            if size == CHUNK_ROWS:
+                yield pd.concat(pending) if len(pending) > 1 else pending[0]
+                pending, size = [], 0
+    if pending:
+        yield pd.concat(pending) if len(pending) > 1 else pending[0]
+
+
+def csv_chunks(header, selections):
+    """
+    Yields selected table rows as CSV, header first, CHUNK_ROWS at a time.
+
+    Args:
+        header (pd.DataFrame): Frame whose columns form the header.
+        selections (iterable): (frame, row positions) pairs to write in order;
+            rows from consecutive frames share a chunk.
+
+    Yields:
+        bytes: Encoded CSV text.
+    """
+    yield header.iloc[:0].to_csv(index=False).encode("utf-8")
+    for chunk in _chunks(selections):
+        yield chunk.to_csv(index=False, header=False).encode("utf-8")
+
+
+def parquet_chunks(header, selections):
+    """
+    Yields selected table rows as a Parquet file, one row group per chunk.
+
+    Args:
+        header (pd.DataFrame): Frame whose columns and dtypes form the schema.
+        selections (iterable): (frame, row positions) pairs to write in order;
+            rows from consecutive frames share a row group.
+
+    Yields:
+        bytes: Consecutive pieces of the Parquet file.
+    """
+    sink = io.BytesIO()
+    schema = pa.Schema.from_pandas(header.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(selections):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()
+
+
+def export_url(dataset: str, fmt: str, team=None, year_range=None) -> str:
+    """
+    Returns the export link for a selection.
+
+    Args:
+        dataset (str): "salary" or "teams".
+        fmt (str): "csv" or "parquet".
+        team (str): Team abbreviation, or None for every team.
+        year_range (list): [start_year, end_year], or None for all seasons.
+
+    Returns:
+        str: Path with query string, relative to the app's URL prefix.
+    """
+    query = {}
+    if team:
+        query["team"] = team
+    if year_range:
+        query["start"], query["end"] = int(year_range[0]), int(year_range[1])
+    path = get_relative_path(f"/export/{dataset}.{fmt}")
+    return f"{path}?{urlencode(query)}" if query else path
+
+
+def export_response(dataset: str, fmt: str, args) -> flask.Response:
+    """
+    Builds the streaming response for an export request.
+
+    Args:
+        dataset (str): "salary" or "teams".
+        fmt (str): "csv" or "parquet".
+        args (MultiDict): Query arguments team, start and end, all optional.
+
+    Returns:
+        flask.Response: Streamed file download.
+    """
+    if dataset not in DATASETS or fmt not in FORMATS:
+        flask.abort(404)
+    try:
+        start, end = (int(args[key]) if args.get(key) else None for key in ("start", "end"))
+    except ValueError:
+        flask.abort(400)
+    team = args.get("team") or None
+    if team is not None and not team.isalnum():
+        flask.abort(400)
+    year_range = None
+    if start is not None or end is not None:
+        year_range = (start if start is not None else -1, end if end is not None else 10**4)
+
+    if dataset == "salary":
+        data = current()
+        header, version = empty_salary(), data.version
+        selections = salary_selections(data.salary, team, year_range)
+    else:
+        index = get_export_index(dataset)
+        header, version = index.frame, index.version
+        selections = [(index.frame, index.positions(team, year_range))]
+    chunks = csv_chunks if fmt == "csv" else parquet_chunks
+
+    name = "-".join(
+        [dataset, team or "all"] + [str(y) for y in (start, end) if y is not None]
+    )
+    response = flask.Response(chunks(header, selections), mimetype=FORMATS[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{name}.{fmt}"'
+    response.headers["X-Data-Version"] = str(version)
+    return response
@@ -9,30 +9,24 @@ from app.themes import apply_plot_style
 from app.constants import *
 from dash import get_asset_url
 
+from types import MappingProxyType
+
+from app.data import current, per_version
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR   = REPO_ROOT / "data"
 ASSETS_DIR = REPO_ROOT / "app" / "assets"
 
-df_teams = pd.read_csv(DATA_DIR / "Teams.csv")
-df_teams.columns = df_teams.columns.str.strip()
-df_teams["Year"] = pd.to_numeric(df_teams["Year"], errors="coerce")
-
-df_all = df_teams[
-    df_teams["Gini"].notnull()
-    & df_teams["ROW"].notnull()
-    & df_teams["ROW_prev_actual"].notnull()
-].copy()
-
-df_salary = pd.read_csv(DATA_DIR / "SalaryData.csv")
 df_glm    = pd.read_csv(DATA_DIR / "glm_model_results.csv")
 gmm_df    = pd.read_csv(DATA_DIR / "gmm_model_results.csv")
 gmm_df.columns = gmm_df.columns.str.strip()
 
+# Read-only views: shared by every request thread.
 with (ASSETS_DIR / "Team_Logos.json").open("r", encoding="utf-8") as f:
-    logo_map = json.load(f)
+    logo_map = MappingProxyType(json.load(f))
 
 with (ASSETS_DIR / "Team_Names.json").open("r", encoding="utf-8") as f2:
-    TEAM_NAME_MAP = json.load(f2)
+    TEAM_NAME_MAP = MappingProxyType(json.load(f2))
 
 def get_available_years():
     """
@@ -41,6 +35,7 @@ def get_available_years():
     Returns:
         list: Sorted list of unique years.
     """
+    df_teams = current().teams
     return sorted(df_teams["Year"].unique())
 
 
@@ -57,6 +52,16 @@ def get_team_options():
     ]
 
 
+def get_metric_options():
+    """
+    Returns a list of inequality metric options for dropdowns.
+
+    Returns:
+        list: List of dictionaries with 'label' (display name) and 'value' (column).
+    """
+    return [{"label": label, "value": col} for col, label in METRIC_LABELS.items()]
+
+
 def get_year_options():
     """
     Returns a list of year options for dropdowns.
@@ -64,7 +69,7 @@ def get_year_options():
     Returns:
         list: List of dictionaries with 'label' (year as string) and 'value' (year as int).
     """
-    years = sorted(df_teams["Year"].unique())
+    years = get_available_years()
     return [{"label": str(int(y)), "value": int(y)} for y in years]
 
 
@@ -79,6 +84,7 @@ def get_gini(team: str, year: int) -> float:
     Returns:
         float: Gini coefficient, or NaN if not found.
     """
+    df_teams = current().teams
     row = df_teams[(df_teams["Team"] == team) & (df_teams["Year"] == year)]
     return float(row["Gini"].iloc[0]) if not row.empty else float("nan")
 
@@ -94,62 +100,179 @@ def get_roster_size(team: str, year: int) -> int:
     Returns:
         int: Number of unique players, or 0 if no data.
     """
-    year = int(year)
-    sub = df_salary[(df_salary["Team"] == team) & (df_salary["Year"] == year)]
-    if sub.empty:
+    df_teams = current().teams
+    row = df_teams[(df_teams["Team"] == team) & (df_teams["Year"] == int(year))]
+    if row.empty or pd.isna(row["RosterSize"].iloc[0]):
         return 0
-    return int(sub["Player"].nunique(dropna=True))
+    return int(row["RosterSize"].iloc[0])
 
 
-def gini_vs_row_by_year(year):
+def gini_vs_row_by_year(year, metric: str = "Gini"):
     """
-    Creates a scatter plot of Gini coefficient vs ROW for all teams in a given year,
-    overlaying team logos.
+    Creates a scatter plot of Gini coefficient (or another inequality metric)
+    vs ROW for all teams in a given year, overlaying team logos.
 
     Args:
         year (int): Year to filter data.
+        metric (str): Inequality column to plot on the x-axis.
 
     Returns:
         plotly.graph_objs._figure.Figure: Plotly figure object.
     """
     year = int(year)
+    df_teams = current().teams
     filtered_df = df_teams[df_teams["Year"] == year]
+    label = METRIC_LABELS.get(metric, metric)
+    x_span = filtered_df[metric].max() - filtered_df[metric].min()
 
     fig = px.scatter(
         filtered_df,
-        x="Gini",
+        x=metric,
         y="ROW",
         hover_name="Team",
-        labels={"Gini": "Gini Coefficient", "ROW": "Regulation + Overtime Wins"},
+        custom_data=["Team", "Year"],
+        labels={metric: label, "ROW": "Regulation + Overtime Wins"},
     )
+    for image in _logo_images(filtered_df, metric, x_span):
+        fig.add_layout_image(image)
 
-    for _, row in filtered_df.iterrows():
-        abbr = row["Team"]
-        logo_url = logo_map.get(abbr)
+    fig.update_traces(
+        marker_opacity=0,
+        hovertemplate=f"<b>%{{hovertext}}</b><br>{metric}=%{{x:.3f}}<br>ROW=%{{y}}<extra></extra>",
+    )
+    fig = apply_plot_style(fig, title=f"{label} vs ROW in {year}")
+    return fig
+
+
+def _logo_images(teams, metric: str, x_span: float) -> list:
+    """
+    Builds one layout image per team, centred on its (metric, ROW) point.
+
+    Args:
+        teams (pd.DataFrame): Team-season rows.
+        metric (str): Inequality column on the x-axis.
+        x_span (float): Width of the x data range, used to size the logos.
+
+    Returns:
+        list: Plotly layout image dicts.
+    """
+    images = []
+    for _, row in teams.iterrows():
+        logo_url = logo_map.get(row["Team"])
         if logo_url:
-            logo_url = get_asset_url(logo_url)
-            fig.add_layout_image(
+            images.append(
                 dict(
-                    source=logo_url,
-                    x=row["Gini"],
+                    source=get_asset_url(logo_url),
+                    x=row[metric],
                     y=row["ROW"],
                     xref="x",
                     yref="y",
                     xanchor="center",
                     yanchor="middle",
-                    sizex=0.01,
+                    sizex=x_span * 0.065 if x_span > 0 else 0.01,
                     sizey=1.5,
                     sizing="contain",
                     opacity=1,
                     layer="above",
                 )
             )
+    return images
 
-    fig.update_traces(
-        marker_opacity=0,
-        hovertemplate="<b>%{hovertext}</b><br>Gini=%{x:.3f}<br>ROW=%{y}<extra></extra>",
+
+@per_version
+def logo_scatter_animation(data, metric: str = "Gini"):
+    """
+    Creates the logo scatter for every season as one animated figure.
+
+    Each season is a frame carrying its own points and logo images, and a
+    slider plus play button step through them in the browser. Axes are fixed
+    across seasons so teams visibly move. Built once per data version and metric.
+
+    Args:
+        metric (str): Inequality column to plot on the x-axis.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Plotly figure object.
+    """
+    df_teams = data.teams[data.teams[metric].notnull() & data.teams["ROW"].notnull()]
+    label = METRIC_LABELS.get(metric, metric)
+    years = [int(y) for y in get_available_years()]
+    x_min, x_max = df_teams[metric].min(), df_teams[metric].max()
+    y_min, y_max = df_teams["ROW"].min(), df_teams["ROW"].max()
+    x_pad, y_pad = (x_max - x_min) * 0.05, (y_max - y_min) * 0.05
+    # Size logos as in the single-season plot, from a typical season's spread.
+    x_span = df_teams.groupby("Year")[metric].agg(lambda v: v.max() - v.min()).median()
+
+    def season(year):
+        rows = df_teams[df_teams["Year"] == year]
+        trace = go.Scatter(
+            x=rows[metric],
+            y=rows["ROW"],
+            hovertext=rows["Team"],
+            customdata=rows[["Team", "Year"]].to_numpy(),
+            mode="markers",
+            marker=dict(opacity=0),
+            hovertemplate=f"<b>%{{hovertext}}</b><br>{metric}=%{{x:.3f}}<br>ROW=%{{y}}<extra></extra>",
+        )
+        layout = dict(
+            images=_logo_images(rows, metric, x_span),
+            title=dict(text=f"{label} vs ROW in {year}"),
+        )
+        return trace, layout
+
+    frames = []
+    for year in years:
+        trace, layout = season(year)
+        frames.append(go.Frame(name=str(year), data=[trace], layout=layout))
+
+    first_trace, first_layout = season(years[0])
+    fig = go.Figure(data=[first_trace], frames=frames)
+    fig.update_layout(images=first_layout["images"])
+    fig.update_xaxes(title=label, range=[x_min - x_pad, x_max + x_pad])
+    fig.update_yaxes(title="Regulation + Overtime Wins", range=[y_min - y_pad, y_max + y_pad])
+    fig = apply_plot_style(fig, title=first_layout["title"]["text"])
+
+    step = {
+        "mode": "immediate",
+        "frame": {"duration": 0, "redraw": True},
+        "transition": {"duration": 0},
+    }
+    play = {
+        "frame": {"duration": 900, "redraw": True},
+        "fromcurrent": True,
+        "transition": {"duration": 0},
+    }
+    fig.update_layout(
+        margin=dict(l=20, r=20, t=50, b=90),
+        updatemenus=[
+            dict(
+                type="buttons",
+                direction="left",
+                x=0,
+                y=-0.12,
+                xanchor="left",
+                yanchor="top",
+                showactive=False,
+                buttons=[
+                    dict(label="▶ Play", method="animate", args=[None, play]),
+                    dict(label="❚❚ Pause", method="animate", args=[[None], step]),
+                ],
+            )
+        ],
+        sliders=[
+            dict(
+                active=0,
+                x=0.18,
+                y=-0.08,
+                len=0.82,
+                currentvalue=dict(visible=False),
+                steps=[
+                    dict(label=str(year), method="animate", args=[[str(year)], step])
+                    for year in years
+                ],
+            )
+        ],
     )
-    fig = apply_plot_style(fig, title=f"Gini Coefficient vs ROW in {year}")
     return fig
 
 
@@ -164,24 +287,14 @@ def salary_histogram(team: str, year: int):
     Returns:
         plotly.graph_objs._figure.Figure: Plotly figure object.
     """
-    sub = df_salary[
-        (df_salary["Team"] == team) & (df_salary["Year"] == int(year))
-    ].copy()
+    df_salary = current().salary.season(year)
+    sub = df_salary[df_salary["Team"] == team][["Player", "Team", "Year", "Cap Hit"]].copy()
 
     if sub.empty:
         fig = px.bar(title=f"No player salary data for {team} in {year}")
         fig.update_layout(height=520, margin=dict(l=20, r=20, t=50, b=20))
         return fig
 
-    sub["Cap Hit"] = (
-        sub["Cap Hit"].astype(str).str.replace(r"[^0-9.]", "", regex=True).astype(float)
-    )
-    sub = (
-        sub.groupby(["Player", "Team", "Year"], as_index=False)
-        .agg({"Cap Hit": "max"})
-        .sort_values("Cap Hit", ascending=False)
-    )
-
     team_total = sub["Cap Hit"].sum()
     sub["Cap Hit (USD)"] = sub["Cap Hit"].map(lambda x: f"${x:,.0f}")
     sub["% of Team Total"] = (sub["Cap Hit"] / team_total * 100).round(2)
@@ -220,6 +333,33 @@ def salary_histogram(team: str, year: int):
     return fig
 
 
+def roster_builder_fig(roster: pd.DataFrame, title: str):
+    """
+    Creates a bar chart of an optimized roster's cap hits, with source team on hover.
+
+    Args:
+        roster (pd.DataFrame): Player, Team and Cap Hit columns.
+        title (str): Figure title.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Plotly figure object.
+    """
+    sub = roster.sort_values("Cap Hit", ascending=False).copy()
+    sub["Cap Hit (USD)"] = sub["Cap Hit"].map(lambda x: f"${x:,.0f}")
+
+    fig = px.bar(
+        sub,
+        x="Player",
+        y="Cap Hit",
+        color_discrete_sequence=[NAVY],
+        hover_data={"Team": True, "Cap Hit (USD)": True, "Cap Hit": False},
+    )
+    fig.update_yaxes(tickprefix="$", separatethousands=True, title="Cap Hit (USD)")
+    fig.update_xaxes(tickangle=45, title="Player")
+    fig = apply_plot_style(fig, title=title)
+    return fig
+
+
 def team_salary_selection():
     """
     Prepares default values and options for team and year selection dropdowns.
@@ -233,18 +373,21 @@ def team_salary_selection():
     default_team = team_opts[0]["value"] if team_opts else None
 
 
-def team_trend_figures(team: str, year_range: list):
+def team_trend_figures(team: str, year_range: list, metric: str = "Gini"):
     """
-    Generates line plots for a team's ROW and Gini coefficient over a range of years.
+    Generates line plots for a team's ROW and Gini coefficient (or another
+    inequality metric) over a range of years.
 
     Args:
         team (str): Team abbreviation.
         year_range (list): [start_year, end_year].
+        metric (str): Inequality column for the second plot.
 
     Returns:
         tuple: (row_fig, gini_fig) Plotly figure objects.
     """
     start, end = int(year_range[0]), int(year_range[1])
+    df_teams = current().teams
     filtered = (
         df_teams[
             (df_teams["Team"] == team)
@@ -268,21 +411,154 @@ def team_trend_figures(team: str, year_range: list):
     row_fig.update_xaxes(dtick=1, title=None)
     row_fig = apply_plot_style(row_fig, title=f"{name} ROW Over Time")
 
-    # Gini Over Time
-    gini_fig = px.line(filtered, x="Year", y="Gini", markers=True)
+    # Gini (or selected metric) Over Time
+    label = METRIC_LABELS.get(metric, metric)
+    gini_fig = px.line(filtered, x="Year", y=metric, markers=True)
     gini_fig.update_traces(
         mode="lines+markers",
-        hovertemplate="Year %{x}<br>Gini %{y:.3f}<extra></extra>",
+        hovertemplate=f"Year %{{x}}<br>{metric} %{{y:.3f}}<extra></extra>",
         line=dict(color=NAVY),
         marker=dict(color=NAVY),
     )
-    gini_fig.update_yaxes(title="Gini")
+    gini_fig.update_yaxes(title=metric)
     gini_fig.update_xaxes(dtick=1, title=None)
-    gini_fig = apply_plot_style(gini_fig, title=f"{name} Gini Coefficient Over Time")
+    gini_fig = apply_plot_style(gini_fig, title=f"{name} {label} Over Time")
 
     return row_fig, gini_fig
 
 
+@per_version
+def team_series_matrix(data, column: str):
+    """
+    Returns one column of the team panel as a Year × Team matrix.
+
+    Built once per data version and column.
+
+    Args:
+        column (str): Team panel column, e.g. "ROW" or "Gini".
+
+    Returns:
+        tuple: (years, teams, matrix) with NaN where a team has no season.
+    """
+    wide = data.teams.pivot(index="Year", columns="Team", values=column).sort_index()
+    matrix = wide.to_numpy(dtype=float)
+    matrix.flags.writeable = False
+    return wide.index.to_numpy(dtype=int), list(wide.columns), matrix
+
+
+def team_comparison_figures(teams: list, year_range: list, metric: str = "Gini"):
+    """
+    Overlays several teams' ROW and Gini coefficient (or another inequality
+    metric) trends with WebGL traces.
+
+    The first team is drawn in the accent colour; the rest share a palette.
+
+    Args:
+        teams (list): Team abbreviations, primary team first.
+        year_range (list): [start_year, end_year].
+        metric (str): Inequality column for the second plot.
+
+    Returns:
+        tuple: (row_fig, gini_fig) Plotly figure objects.
+    """
+    start, end = int(year_range[0]), int(year_range[1])
+    palette = px.colors.qualitative.Dark24
+    label = METRIC_LABELS.get(metric, metric)
+    figs = []
+    for column, fmt, title in (
+        ("ROW", "%{y}", "ROW Over Time"),
+        (metric, "%{y:.3f}", f"{label} Over Time"),
+    ):
+        years, all_teams, matrix = team_series_matrix(column)
+        rows = (years >= start) & (years <= end)
+        position = {t: i for i, t in enumerate(all_teams)}
+        cols = [position[t] for t in teams if t in position]
+        values = matrix[rows][:, cols]
+        fig = go.Figure(
+            [
+                go.Scattergl(
+                    x=years[rows],
+                    y=values[:, k],
+                    mode="lines+markers",
+                    name=all_teams[c],
+                    line=dict(
+                        color=LIGHT_RED if k == 0 else palette[k % len(palette)],
+                        width=3 if k == 0 else 1.5,
+                    ),
+                    marker=dict(size=6 if k == 0 else 4),
+                    opacity=1.0 if k == 0 else 0.75,
+                    hovertemplate=f"%{{fullData.name}}<br>Year %{{x}}<br>{column} {fmt}<extra></extra>",
+                )
+                for k, c in enumerate(cols)
+            ]
+        )
+        fig.update_yaxes(title=column)
+        fig.update_xaxes(dtick=1, title=None)
+        fig = apply_plot_style(fig, title=f"{len(cols)} Teams: {title}")
+        fig.update_layout(showlegend=len(cols) <= 12)
+        figs.append(fig)
+    return tuple(figs)
+
+
+def glm_coefficients():
+    """
+    Returns the fitted Poisson GLM coefficients.
+
+    Returns:
+        tuple: (beta0, beta1, beta2, beta3) for Intercept, Gini, Gini² and Prev_ROW.
+    """
+    glm = df_glm.set_index("Term")["Estimate"].to_dict()
+    return (
+        glm.get("Intercept", 0.0),
+        glm.get("Gini", 0.0),
+        glm.get("Gini2", 0.0),
+        glm.get("Prev_ROW", 0.0),
+    )
+
+
+def get_mean_prev_row() -> float:
+    """
+    Returns the league-average previous-season ROW used to hold the lag fixed.
+
+    Returns:
+        float: Mean of ROW_prev_actual over the modelling sample.
+    """
+    return float(current().model_sample["ROW_prev_actual"].mean())
+
+
+def get_prev_row(team: str, year: int) -> float:
+    """
+    Retrieves a team's previous-season ROW, falling back to the league mean.
+
+    Args:
+        team (str): Team abbreviation.
+        year (int): Year.
+
+    Returns:
+        float: ROW_prev_actual for the team-season, or the league mean if missing.
+    """
+    df_teams = current().teams
+    row = df_teams[(df_teams["Team"] == team) & (df_teams["Year"] == int(year))]
+    if row.empty or pd.isna(row["ROW_prev_actual"].iloc[0]):
+        return get_mean_prev_row()
+    return float(row["ROW_prev_actual"].iloc[0])
+
+
+def predict_row(gini, row_prev):
+    """
+    Evaluates the Poisson GLM mean ROW for the given Gini and previous ROW.
+
+    Args:
+        gini (float or np.ndarray): Gini coefficient(s).
+        row_prev (float or np.ndarray): Previous season ROW.
+
+    Returns:
+        float or np.ndarray: Predicted ROW (exp of the linear predictor).
+    """
+    beta0, beta1, beta2, beta3 = glm_coefficients()
+    return np.exp(beta0 + beta1 * gini + beta2 * gini**2 + beta3 * row_prev)
+
+
 def glm_curve_fig():
     """
     Plots Gini vs ROW for all teams and overlays the fitted GLM curve.
@@ -290,12 +566,7 @@ def glm_curve_fig():
     Returns:
         plotly.graph_objs._figure.Figure: Plotly figure object.
     """
-    glm = df_glm.set_index("Term")["Estimate"].to_dict()
-    beta0 = glm.get("Intercept", 0.0)
-    beta1 = glm.get("Gini", 0.0)
-    beta2 = glm.get("Gini2", 0.0)
-    beta3 = glm.get("Prev_ROW", 0.0)
-
+    df_all = current().model_sample
     fig = px.scatter(
         df_all,
         x="Gini",
@@ -306,11 +577,7 @@ def glm_curve_fig():
     fig.update_traces(marker=dict(size=7, color=NAVY), selector=dict(mode="markers"))
 
     gini_range = np.linspace(df_all["Gini"].min(), df_all["Gini"].max(), 250)
-    row_prev_mean = float(df_all["ROW_prev_actual"].mean())
-    log_lambda = (
-        beta0 + beta1 * gini_range + beta2 * (gini_range**2) + beta3 * row_prev_mean
-    )
-    predicted_row = np.exp(log_lambda)
+    predicted_row = predict_row(gini_range, get_mean_prev_row())
     fig.add_trace(
         go.Scatter(
             x=gini_range,
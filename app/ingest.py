@@ -0,0 +1,35 @@
+"""
+Command-line season ingest for the NHL Salary Inequality Analysis Dash app.
+
+Usage:
+    python -m app.ingest --contracts contracts_2025.csv --standings standings_2025.csv
+
+Contracts need Player, Team, Year and Cap Hit columns (Season is optional);
+standings need Team, Year, GP and ROW (Team.Name is optional). Running workers
+pick up the new data version without a restart.
+"""
+
+# app/ingest.py
+import argparse
+
+import pandas as pd
+
+from app.data import ingest_season
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append one season of NHL data.")
+    parser.add_argument("--contracts", required=True, help="CSV of player cap hits")
+    parser.add_argument("--standings", required=True, help="CSV of team GP and ROW")
+    args = parser.parse_args(argv)
+
+    dataset = ingest_season(pd.read_csv(args.contracts), pd.read_csv(args.standings))
+    years = sorted(dataset.teams["Year"].unique())
+    print(
+        f"Published data version {dataset.version} "
+        f"({int(years[0])}–{int(years[-1])}, {len(dataset.teams)} team-seasons)"
+    )
+
+
+if __name__ == "__main__":
+    main()
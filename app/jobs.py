@@ -0,0 +1,37 @@
+"""
+Background job manager for the NHL Salary Inequality Analysis Dash app.
+
+Long-running callbacks (currently the roster optimizer) run through Dash's
+background-callback machinery with a local diskcache store as the job queue,
+so no external broker is needed. Jobs run in child processes and report
+progress. A running job is cancelled when the user presses Cancel or changes
+one of the job's inputs; its start button is disabled meanwhile, so a job
+cannot be re-triggered while it runs. Results are cached on disk keyed by the
+callback inputs and the data version, so any worker can serve a repeat request
+without recomputing it.
+"""
+
+# app/jobs.py
+import os
+from pathlib import Path
+
+import diskcache
+from dash import DiskcacheManager
+
+from app.data import current
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+JOBS_DIR = Path(os.getenv("JOB_CACHE_DIR", REPO_ROOT / ".cache" / "jobs"))
+JOB_RESULT_TTL = 24 * 3600
+
+
+def _data_version() -> int:
+    """Returns the active data version so cached results expire on ingest."""
+    return current().version
+
+
+background_manager = DiskcacheManager(
+    diskcache.Cache(str(JOBS_DIR)),
+    cache_by=[_data_version],
+    expire=JOB_RESULT_TTL,
+)
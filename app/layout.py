@@ -1,12 +1,31 @@
 from dash import html, dcc, dash_table
+from app.contracts import contract_scatter_fig
+from app.data import current, per_version
+from app.export import export_url
 from app.figures import *
+from app.lorenz import lorenz_fig
+from app.views import (
+    roster_builder_view,
+    row_simulation_view,
+    salary_trend_view,
+    similar_rosters_view,
+    team_salary_view,
+    team_trends_view,
+    whatif_view,
+)
+from app.whatif import RosterGini
 from app.themes import RED_LINE
 
-min_year = int(df_teams["Year"].min())
-max_year = int(df_teams["Year"].max())
 
-years = sorted(df_teams["Year"].unique())
-default_year = int(min(years))
+def year_bounds():
+    """
+    Returns the first and last season in the current dataset.
+
+    Returns:
+        tuple: (min_year, max_year) as ints.
+    """
+    years = get_available_years()
+    return int(min(years)), int(max(years))
 
 
 def logo_scatter_section():
@@ -14,6 +33,7 @@ def logo_scatter_section():
     Returns the layout section for the league-wide Gini vs ROW scatter plot.
     Includes year dropdown, explanatory text, and the plot container.
     """
+    default_year, _ = year_bounds()
     return html.Div(
         [
             html.H3("League Wide Gini vs ROW by Year"),
@@ -22,7 +42,7 @@ def logo_scatter_section():
                 style={"marginBottom": "12px"},
             ),
             dcc.Markdown(
-                "**Use the dropdown to explore year-by-year patterns and see how different roster structures align with regular-season performance.**",
+                "**Use the dropdowns to explore year-by-year patterns, or swap Gini for another inequality measure, and see how different roster structures align with regular-season performance. Click a logo to open that team-season in the panels below.**",
                 style={
                     "fontStyle": "italic",
                     "color": "#002244",
@@ -32,17 +52,39 @@ def logo_scatter_section():
             html.Div(
                 [
                     html.Div(
-                        dcc.Dropdown(
-                            id="logo-year-dropdown",
-                            options=get_year_options(),
-                            value=default_year,
-                            clearable=False,
-                            className="dash-dropdown",
-                        ),
-                        style={"maxWidth": "220px", "marginBottom": "10px"},
+                        [
+                            html.Div(
+                                dcc.Dropdown(
+                                    id="logo-year-dropdown",
+                                    options=get_year_options(),
+                                    value=default_year,
+                                    clearable=False,
+                                    className="dash-dropdown",
+                                ),
+                                style={"minWidth": "160px"},
+                            ),
+                            html.Div(
+                                dcc.Dropdown(
+                                    id="logo-metric-dropdown",
+                                    options=get_metric_options(),
+                                    value="Gini",
+                                    clearable=False,
+                                    className="dash-dropdown",
+                                ),
+                                style={"minWidth": "280px"},
+                            ),
+                            dcc.Checklist(
+                                id="logo-animate",
+                                options=[{"label": " Animate all seasons", "value": "on"}],
+                                value=[],
+                                style={"alignSelf": "center"},
+                            ),
+                        ],
+                        style={"display": "flex", "gap": "12px", "marginBottom": "10px"},
                     ),
                     dcc.Graph(
                         id="logo-scatter-graph",
+                        figure=gini_vs_row_by_year(default_year, "Gini"),
                         className="full-width",
                         style={"height": "520px"},
                     ),
@@ -58,6 +100,9 @@ def team_salary_selection():
     Returns the layout section for team salary visualization.
     Includes team/year dropdowns, info box, and salary histogram plot.
     """
+    default_year, _ = year_bounds()
+    team = get_team_options()[0]["value"] if get_team_options() else None
+    fig, info, roster = team_salary_view(team, default_year)
     return html.Div(
         [
             html.H3("Team Salary"),
@@ -106,8 +151,8 @@ def team_salary_selection():
                     # Info box
                     html.Div(
                         [
-                            html.Div(id="ts-info-line", style={"fontWeight": "bold"}),
-                            html.Div(id="ts-roster-line", style={"marginTop": "6px"}),
+                            html.Div(info, id="ts-info-line", style={"fontWeight": "bold"}),
+                            html.Div(roster, id="ts-roster-line", style={"marginTop": "6px"}),
                         ],
                         className="cta-box",
                         style={
@@ -131,27 +176,182 @@ def team_salary_selection():
             ),
             # Plot
             html.Div(
-                dcc.Graph(id="ts-graph", style={"height": "520px"}),
+                dcc.Graph(id="ts-graph", figure=fig, style={"height": "520px"}),
                 className="plot-container",
             ),
+            similar_rosters_panel(team, default_year),
+            whatif_panel(team, default_year),
         ]
     )
 
 
+def similar_rosters_panel(team, year):
+    """
+    Returns the table of historical team-seasons with the most similar payroll shape.
+
+    Args:
+        team (str): Team abbreviation shown initially.
+        year (int): Year shown initially.
+    """
+    return html.Div(
+        [
+            html.H4("Similar Payroll Shapes"),
+            dcc.Markdown(
+                "The team-seasons whose cap hits are spread most like the selected roster, compared as quantiles of each player’s cap hit relative to the team average, with the ROW they went on to earn.",
+                style={"marginBottom": "8px"},
+            ),
+            dash_table.DataTable(
+                id="ts-similar-table",
+                columns=[
+                    {"name": "Team", "id": "Team"},
+                    {"name": "Season", "id": "Year"},
+                    {"name": "Gini", "id": "Gini", "type": "numeric", "format": {"specifier": ".3f"}},
+                    {"name": "ROW", "id": "ROW", "type": "numeric", "format": {"specifier": ".0f"}},
+                    {"name": "Distance", "id": "Distance", "type": "numeric", "format": {"specifier": ".3f"}},
+                ],
+                data=similar_rosters_view(team, year),
+                style_as_list_view=True,
+                style_table={"overflowX": "auto", "width": "100%"},
+                style_cell={
+                    "textAlign": "left",
+                    "padding": "6px 8px",
+                    "fontFamily": "Georgia, serif",
+                    "fontSize": "14px",
+                    "border": "none",
+                },
+                style_header={
+                    "fontWeight": "bold",
+                    "color": NAVY,
+                    "border": "none",
+                    "backgroundColor": ACCENT,
+                },
+            ),
+        ],
+        className="text-container",
+        style={"marginTop": "16px"},
+    )
+
+
+def whatif_panel(team, year):
+    """
+    Returns the what-if panel shown under the team salary plot.
+    Lets users edit a player's cap hit, add or remove players, and see the
+    team's Gini, predicted ROW and simulated ROW distribution update live.
+
+    Args:
+        team (str): Team abbreviation shown initially.
+        year (int): Year shown initially.
+    """
+    options, info, sim_fig, sim_line = [], "", {}, ""
+    if team:
+        roster = RosterGini.from_team(team, year)
+        options, info = whatif_view(roster, team, year)
+        sim_fig, sim_line = row_simulation_view(roster, team, year)
+    return html.Div(
+        [
+            dcc.Store(id="wi-session"),
+            dcc.Markdown(
+                "**What if? Pick a player and type a new cap hit (applied on Enter or when you leave the field), or add and remove players, to see how the team’s Gini and predicted ROW respond.**",
+                style={
+                    "fontStyle": "italic",
+                    "color": "#002244",
+                    "marginBottom": "8px",
+                },
+            ),
+            html.Div(
+                [
+                    html.Div(
+                        dcc.Dropdown(
+                            id="wi-player",
+                            options=options,
+                            placeholder="Player",
+                            className="dash-dropdown",
+                        ),
+                        style={"minWidth": "240px"},
+                    ),
+                    # Edits the selected player; debounced so a value is applied
+                    # once, not on every keystroke.
+                    dcc.Input(
+                        id="wi-cap-hit",
+                        type="number",
+                        min=0,
+                        step=25000,
+                        debounce=True,
+                        placeholder="Cap Hit (USD)",
+                    ),
+                    html.Button(
+                        "Remove", id="wi-remove", n_clicks=0, className="dash-button"
+                    ),
+                    html.Button(
+                        "Reset", id="wi-reset", n_clicks=0, className="dash-button"
+                    ),
+                ],
+                style={
+                    "display": "flex",
+                    "alignItems": "center",
+                    "gap": "12px",
+                    "marginBottom": "10px",
+                },
+            ),
+            html.Div(
+                [
+                    dcc.Input(
+                        id="wi-new-player",
+                        type="text",
+                        placeholder="New player name",
+                    ),
+                    dcc.Input(
+                        id="wi-new-cap-hit",
+                        type="number",
+                        min=0,
+                        step=25000,
+                        placeholder="New player's Cap Hit (USD)",
+                    ),
+                    html.Button("Add", id="wi-add", n_clicks=0, className="dash-button"),
+                ],
+                style={
+                    "display": "flex",
+                    "alignItems": "center",
+                    "gap": "12px",
+                    "marginBottom": "10px",
+                },
+            ),
+            html.Div(
+                [
+                    html.Div(info, id="wi-info-line", style={"fontWeight": "bold"}),
+                    html.Div(sim_line, id="wi-sim-line", style={"marginTop": "6px"}),
+                ],
+                className="cta-box",
+                style={"padding": "10px 14px", "marginBottom": "10px"},
+            ),
+            html.Div(
+                dcc.Graph(id="wi-sim-graph", figure=sim_fig, style={"height": "520px"}),
+                className="plot-container",
+            ),
+        ],
+        className="text-container",
+    )
+
+
 def gini_vs_row_section():
     """
     Returns the layout section for team Gini vs ROW trends.
-    Includes team dropdown, year slider, and two side-by-side trend plots.
+    Includes team dropdown, year slider, two side-by-side trend plots and a
+    cap hit distribution trend.
     """
+    min_year, max_year = year_bounds()
+    team = get_team_options()[0]["value"] if get_team_options() else None
+    row_fig, metric_fig = team_trends_view(team, [min_year, max_year], "Gini")
+    salary_fig, salary_line = salary_trend_view(team, [min_year, max_year])
     return html.Div(
         [
             html.H3("Gini vs Regulation + Overtime Wins"),
             dcc.Markdown(
-                "Comparing the two trends can reveal whether payroll inequality and performance tend to move together or diverge across seasons. These charts track the selected team’s performance (ROW) and salary inequality (Gini coefficient) over time.",
+                "Comparing the two trends can reveal whether payroll inequality and performance tend to move together or diverge across seasons. These charts track the selected team’s performance (ROW) and salary inequality (Gini coefficient) over time, and the chart below them shows how the spread of individual cap hits moved over the same seasons.",
                 style={"marginBottom": "12px"},
             ),
             dcc.Markdown(
-                "**Use the drop-down to select a team and use the slider to explore how changes in roster structure align with shifts in on-ice results.**",
+                "**Use the drop-down to select a team, add teams to compare against, and use the slider to explore how changes in roster structure align with shifts in on-ice results.**",
                 style={
                     "fontStyle": "italic",
                     "color": "#002244",
@@ -166,25 +366,52 @@ def gini_vs_row_section():
                         dcc.Dropdown(
                             id="trend-team",
                             options=get_team_options(),
-                            value=(
-                                get_team_options()[0]["value"]
-                                if get_team_options()
-                                else None
-                            ),
+                            value=team,
                             clearable=False,
                             className="dash-dropdown",
                         ),
                         style={"minWidth": "320px"},
                     ),
+                    # Comparison teams
+                    html.Div(
+                        [
+                            dcc.Dropdown(
+                                id="trend-compare",
+                                options=get_team_options(),
+                                value=[],
+                                multi=True,
+                                placeholder="Compare with…",
+                                className="dash-dropdown",
+                            ),
+                            dcc.Checklist(
+                                id="trend-compare-all",
+                                options=[{"label": " Compare all teams", "value": "all"}],
+                                value=[],
+                                style={"marginTop": "4px"},
+                            ),
+                        ],
+                        style={"minWidth": "260px"},
+                    ),
+                    # Metric dropdown
+                    html.Div(
+                        dcc.Dropdown(
+                            id="trend-metric",
+                            options=get_metric_options(),
+                            value="Gini",
+                            clearable=False,
+                            className="dash-dropdown",
+                        ),
+                        style={"minWidth": "260px"},
+                    ),
                     # Year slider
                     html.Div(
                         dcc.RangeSlider(
                             id="trend-years",
-                            min=2015,
-                            max=2024,
+                            min=min_year,
+                            max=max_year,
                             step=1,
-                            value=[2015, 2024],
-                            marks={y: str(y) for y in range(2015, 2025)},
+                            value=[min_year, max_year],
+                            marks={y: str(y) for y in range(min_year, max_year + 1)},
                             tooltip={
                                 "placement": "bottom",
                                 "always_visible": False,
@@ -202,6 +429,7 @@ def gini_vs_row_section():
                     html.Div(
                         dcc.Graph(
                             id="row-trend-graph",
+                            figure=row_fig,
                             style={"height": "520px", "width": "100%"},
                             config={"responsive": True},
                         ),
@@ -210,6 +438,7 @@ def gini_vs_row_section():
                     html.Div(
                         dcc.Graph(
                             id="gini-trend-graph",
+                            figure=metric_fig,
                             style={"height": "520px", "width": "100%"},
                             config={"responsive": True},
                         ),
@@ -225,6 +454,318 @@ def gini_vs_row_section():
                     "width": "100%",
                 },
             ),
+            # Cap hit distribution over the same seasons
+            html.Div(
+                [
+                    html.Div(
+                        salary_line,
+                        id="salary-trend-line",
+                        style={"fontWeight": "600", "marginBottom": "6px"},
+                    ),
+                    dcc.Graph(
+                        id="salary-trend-graph",
+                        figure=salary_fig,
+                        style={"height": "440px", "width": "100%"},
+                        config={"responsive": True},
+                    ),
+                    export_links(team, [min_year, max_year]),
+                ],
+                className="plot-container",
+                style={"maxWidth": "1100px", "margin": "16px auto 0", "width": "100%"},
+            ),
+        ]
+    )
+
+
+def export_links(team, year_range):
+    """
+    Returns the download links for the data behind the trend charts.
+
+    Args:
+        team (str): Team abbreviation shown initially.
+        year_range (list): [start_year, end_year] shown initially.
+    """
+    links = []
+    for dataset, label, link_team in (
+        ("salary", "Team cap hits", team),
+        ("teams", "League team panel", None),
+    ):
+        links.append(html.Span(f"{label}:", style={"fontWeight": "600"}))
+        for fmt, fmt_label in (("csv", "CSV"), ("parquet", "Parquet")):
+            links.append(
+                html.A(
+                    fmt_label,
+                    id=f"export-{dataset}-{fmt}",
+                    href=export_url(dataset, fmt, link_team, year_range),
+                    className="dash-button",
+                )
+            )
+    return html.Div(
+        links,
+        style={
+            "display": "flex",
+            "alignItems": "center",
+            "gap": "10px",
+            "marginTop": "10px",
+            "flexWrap": "wrap",
+        },
+    )
+
+
+def lorenz_section():
+    """
+    Returns the layout section for the Lorenz curve explorer.
+    Includes team and season multi-selects and the overlay plot.
+    """
+    min_year, max_year = year_bounds()
+    team_options = get_team_options()
+    lorenz_teams = [team_options[0]["value"]] if team_options else []
+    return html.Div(
+        [
+            html.H3("Lorenz Curves"),
+            dcc.Markdown(
+                "A Lorenz curve plots the share of payroll earned by the lowest-paid fraction of a roster. The further a curve bows below the dashed equality line, the more unequal the payroll; the Gini coefficient is twice the area between the two. The red curve is the league average for the selected seasons.",
+                style={"marginBottom": "12px"},
+            ),
+            dcc.Markdown(
+                "**Select any number of teams and seasons to overlay their curves. Leave teams empty to show every team.**",
+                style={
+                    "fontStyle": "italic",
+                    "color": "#002244",
+                    "marginBottom": "8px",
+                },
+            ),
+            html.Div(
+                [
+                    html.Div(
+                        dcc.Dropdown(
+                            id="lorenz-teams",
+                            options=team_options,
+                            value=lorenz_teams,
+                            multi=True,
+                            placeholder="All teams",
+                            className="dash-dropdown",
+                        ),
+                        style={"flex": 2, "minWidth": "320px"},
+                    ),
+                    html.Div(
+                        dcc.Dropdown(
+                            id="lorenz-years",
+                            options=get_year_options(),
+                            value=[max_year],
+                            multi=True,
+                            placeholder="Select seasons",
+                            className="dash-dropdown",
+                        ),
+                        style={"flex": 1, "minWidth": "220px"},
+                    ),
+                ],
+                style={"display": "flex", "gap": "12px", "marginBottom": "10px"},
+            ),
+            html.Div(
+                dcc.Graph(
+                    id="lorenz-graph",
+                    figure=lorenz_fig(lorenz_teams, [max_year]),
+                    style={"height": "520px"},
+                ),
+                className="plot-container",
+            ),
+        ]
+    )
+
+
+def player_explorer_section():
+    """
+    Returns the layout section for player search.
+    Includes a type-ahead player dropdown and the career cap hit timeline.
+    """
+    return html.Div(
+        [
+            html.H3("Player Explorer"),
+            dcc.Markdown(
+                "This chart follows a single player’s cap hit across every season and team in the data, showing how contracts change through trades, extensions and free agency.",
+                style={"marginBottom": "12px"},
+            ),
+            dcc.Markdown(
+                "**Start typing a player’s first or last name to search.**",
+                style={
+                    "fontStyle": "italic",
+                    "color": "#002244",
+                    "marginBottom": "8px",
+                },
+            ),
+            html.Div(
+                dcc.Dropdown(
+                    id="player-search",
+                    options=[],
+                    placeholder="Search players",
+                    className="dash-dropdown",
+                ),
+                style={"maxWidth": "420px", "marginBottom": "10px"},
+            ),
+            html.Div(
+                dcc.Graph(id="player-career-graph", style={"height": "520px"}),
+                className="plot-container",
+            ),
+        ]
+    )
+
+
+def contract_scatter_section():
+    """
+    Returns the layout section for the league-wide contract scatter.
+    Includes the x-axis column dropdown and the zoomable plot.
+    """
+    return html.Div(
+        [
+            html.H3("Every Contract"),
+            dcc.Markdown(
+                "Each point is one player’s cap hit in one season, placed at the team’s ROW or payroll inequality for that season. Dense views are shown as a heatmap of contract counts; zoom in to drill down to individual contracts.",
+                style={"marginBottom": "12px"},
+            ),
+            dcc.Markdown(
+                "**Choose the team measure for the x-axis, then drag on the chart to zoom. Double-click to reset.**",
+                style={
+                    "fontStyle": "italic",
+                    "color": "#002244",
+                    "marginBottom": "8px",
+                },
+            ),
+            html.Div(
+                dcc.Dropdown(
+                    id="contracts-x",
+                    options=[{"label": "Regulation + Overtime Wins", "value": "ROW"}]
+                    + get_metric_options(),
+                    value="ROW",
+                    clearable=False,
+                    className="dash-dropdown",
+                ),
+                style={"maxWidth": "320px", "marginBottom": "10px"},
+            ),
+            html.Div(
+                dcc.Graph(
+                    id="contracts-graph",
+                    figure=contract_scatter_fig("ROW"),
+                    style={"height": "520px"},
+                ),
+                className="plot-container",
+            ),
+        ]
+    )
+
+
+def roster_builder_section():
+    """
+    Returns the layout section for the roster construction optimizer.
+    Includes season, target Gini, roster size and previous ROW controls,
+    a summary box, and the optimized roster plot.
+    """
+    _, max_year = year_bounds()
+    row_prev = round(get_mean_prev_row())
+    fig, info, detail = roster_builder_view(max_year, OPTIMAL_GINI, [20, 23], row_prev)
+    return html.Div(
+        [
+            html.H3("Roster Builder"),
+            dcc.Markdown(
+                "This tool assembles a roster from every contract signed in the selected season. It searches for the combination of players whose payroll lands on the target Gini coefficient without exceeding that season’s salary cap, and reports the ROW the Poisson GLM predicts for that structure.",
+                style={"marginBottom": "12px"},
+            ),
+            dcc.Markdown(
+                "**Choose a season, a target Gini, a roster size range and last season’s ROW, then press Build Roster.**",
+                style={
+                    "fontStyle": "italic",
+                    "color": "#002244",
+                    "marginBottom": "8px",
+                },
+            ),
+            html.Div(
+                [
+                    html.Div(
+                        dcc.Dropdown(
+                            id="rb-year",
+                            options=get_year_options(),
+                            value=max_year,
+                            clearable=False,
+                            className="dash-dropdown",
+                        ),
+                        style={"minWidth": "140px"},
+                    ),
+                    html.Div(
+                        [
+                            html.Label("Target Gini"),
+                            dcc.Input(
+                                id="rb-target",
+                                type="number",
+                                min=0.2,
+                                max=0.7,
+                                step=0.001,
+                                value=OPTIMAL_GINI,
+                            ),
+                        ],
+                    ),
+                    html.Div(
+                        [
+                            html.Label("Previous ROW"),
+                            dcc.Input(
+                                id="rb-prev-row",
+                                type="number",
+                                min=0,
+                                max=82,
+                                step=1,
+                                value=row_prev,
+                            ),
+                        ],
+                    ),
+                    html.Div(
+                        dcc.RangeSlider(
+                            id="rb-size",
+                            min=18,
+                            max=30,
+                            step=1,
+                            value=[20, 23],
+                            marks={n: str(n) for n in range(18, 31, 2)},
+                            tooltip={
+                                "placement": "bottom",
+                                "always_visible": False,
+                            },
+                        ),
+                        style={"flex": "1", "minWidth": "220px"},
+                    ),
+                    html.Button(
+                        "Build Roster",
+                        id="rb-run",
+                        n_clicks=0,
+                        className="dash-button",
+                    ),
+                    html.Button(
+                        "Cancel",
+                        id="rb-cancel",
+                        n_clicks=0,
+                        disabled=True,
+                        className="dash-button",
+                    ),
+                    html.Progress(id="rb-progress", value="0", max="1"),
+                ],
+                style={
+                    "display": "flex",
+                    "alignItems": "center",
+                    "gap": "18px",
+                    "marginBottom": "10px",
+                },
+                className="text-container",
+            ),
+            html.Div(
+                [
+                    html.Div(info, id="rb-info-line", style={"fontWeight": "bold"}),
+                    html.Div(detail, id="rb-detail-line", style={"marginTop": "6px"}),
+                ],
+                className="cta-box",
+                style={"padding": "10px 14px", "marginBottom": "10px"},
+            ),
+            html.Div(
+                dcc.Graph(id="rb-graph", figure=fig, style={"height": "520px"}),
+                className="plot-container",
+            ),
         ]
     )
 
@@ -685,111 +1226,211 @@ def model_comparison_section():
     )
 
 
-layout = html.Div(
-    [
-        html.Div(
-            [
-                # Title
-                html.H1(
-                    "Modeling the Impact of Salary Distribution on NHL Team Success"
-                ),
-                # Sub-heading and callout box
-                html.Div(
-                    [
-                        html.H3("Interactive Visualizations & Simulations Based On:"),
-                        html.Div(
-                            [
-                                dcc.Markdown(
-                                    """
+def model_overview():
+    """
+    Returns the default model tab: a short guide to the three model tabs.
+    """
+    return html.Div(
+        [
+            dcc.Markdown(
+                "Two models estimate how payroll inequality relates to Regulation + Overtime Wins. The Poisson GLM fits the concave Gini curve behind the optimal Gini coefficient of ~0.408, and the dynamic panel GMM checks that relationship against past performance and team-specific effects.",
+                style={"marginBottom": "12px"},
+            ),
+            dcc.Markdown(
+                "**Choose a tab above to load a model’s results, or the side-by-side comparison.**",
+                style={
+                    "fontStyle": "italic",
+                    "color": "#002244",
+                    "marginBottom": "8px",
+                },
+            ),
+        ],
+        className="text-container",
+    )
+
+
+# Tab value -> (label, section builder). Only the selected tab is rendered.
+MODEL_TABS = {
+    "overview": ("Overview", model_overview),
+    "glm": ("Poisson GLM", glm_model_section),
+    "gmm": ("Dynamic Panel GMM", gmm_model_section),
+    "comparison": ("Model Comparison", model_comparison_section),
+}
+
+
+@per_version
+def model_tab(data, tab):
+    """
+    Returns the component tree for one model tab, built once per data version.
+
+    Args:
+        tab (str): Key of MODEL_TABS.
+
+    Returns:
+        dash.development.base_component.Component: Section for the tab.
+    """
+    return MODEL_TABS[tab][1]()
+
+
+def model_analysis_section():
+    """
+    Returns the tabbed model analysis area.
+    The page ships with the lightweight overview tab; the GLM, GMM and
+    comparison sections are sent by a callback when their tab is selected.
+    """
+    return html.Div(
+        [
+            dcc.Tabs(
+                id="model-tabs",
+                value="overview",
+                children=[
+                    dcc.Tab(label=label, value=value)
+                    for value, (label, _) in MODEL_TABS.items()
+                ],
+                colors={"border": "#E2E8F0", "primary": NAVY, "background": ACCENT},
+                style={"marginBottom": "12px"},
+            ),
+            dcc.Loading(
+                html.Div(model_tab("overview"), id="model-tab-content"),
+                type="circle",
+                color=NAVY,
+            ),
+        ]
+    )
+
+
+def build_layout():
+    """
+    Builds the full page component tree from the current dataset.
+    """
+    return html.Div(
+        [
+            html.Div(
+                [
+                    # Title
+                    html.H1(
+                        "Modeling the Impact of Salary Distribution on NHL Team Success"
+                    ),
+                    # Sub-heading and callout box
+                    html.Div(
+                        [
+                            html.H3("Interactive Visualizations & Simulations Based On:"),
+                            html.Div(
+                                [
+                                    dcc.Markdown(
+                                        """
 >**"Modeling the Impact of Salary Distribution on NHL Team Success"**
 >*Sloane Holtby, McGill University*
 >July 2025  
 Read the full paper for detailed methodology and findings:https://sloholt.github.io/NHL-Salary-Inequality-Analysis/ 
 """,
-                                    style={"whiteSpace": "pre-line"},
-                                )
-                            ],
-                            className="cta-box",
-                        ),
-                    ],
-                ),
-                # Key Metrics Cards
-                html.Div(
-                    [
-                        html.Div(
-                            [
-                                html.Div("Optimal Gini: 0.408", className="card-title"),
-                                html.Div(
-                                    "Performance-maximizing salary dispersion.",
-                                    className="positive",
-                                ),
-                            ],
-                            className="card",
-                        ),
-                        html.Div(
-                            [
-                                html.Div(
-                                    "Average Salary: $2.17M", className="card-title"
-                                ),
-                                html.Div(
-                                    "Based on 2024-25 league AAVs", className="positive"
-                                ),
-                            ],
-                            className="card",
-                        ),
-                    ],
-                    className="kpi-row",
-                ),
-                # Overview block
-                html.Div(
-                    [
-                        html.H2("Overview"),
-                        html.Div(
-                            dcc.Markdown(
-                                """
+                                        style={"whiteSpace": "pre-line"},
+                                    )
+                                ],
+                                className="cta-box",
+                            ),
+                        ],
+                    ),
+                    # Key Metrics Cards
+                    html.Div(
+                        [
+                            html.Div(
+                                [
+                                    html.Div("Optimal Gini: 0.408", className="card-title"),
+                                    html.Div(
+                                        "Performance-maximizing salary dispersion.",
+                                        className="positive",
+                                    ),
+                                ],
+                                className="card",
+                            ),
+                            html.Div(
+                                [
+                                    html.Div(
+                                        "Average Salary: $2.17M", className="card-title"
+                                    ),
+                                    html.Div(
+                                        "Based on 2024-25 league AAVs", className="positive"
+                                    ),
+                                ],
+                                className="card",
+                            ),
+                        ],
+                        className="kpi-row",
+                    ),
+                    # Overview block
+                    html.Div(
+                        [
+                            html.H2("Overview"),
+                            html.Div(
+                                dcc.Markdown(
+                                    """
 This dashboard explores how NHL teams can optimize performance through strategic salary distribution. Drawing on ten seasons of data and leveraging Gini coefficients to measure intra-team inequality, the analysis reveals a concave relationship between salary dispersion and team success--suggesting that teams perform best when balancing high-paid stars with cost-effective depth players. Using both a Poisson Generalized Linear Model and a dynamic panel Generalized Method of Moments Model, the study identifies an optimal Gini coefficient of ~0.408, providing a practical benchmark for front offices aiming to maximize Regulation + Overtime Wins under the NHL's strict salary cap. Use this app to explore team-by-team salary structures, simulate roster scenarios, and examine how inequality has shaped historical performance.
 """
+                                ),
+                                className="text-container",
                             ),
-                            className="text-container",
-                        ),
-                    ]
-                ),
-                # League-wide plot
-                logo_scatter_section(),
-                RED_LINE,
-                html.H2("Team Explorer"),
-                # Team Salary Display
-                team_salary_selection(),
-                # Gini vs ROW Display
-                gini_vs_row_section(),
-                # Divider
-                RED_LINE,
-                html.H2("Model Analysis & Comparison"),
-                # GLM Model Display
-                glm_model_section(),
-                # GMM Model
-                gmm_model_section(),
-                # Model Comparisons
-                model_comparison_section(),
-                RED_LINE,
-                # Footer
-                html.Footer(
-                    [
-                        html.P("Sloane Holtby | McGill University"),
-                        html.P(
-                            "Based on research using Poisson GLM and GMM models on NHL salary data."
-                        ),
-                    ],
-                    style={
-                        "marginTop": "5px",
-                        "textAlign": "center",
-                        "fontSize": "1.15rem",
-                        "color": "#1A202C",
-                    },
-                ),
-            ],
-            className="content",
-        )
-    ],
-    className="page",
-)
+                        ]
+                    ),
+                    # League-wide plot
+                    logo_scatter_section(),
+                    RED_LINE,
+                    html.H2("Team Explorer"),
+                    # Team Salary Display
+                    team_salary_selection(),
+                    # Gini vs ROW Display
+                    gini_vs_row_section(),
+                    # Lorenz Curves
+                    lorenz_section(),
+                    # Player Search
+                    player_explorer_section(),
+                    # Contract Scatter
+                    contract_scatter_section(),
+                    # Roster Optimizer
+                    roster_builder_section(),
+                    # Divider
+                    RED_LINE,
+                    html.H2("Model Analysis & Comparison"),
+                    # GLM, GMM and comparison tabs, loaded on selection
+                    model_analysis_section(),
+                    RED_LINE,
+                    # Footer
+                    html.Footer(
+                        [
+                            html.P("Sloane Holtby | McGill University"),
+                            html.P(
+                                "Based on research using Poisson GLM and GMM models on NHL salary data."
+                            ),
+                            html.P(
+                                f"Data version {current().version}",
+                                style={"fontSize": "0.85rem"},
+                            ),
+                        ],
+                        style={
+                            "marginTop": "5px",
+                            "textAlign": "center",
+                            "fontSize": "1.15rem",
+                            "color": "#1A202C",
+                        },
+                    ),
+                ],
+                className="content",
+            )
+        ],
+        className="page",
+    )
+
+
+@per_version
+def _cached_layout(data):
+    return build_layout()
+
+
+def layout():
+    """
+    Returns the page layout, rebuilt once per data version.
+
+    Dash calls this on every page load, so dropdown options and slider ranges
+    pick up newly ingested seasons without a restart.
+    """
+    return _cached_layout()
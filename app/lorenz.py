@@ -0,0 +1,168 @@
+"""
+Lorenz curves for the NHL Salary Inequality Analysis Dash app.
+
+The Lorenz curve of every team-season is computed once per data version from the
+deduplicated cap hits and resampled onto a fixed population grid, giving a dense
+float32 matrix with one row per (Team, Year). Overlaying any set of team-seasons
+is then a row gather plus one figure build.
+"""
+
+# app/lorenz.py
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from app.constants import LIGHT_RED, NAVY
+from app.data import per_version
+from app.themes import apply_plot_style
+
+GRID_POINTS = 101
+
+
+class LorenzCurves:
+    """
+    Lorenz curves of all team-seasons on a shared population grid.
+
+    Curves are computed one salary frame at a time, so every team-season must
+    lie within a single frame (season partitions satisfy this).
+
+    Args:
+        seasons (iterable): Cleaned salary frames, e.g. SalaryPartitions.iter_seasons().
+        grid_points (int): Number of population shares from 0 to 1.
+    """
+
+    def __init__(self, seasons, grid_points: int = GRID_POINTS):
+        self.grid = np.linspace(0.0, 1.0, grid_points)
+        keys, curves = [], []
+        for salary in seasons:
+            salary = salary[salary["Cap Hit"] > 0].sort_values(["Team", "Year", "Cap Hit"])
+            groups = salary[["Team", "Year"]].drop_duplicates()
+            keys += zip(groups["Team"], groups["Year"].astype(int))
+
+            x = salary["Cap Hit"].to_numpy(dtype=float)
+            sizes = salary.groupby(["Team", "Year"], sort=False).size().to_numpy()
+            bounds = np.r_[0, np.cumsum(sizes)]
+            for i in range(len(sizes)):
+                cap = x[bounds[i] : bounds[i + 1]]
+                shares = np.r_[0.0, np.cumsum(cap)] / cap.sum()
+                population = np.linspace(0.0, 1.0, len(cap) + 1)
+                curves.append(np.interp(self.grid, population, shares))
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self._rows = {key: i for i, key in enumerate(self.keys)}
+        self.curves = np.array([curves[i] for i in order], dtype=np.float32).reshape(
+            len(order), grid_points
+        )
+
+    def rows(self, teams, years) -> np.ndarray:
+        """
+        Returns matrix row positions for every available (team, year) pair.
+
+        Args:
+            teams (list): Team abbreviations.
+            years (list): Season start years.
+
+        Returns:
+            np.ndarray: Row positions in key order of the inputs.
+        """
+        pairs = ((team, int(year)) for team in teams for year in years)
+        return np.array([self._rows[p] for p in pairs if p in self._rows], dtype=int)
+
+    def league_average(self, years) -> np.ndarray:
+        """
+        Returns the mean Lorenz curve over all teams in the given seasons.
+
+        Args:
+            years (list): Season start years.
+
+        Returns:
+            np.ndarray: Curve on the population grid.
+        """
+        years = {int(y) for y in years}
+        mask = np.array([year in years for _, year in self.keys])
+        return self.curves[mask].mean(axis=0) if mask.any() else self.curves.mean(axis=0)
+
+
+@per_version
+def get_lorenz_curves(data) -> LorenzCurves:
+    """
+    Returns the Lorenz curves for the current data version, building them once.
+
+    Returns:
+        LorenzCurves: Curves over the current salary table, built season by season.
+    """
+    return LorenzCurves(data.salary.iter_seasons())
+
+
+def lorenz_fig(teams: list, years: list):
+    """
+    Overlays the Lorenz curves of the selected team-seasons on the league average.
+
+    Args:
+        teams (list): Team abbreviations; empty for every team.
+        years (list): Season start years.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Plotly figure object.
+    """
+    lorenz = get_lorenz_curves()
+    teams = teams or sorted({team for team, _ in lorenz.keys})
+    rows = lorenz.rows(teams, years)
+    grid = lorenz.grid
+    few = len(rows) <= 10
+
+    if few:
+        palette = px.colors.qualitative.Safe
+        traces = [
+            go.Scatter(
+                x=grid,
+                y=lorenz.curves[i],
+                mode="lines",
+                line=dict(color=palette[k % len(palette)], width=1.5),
+                name=f"{lorenz.keys[i][0]} {lorenz.keys[i][1]}",
+                hovertemplate="%{fullData.name}<br>Bottom %{x:.0%} earn %{y:.1%}<extra></extra>",
+            )
+            for k, i in enumerate(rows)
+        ]
+    else:
+        # Many curves: one float32 trace, curves separated by NaN gaps.
+        gap = np.full((len(rows), 1), np.nan, dtype=np.float32)
+        traces = [
+            go.Scatter(
+                x=np.tile(np.r_[grid, np.nan].astype(np.float32), len(rows)),
+                y=np.hstack([lorenz.curves[rows], gap]).ravel(),
+                mode="lines",
+                line=dict(color=NAVY, width=1),
+                opacity=max(0.15, 3 / np.sqrt(len(rows))),
+                name=f"{len(rows)} team-seasons",
+                connectgaps=False,
+                hoverinfo="skip",
+            )
+        ]
+    traces.append(
+        go.Scatter(
+            x=grid,
+            y=lorenz.league_average(years),
+            mode="lines",
+            line=dict(color=LIGHT_RED, width=3),
+            name="League average",
+            hovertemplate="League average<br>Bottom %{x:.0%} earn %{y:.1%}<extra></extra>",
+        )
+    )
+    traces.append(
+        go.Scatter(
+            x=[0, 1],
+            y=[0, 1],
+            mode="lines",
+            line=dict(color=NAVY, width=1, dash="dash"),
+            name="Perfect equality",
+            hoverinfo="skip",
+        )
+    )
+    fig = go.Figure(traces)
+    fig.update_xaxes(title="Share of Roster (lowest paid first)", tickformat=".0%", range=[0, 1])
+    fig.update_yaxes(title="Share of Payroll", tickformat=".0%", range=[0, 1])
+    fig = apply_plot_style(fig, title="Lorenz Curves of Team Payrolls")
+    fig.update_layout(showlegend=few)
+    return fig
@@ -0,0 +1,260 @@
+"""
+Roster construction optimizer for the NHL Salary Inequality Analysis Dash app.
+
+Builds a roster from a season's pool of player contracts that lands on a target
+Gini coefficient, stays under the salary cap and within a roster-size range,
+and maximizes the Poisson GLM's predicted ROW.
+
+The search is an iterated local search over add / remove / swap moves. The Gini
+coefficient is tracked through the sum of absolute pairwise differences
+
+    G = D / (n * S),  D = sum_{i<j} |x_i - x_j|,  S = sum_i x_i
+
+so every candidate move is scored in O(log n) from a sorted roster and its
+cumulative sums, and all moves for one step are evaluated as a NumPy batch.
+"""
+
+# app/optimizer.py
+import numpy as np
+import pandas as pd
+
+from app.constants import OPTIMAL_GINI, SALARY_CAP
+from app.data import current
+from app.figures import get_mean_prev_row, predict_row
+
+# Penalty per unit of Gini outside the tolerance band / per cap fraction over.
+CONSTRAINT_PENALTY = 1_000.0
+
+
+def get_player_pool(year: int) -> pd.DataFrame:
+    """
+    Returns one contract per player for a season.
+
+    Players who appear on several teams in a season keep their largest cap hit.
+
+    Args:
+        year (int): Season start year.
+
+    Returns:
+        pd.DataFrame: Columns Player, Team and Cap Hit, sorted by Cap Hit descending.
+    """
+    sub = current().salary.season(year)[["Player", "Team", "Cap Hit"]]
+    sub = sub[sub["Cap Hit"] > 0]
+    return (
+        sub.sort_values("Cap Hit", ascending=False)
+        .drop_duplicates("Player")
+        .reset_index(drop=True)
+    )
+
+
+def _abs_dev_sums(values, xs, cum):
+    """
+    Returns sum_j |v - xs_j| for every v in values against a sorted roster.
+
+    Args:
+        values (np.ndarray): Query salaries.
+        xs (np.ndarray): Sorted roster salaries.
+        cum (np.ndarray): Cumulative sums of xs with a leading zero.
+
+    Returns:
+        np.ndarray: Sum of absolute deviations for each query value.
+    """
+    n = len(xs)
+    k = np.searchsorted(xs, values)
+    below = cum[k]
+    return values * k - below + (cum[n] - below) - values * (n - k)
+
+
+def _gini(x) -> float:
+    """
+    Computes the Gini coefficient of a salary vector from scratch.
+
+    Args:
+        x (np.ndarray): Salaries.
+
+    Returns:
+        float: Gini coefficient (0 for an empty or zero-sum vector).
+    """
+    x = np.sort(np.asarray(x, dtype=float))
+    n, total = len(x), x.sum()
+    if n == 0 or total <= 0:
+        return 0.0
+    ranks = np.arange(1, n + 1)
+    return float(np.sum((2 * ranks - n - 1) * x) / (n * total))
+
+
+class _Objective:
+    """Scores (Gini, payroll) pairs; vectorized over candidate moves."""
+
+    def __init__(self, target_gini, gini_tol, cap, row_prev, spend_weight):
+        self.target_gini = target_gini
+        self.gini_tol = gini_tol
+        self.cap = cap
+        self.row_prev = row_prev
+        self.spend_weight = spend_weight
+
+    def __call__(self, gini, total):
+        gini_miss = np.maximum(np.abs(gini - self.target_gini) - self.gini_tol, 0.0)
+        cap_over = np.maximum(total - self.cap, 0.0) / self.cap
+        return (
+            predict_row(gini, self.row_prev)
+            + self.spend_weight * np.minimum(total, self.cap) / self.cap
+            - CONSTRAINT_PENALTY * (gini_miss + cap_over)
+        )
+
+
+def _descend(in_roster, pool, objective, min_size, max_size):
+    """
+    Runs steepest-ascent local search from a starting roster.
+
+    Args:
+        in_roster (np.ndarray): Boolean mask over the pool; updated in place.
+        pool (np.ndarray): Pool salaries.
+        objective (_Objective): Scoring function.
+        min_size (int): Minimum roster size.
+        max_size (int): Maximum roster size.
+
+    Returns:
+        float: Objective value of the local optimum.
+    """
+    roster_idx = np.flatnonzero(in_roster)
+    xs = np.sort(pool[roster_idx])
+    cum = np.concatenate(([0.0], np.cumsum(xs)))
+    n, total = len(xs), cum[-1]
+    pair_sum = float(np.sum((2 * np.arange(1, n + 1) - n - 1) * xs))
+    best = float(objective(pair_sum / (n * total), total))
+
+    while True:
+        out_idx = np.flatnonzero(~in_roster)
+        a, b = pool[roster_idx], pool[out_idx]
+        dev_a = _abs_dev_sums(a, xs, cum)
+        dev_b = _abs_dev_sums(b, xs, cum)
+
+        move, score = None, best
+        # Swap: remove a_i, add b_c.
+        d_swap = pair_sum - dev_a[:, None] + dev_b[None, :] - np.abs(a[:, None] - b[None, :])
+        s_swap = total - a[:, None] + b[None, :]
+        scores = objective(d_swap / (n * s_swap), s_swap)
+        i, c = np.unravel_index(np.argmax(scores), scores.shape)
+        if scores[i, c] > score + 1e-9:
+            move, score = ("swap", i, c, d_swap[i, c], s_swap[i, c]), scores[i, c]
+        # Add b_c.
+        if n < max_size and len(b):
+            d_add, s_add = pair_sum + dev_b, total + b
+            scores = objective(d_add / ((n + 1) * s_add), s_add)
+            c = int(np.argmax(scores))
+            if scores[c] > score + 1e-9:
+                move, score = ("add", None, c, d_add[c], s_add[c]), scores[c]
+        # Remove a_i.
+        if n > min_size:
+            d_rem, s_rem = pair_sum - dev_a, total - a
+            scores = objective(d_rem / ((n - 1) * s_rem), s_rem)
+            i = int(np.argmax(scores))
+            if scores[i] > score + 1e-9:
+                move, score = ("remove", i, None, d_rem[i], s_rem[i]), scores[i]
+
+        if move is None:
+            return best
+
+        kind, i, c, pair_sum, total = move
+        if kind in ("swap", "remove"):
+            in_roster[roster_idx[i]] = False
+        if kind in ("swap", "add"):
+            in_roster[out_idx[c]] = True
+        best = float(score)
+        roster_idx = np.flatnonzero(in_roster)
+        xs = np.sort(pool[roster_idx])
+        cum = np.concatenate(([0.0], np.cumsum(xs)))
+        n = len(xs)
+
+
+def optimize_roster(
+    year: int,
+    target_gini: float = OPTIMAL_GINI,
+    row_prev: float = None,
+    min_size: int = 20,
+    max_size: int = 23,
+    cap: float = None,
+    gini_tol: float = 0.001,
+    spend_weight: float = 1.0,
+    restarts: int = 20,
+    seed: int = 0,
+    progress=None,
+) -> dict:
+    """
+    Picks player contracts from a season's pool to hit a target Gini under the cap.
+
+    The objective is the GLM-predicted ROW plus a small reward for payroll used
+    (the GLM has no talent term, so this breaks ties toward spending to the cap),
+    with heavy penalties for missing the Gini band or exceeding the cap. The
+    shipped GLM's predicted ROW falls as Gini rises, so the search settles at
+    the lower edge of the band, target_gini - gini_tol, whenever it can.
+
+    Args:
+        year (int): Season whose contracts form the pool.
+        target_gini (float): Desired team Gini coefficient.
+        row_prev (float): Previous-season ROW fed to the GLM. Defaults to the league mean.
+        min_size (int): Minimum number of players.
+        max_size (int): Maximum number of players.
+        cap (float): Payroll ceiling. Defaults to the season's salary cap.
+        gini_tol (float): Allowed absolute deviation from target_gini. The
+            default matches the 0.001 step of the app's target input.
+        spend_weight (float): ROW-equivalent reward for spending the full cap.
+        restarts (int): Number of perturb-and-descend rounds after the first descent.
+        seed (int): Random seed for the perturbations.
+        progress (callable): Optional progress(done, total) hook, called after
+            each descent.
+
+    Returns:
+        dict: roster (DataFrame), gini, gini_tol, total, cap, predicted_row,
+        size and feasible.
+    """
+    year = int(year)
+    min_size, max_size = int(min_size), int(max_size)
+    if min_size < 2 or max_size < min_size:
+        raise ValueError("Roster size range must satisfy 2 <= min_size <= max_size.")
+    if row_prev is None:
+        row_prev = get_mean_prev_row()
+    if cap is None:
+        cap = SALARY_CAP.get(year, max(SALARY_CAP.values()))
+
+    players = get_player_pool(year)
+    if len(players) < min_size:
+        raise ValueError(f"Not enough contracts in {year} to build a roster.")
+    pool = players["Cap Hit"].to_numpy(dtype=float)
+    objective = _Objective(target_gini, gini_tol, float(cap), float(row_prev), spend_weight)
+    rng = np.random.default_rng(seed)
+
+    # Start from an evenly spread slice of the pool, then climb.
+    start_size = (min_size + max_size) // 2
+    in_roster = np.zeros(len(pool), dtype=bool)
+    in_roster[np.linspace(0, len(pool) - 1, start_size).round().astype(int)] = True
+    best_score = _descend(in_roster, pool, objective, min_size, max_size)
+    best_roster = in_roster.copy()
+    if progress:
+        progress(1, restarts + 1)
+
+    for done in range(2, restarts + 2):
+        trial = best_roster.copy()
+        k = min(3, int(trial.sum()))
+        trial[rng.choice(np.flatnonzero(trial), size=k, replace=False)] = False
+        trial[rng.choice(np.flatnonzero(~trial), size=k, replace=False)] = True
+        score = _descend(trial, pool, objective, min_size, max_size)
+        if score > best_score + 1e-9:
+            best_score, best_roster = score, trial
+        if progress:
+            progress(done, restarts + 1)
+
+    roster = players[best_roster].reset_index(drop=True)
+    gini = _gini(roster["Cap Hit"].to_numpy())
+    total = float(roster["Cap Hit"].sum())
+    return {
+        "roster": roster,
+        "gini": gini,
+        "gini_tol": float(gini_tol),
+        "total": total,
+        "cap": float(cap),
+        "predicted_row": float(predict_row(gini, row_prev)),
+        "size": len(roster),
+        "feasible": abs(gini - target_gini) <= gini_tol + 1e-9 and total <= cap,
+    }
@@ -0,0 +1,673 @@
+"""
+Cleaning and derivation pipeline for the NHL Salary Inequality Analysis Dash app.
+
+Turns the raw inputs (player cap hits in SalaryData.csv and the standings
+columns of Teams.csv) into one validated, typed dataset:
+
+- salary: one row per player per team-season, Cap Hit as a float;
+- teams: one row per team-season with GP, ROW and every derived column
+  (RosterSize, Ave.Salary, Salary.Variation, Gini, Gini2, ROW_prev_actual)
+  plus the alternative inequality metrics in INEQUALITY_METRICS.
+
+Where Teams.csv already carries the published panel values (PUBLISHED_COLUMNS)
+for a season, those are kept, since the published model coefficients were fit
+on them; only seasons without them, such as ingested ones, are derived. Any
+disagreement beyond rounding between published and derived values is listed
+in the manifest.
+
+The dataset is written to data/processed/ as Parquet with a manifest holding
+the data version and source hashes, so request paths only ever read it. The
+salary table is partitioned by season (processed/salary/<year>.<digest>.parquet,
+each file named in the manifest), so ingesting a season writes one new file,
+and the app reads a season only when a view or an aggregate needs it.
+
+build_partitioned runs the same steps out of core: SalaryData.csv is read
+CHUNK_ROWS rows at a time, each batch is cleaned and spooled to per-season
+files, and then each season is deduplicated, written and aggregated on its
+own. Peak memory is one batch or one season rather than the whole history.
+
+Usage:
+    python -m app.pipeline
+"""
+
+# app/pipeline.py
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = REPO_ROOT / "data"
+PROCESSED_DIR_NAME = "processed"
+MANIFEST_FILE = "manifest.json"
+SALARY_PARTITIONS = "salary"
+CHUNK_ROWS = 250_000
+
+SALARY_FILE = "SalaryData.csv"
+TEAMS_FILE = "Teams.csv"
+
+STANDINGS_COLUMNS = ["Team", "Year", "GP", "ROW", "Team.Name"]
+
+SALARY_SCHEMA = {
+    "Season": "string",
+    "Player": "string",
+    "Year": "int16",
+    "Team": "string",
+    "Cap Hit": "float64",
+}
+TEAM_SCHEMA = {
+    "Team": "string",
+    "Year": "int16",
+    "GP": "int16",
+    "ROW": "int16",
+    "Ave.Salary": "float64",
+    "Salary.Variation": "float64",
+    "Gini": "float64",
+    "Gini2": "float64",
+    "RosterSize": "int16",
+    "Team.Name": "string",
+    "ROW_prev_actual": "float64",
+    "Theil": "float64",
+    "Atkinson0.5": "float64",
+    "Atkinson1": "float64",
+    "HHI": "float64",
+    "Top3Share": "float64",
+    "CV": "float64",
+}
+
+# Published Teams.csv columns kept over the derived ones, with the absolute
+# difference accepted as rounding when the two are compared.
+PUBLISHED_COLUMNS = {
+    "Ave.Salary": 1.0,
+    "Salary.Variation": 1.0,
+    "Gini": 5e-5,
+    "Gini2": 1e-4,
+    "RosterSize": 0,
+}
+
+SALARY_ORDER = (["Team", "Year", "Cap Hit", "Player"], [True, True, False, True])
+
+# Team-season inequality measures, selectable in place of Gini.
+INEQUALITY_METRICS = ["Gini", "Theil", "Atkinson0.5", "Atkinson1", "HHI", "Top3Share", "CV"]
+
+
+def clean_cap_hits(values: pd.Series) -> pd.Series:
+    """
+    Converts Cap Hit values such as "$8,625,000" to floats; values without a
+    number (missing, "N/A") become NaN.
+
+    Args:
+        values (pd.Series): Raw Cap Hit column.
+
+    Returns:
+        pd.Series: Cap hits as floats.
+    """
+    digits = values.astype(str).str.replace(r"[^0-9.]", "", regex=True)
+    return pd.to_numeric(digits, errors="coerce").astype(float)
+
+
+def clean_salary(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cleans raw contract rows into one row per player per team-season.
+
+    Rows without a player or team name (missing, or blank once stripped) are
+    dropped before anything is cast to string, so they never become a player
+    called "nan". Rows without a numeric Year or Cap Hit are dropped too,
+    Year before Season is derived from it, so one bad row never aborts a build.
+    Players listed more than once for a team-season keep their largest cap hit.
+
+    Args:
+        raw (pd.DataFrame): Player, Team, Year and Cap Hit (Season optional).
+
+    Returns:
+        pd.DataFrame: Typed salary table sorted by Team, Year and Cap Hit descending.
+    """
+    salary = raw.copy()
+    salary.columns = salary.columns.str.strip()
+    salary["Year"] = pd.to_numeric(salary["Year"], errors="coerce")
+    salary = salary.dropna(subset=["Year"])
+    if "Season" not in salary:
+        salary["Season"] = pd.NA
+    salary["Season"] = salary["Season"].fillna(
+        salary["Year"].map(lambda y: f"{int(y)}-{(int(y) + 1) % 100:02d}")
+    )
+    for col in ("Player", "Team"):
+        salary[col] = salary[col].astype("string").str.strip().replace("", pd.NA)
+    salary = salary.dropna(subset=["Player", "Team"])
+    salary["Cap Hit"] = clean_cap_hits(salary["Cap Hit"])
+    salary = salary.dropna(subset=["Cap Hit"])
+    return dedupe_salary(salary)
+
+
+def dedupe_salary(salary: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keeps each player's largest cap hit per team-season and applies the schema.
+
+    Idempotent, so batches cleaned separately can be merged and passed
+    through again. Ties keep the earliest row, so the result does not depend
+    on how the rows were batched.
+
+    Args:
+        salary (pd.DataFrame): Cleaned rows, possibly with repeated players.
+
+    Returns:
+        pd.DataFrame: Typed salary table sorted by Team, Year and Cap Hit descending.
+    """
+    salary = (
+        salary.sort_values("Cap Hit", ascending=False, kind="stable")
+        .drop_duplicates(["Team", "Year", "Player"])
+        .sort_values(SALARY_ORDER[0], ascending=SALARY_ORDER[1])
+        .reset_index(drop=True)
+    )
+    return salary[list(SALARY_SCHEMA)].astype(SALARY_SCHEMA)
+
+
+def team_season_stats(salary: pd.DataFrame) -> pd.DataFrame:
+    """
+    Derives roster size, payroll moments and inequality metrics for every team-season.
+
+    Salary.Variation is the population standard deviation and Gini the
+    population Gini coefficient, both as in the published panel. The remaining
+    metrics come out of the same grouped pass from per-player terms:
+
+    - Theil: mean of (x/mu) ln(x/mu);
+    - Atkinson0.5 / Atkinson1: 1 - (generalized mean of order 1 - eps) / mu;
+    - HHI: sum of squared payroll shares;
+    - Top3Share: share of payroll held by the three largest cap hits;
+    - CV: population standard deviation over the mean.
+
+    Args:
+        salary (pd.DataFrame): Cleaned salary table from clean_salary.
+
+    Returns:
+        pd.DataFrame: One row per Team/Year with RosterSize, Ave.Salary,
+        Salary.Variation, Gini, Gini2 and the INEQUALITY_METRICS columns.
+    """
+    players = salary[["Team", "Year", "Cap Hit"]].sort_values(["Team", "Year", "Cap Hit"])
+    players = players[players["Cap Hit"] > 0]
+    cap = players["Cap Hit"]
+    grouped = players.groupby(["Team", "Year"])["Cap Hit"]
+    n = grouped.transform("size")
+    total = grouped.transform("sum")
+    rank = grouped.cumcount() + 1
+    ratio = cap * n / total
+    players = players.assign(
+        weighted=(2 * rank - n - 1) * cap,
+        theil=ratio * np.log(ratio),
+        root=np.sqrt(cap),
+        log=np.log(cap),
+        share2=(cap / total) ** 2,
+        top3=cap.where(rank > n - 3, 0.0),
+    )
+
+    by_team = players.groupby(["Team", "Year"])
+    stats = by_team.agg(
+        RosterSize=("Cap Hit", "size"),
+        total=("Cap Hit", "sum"),
+        weighted=("weighted", "sum"),
+        theil=("theil", "mean"),
+        root=("root", "mean"),
+        log=("log", "mean"),
+        HHI=("share2", "sum"),
+        top3=("top3", "sum"),
+    )
+    mean = stats["total"] / stats["RosterSize"]
+    std = by_team["Cap Hit"].std(ddof=0).fillna(0.0)
+    stats["Ave.Salary"] = mean.round(2)
+    stats["Salary.Variation"] = std.round(2)
+    stats["Gini"] = (stats["weighted"] / (stats["RosterSize"] * stats["total"])).round(4)
+    stats["Gini2"] = (stats["Gini"] ** 2).round(8)
+    stats["Theil"] = stats["theil"]
+    stats["Atkinson0.5"] = 1 - stats["root"] ** 2 / mean
+    stats["Atkinson1"] = 1 - np.exp(stats["log"]) / mean
+    stats["Top3Share"] = stats["top3"] / stats["total"]
+    stats["CV"] = std / mean
+    return stats.drop(
+        columns=["total", "weighted", "theil", "root", "log", "top3"]
+    ).reset_index()
+
+
+def previous_row(teams: pd.DataFrame) -> pd.Series:
+    """
+    Returns each team's ROW from the immediately preceding season.
+
+    Uses a grouped shift, blanked where the previous row is not year - 1
+    (expansion seasons and gaps).
+
+    Args:
+        teams (pd.DataFrame): Team panel with Team, Year and ROW.
+
+    Returns:
+        pd.Series: ROW_prev_actual aligned to teams.index.
+    """
+    ordered = teams.sort_values(["Team", "Year"])
+    by_team = ordered.groupby("Team")
+    prev_row = by_team["ROW"].shift().astype("float64")
+    contiguous = by_team["Year"].shift() == ordered["Year"] - 1
+    return prev_row.where(contiguous).reindex(teams.index)
+
+
+def _standings(standings: pd.DataFrame) -> pd.DataFrame:
+    """Returns the standings and any published panel columns, cleaned and typed."""
+    published = [col for col in PUBLISHED_COLUMNS if col in standings]
+    teams = standings[STANDINGS_COLUMNS + published].copy()
+    teams["Team"] = teams["Team"].astype(str).str.strip()
+    teams["Team.Name"] = teams["Team.Name"].astype(str).str.strip()
+    teams["Year"] = pd.to_numeric(teams["Year"], errors="coerce")
+    for col in published:
+        teams[col] = pd.to_numeric(teams[col], errors="coerce")
+    return teams
+
+
+def published_differences(standings: pd.DataFrame, stats: pd.DataFrame) -> list:
+    """
+    Lists published panel values that disagree with the derived ones beyond rounding.
+
+    Args:
+        standings (pd.DataFrame): Teams.csv columns, with the published panel values.
+        stats (pd.DataFrame): team_season_stats output.
+
+    Returns:
+        list: Lines such as "NYR 2020 RosterSize: published 40, derived 27".
+    """
+    teams = _standings(standings)
+    teams = teams.merge(
+        stats.astype({"Year": teams["Year"].dtype}), on=["Team", "Year"], suffixes=("", "_derived")
+    )
+    lines = []
+    for col, tolerance in PUBLISHED_COLUMNS.items():
+        if col not in standings:
+            continue
+        published, derived = teams[col], teams[f"{col}_derived"]
+        for _, row in teams[published.notna() & ((published - derived).abs() > tolerance)].iterrows():
+            lines.append(
+                f"{row['Team']} {int(row['Year'])} {col}: "
+                f"published {row[col]:.10g}, derived {row[f'{col}_derived']:.10g}"
+            )
+    return lines
+
+
+def derive_teams(standings: pd.DataFrame, salary: pd.DataFrame = None, stats: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Builds the typed team panel from standings and the cleaned salary table.
+
+    Published panel values in the standings win over the derived ones; the
+    derived values fill the seasons (or cells) that have none.
+
+    Args:
+        standings (pd.DataFrame): Team, Year, GP, ROW and Team.Name, plus
+            optionally the PUBLISHED_COLUMNS.
+        salary (pd.DataFrame): Cleaned salary table from clean_salary.
+        stats (pd.DataFrame): team_season_stats output, used instead of salary
+            when the aggregates were built season by season.
+
+    Returns:
+        pd.DataFrame: Team panel with every derived column.
+    """
+    if stats is None:
+        stats = team_season_stats(salary)
+    teams = _standings(standings)
+    teams = teams.merge(
+        stats.astype({"Year": teams["Year"].dtype}),
+        on=["Team", "Year"],
+        how="left",
+        suffixes=("", "_derived"),
+    )
+    for col in PUBLISHED_COLUMNS:
+        if col in standings:
+            teams[col] = teams[col].fillna(teams[f"{col}_derived"])
+    teams["ROW_prev_actual"] = previous_row(teams)
+    teams = teams.sort_values(["Team", "Year"]).reset_index(drop=True)
+    return teams[list(TEAM_SCHEMA)].astype(TEAM_SCHEMA)
+
+
+def validate(teams: pd.DataFrame, salary: pd.DataFrame):
+    """
+    Checks the dataset's schema and invariants.
+
+    Args:
+        teams (pd.DataFrame): Team panel.
+        salary (pd.DataFrame): Salary table.
+
+    Raises:
+        ValueError: If any check fails.
+    """
+    problems = _team_problems(teams) + _salary_problems(salary)
+    if problems:
+        raise ValueError("Invalid dataset: " + "; ".join(problems))
+
+
+def _schema_problems(name, frame, schema) -> list:
+    if list(frame.columns) != list(schema):
+        return [f"{name} columns {list(frame.columns)} != {list(schema)}"]
+    return [
+        f"{name}.{col} is {frame[col].dtype}, expected {dtype}"
+        for col, dtype in schema.items()
+        if str(frame[col].dtype) != dtype
+    ]
+
+
+def _team_problems(teams) -> list:
+    problems = _schema_problems("teams", teams, TEAM_SCHEMA)
+    if problems:
+        return problems
+    if teams.duplicated(["Team", "Year"]).any():
+        problems.append("teams has duplicate Team/Year rows")
+    if teams["Gini"].notna().any() and not teams["Gini"].dropna().between(0, 1).all():
+        problems.append("teams.Gini outside [0, 1]")
+    if (teams["ROW"] > teams["GP"]).any():
+        problems.append("teams.ROW exceeds GP")
+    return problems
+
+
+def _salary_problems(salary) -> list:
+    problems = _schema_problems("salary", salary, SALARY_SCHEMA)
+    if problems:
+        return problems
+    if salary["Player"].isna().any() or salary["Player"].str.lower().isin(["nan", "none"]).any():
+        problems.append("salary has rows without a player name")
+    if salary.duplicated(["Team", "Year", "Player"]).any():
+        problems.append("salary has duplicate Team/Year/Player rows")
+    if (salary["Cap Hit"] < 0).any():
+        problems.append("salary has negative cap hits")
+    return problems
+
+
+def build(raw_salary: pd.DataFrame, standings: pd.DataFrame):
+    """
+    Runs the full cleaning and derivation pipeline.
+
+    Args:
+        raw_salary (pd.DataFrame): Raw contract rows.
+        standings (pd.DataFrame): Team, Year, GP, ROW and Team.Name.
+
+    Returns:
+        tuple: (teams, salary) validated, typed DataFrames.
+    """
+    salary = clean_salary(raw_salary)
+    teams = derive_teams(standings, salary)
+    validate(teams, salary)
+    return teams, salary
+
+
+def iter_salary_batches(path: Path, chunksize: int = CHUNK_ROWS):
+    """
+    Reads a raw salary CSV in chunks and yields each chunk cleaned.
+
+    A player can appear in several batches; dedupe_salary over a whole season
+    removes those repeats.
+
+    Args:
+        path (Path): Raw salary CSV.
+        chunksize (int): Raw rows per batch.
+
+    Yields:
+        pd.DataFrame: Cleaned, typed salary rows.
+    """
+    with pd.read_csv(path, chunksize=chunksize) as reader:
+        for raw in reader:
+            batch = clean_salary(raw)
+            if len(batch):
+                yield batch
+
+
+def build_partitioned(data_dir: Path = DATA_DIR, version: int = 0, chunksize: int = CHUNK_ROWS):
+    """
+    Runs the pipeline over the salary CSV in bounded memory and writes the result.
+
+    The first pass spools each cleaned batch to per-season files. The second
+    pass loads one season at a time, deduplicates it, validates it, writes its
+    partition and computes its team-season aggregates, which are all that the
+    team panel needs from the salary table. Partitions are written under new
+    names next to the live ones (see write_processed), so a running app keeps
+    reading the files its manifest named.
+
+    Args:
+        data_dir (Path): Directory holding the data files.
+        version (int): Data version to stamp.
+        chunksize (int): Raw rows per batch.
+
+    Returns:
+        tuple: (teams, number of salary rows written).
+    """
+    out = data_dir / PROCESSED_DIR_NAME
+    partitions = out / SALARY_PARTITIONS
+    partitions.mkdir(parents=True, exist_ok=True)
+    spool = out / ".spool"
+    shutil.rmtree(spool, ignore_errors=True)
+    spool.mkdir()
+    previous = _partition_files(out)
+    files = {}
+    try:
+        for i, batch in enumerate(iter_salary_batches(data_dir / SALARY_FILE, chunksize)):
+            for year, part in batch.groupby("Year"):
+                season_dir = spool / str(int(year))
+                season_dir.mkdir(exist_ok=True)
+                part.to_parquet(season_dir / f"{i:06d}.parquet", index=False)
+
+        stats, problems, rows = [], [], 0
+        for season_dir in sorted(spool.iterdir(), key=lambda p: int(p.name)):
+            batches = sorted(season_dir.glob("*.parquet"))
+            season = dedupe_salary(pd.concat([pd.read_parquet(f) for f in batches], ignore_index=True))
+            problems += [f"{season_dir.name}: {p}" for p in _salary_problems(season)]
+            files[season_dir.name] = _write_partition(partitions, season_dir.name, season)
+            stats.append(team_season_stats(season))
+            rows += len(season)
+
+        standings = pd.read_csv(data_dir / TEAMS_FILE)
+        standings.columns = standings.columns.str.strip()
+        stats = pd.concat(stats, ignore_index=True)
+        teams = derive_teams(standings, stats=stats)
+        problems = _team_problems(teams) + problems
+        if problems:
+            raise ValueError("Invalid dataset: " + "; ".join(problems))
+
+        _write_teams_parquet(out, teams)
+        _write_manifest(out, version, data_dir, published_differences(standings, stats), files)
+    except BaseException:
+        _retire_partitions(partitions, previous)
+        raise
+    finally:
+        shutil.rmtree(spool, ignore_errors=True)
+    _retire_partitions(partitions, previous | set(files.values()))
+    return teams, rows
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_hashes(data_dir: Path = DATA_DIR) -> dict:
+    """
+    Returns SHA-256 digests of the raw input files and of this module.
+
+    Hashing the pipeline code too means a logic change invalidates old output.
+    Files are hashed in blocks, so large inputs are never held in memory.
+
+    Args:
+        data_dir (Path): Directory holding the data files.
+
+    Returns:
+        dict: File name -> hex digest.
+    """
+    paths = [data_dir / SALARY_FILE, data_dir / TEAMS_FILE, Path(__file__)]
+    return {path.name: _file_digest(path) for path in paths}
+
+
+def _read_manifest(out: Path) -> dict:
+    try:
+        return json.loads((out / MANIFEST_FILE).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_manifest(out: Path, version: int, data_dir: Path, differences=(), partitions=None):
+    manifest = {
+        "version": version,
+        "sources": source_hashes(data_dir),
+        "partitions": {str(y): partitions[y] for y in sorted(partitions or {}, key=int)},
+        "published_differences": list(differences),
+    }
+    tmp = out / f".{MANIFEST_FILE}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2) + "\n")
+    os.replace(tmp, out / MANIFEST_FILE)
+
+
+def _partition_files(out: Path) -> set:
+    """
+    Returns the partition files a reader may still hold: those named by the
+    current manifest, or every partition file if the manifest names none.
+    """
+    named = (_read_manifest(out) or {}).get("partitions")
+    if named is not None:
+        return set(named.values())
+    return {p.name for p in (out / SALARY_PARTITIONS).glob("*.parquet")}
+
+
+def _write_partition(partitions: Path, year, season: pd.DataFrame) -> str:
+    """Writes one season under a content-addressed name and returns the name."""
+    tmp = partitions / f".{int(year)}.parquet.tmp"
+    season.to_parquet(tmp, index=False)
+    name = f"{int(year)}.{_file_digest(tmp)[:16]}.parquet"
+    os.replace(tmp, partitions / name)
+    return name
+
+
+def _retire_partitions(partitions: Path, keep: set):
+    """Deletes partition files that neither the new nor the previous manifest names."""
+    for path in partitions.glob("*.parquet"):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+
+
+def _write_teams_parquet(out: Path, teams: pd.DataFrame):
+    tmp = out / ".teams.parquet.tmp"
+    teams.to_parquet(tmp, index=False)
+    os.replace(tmp, out / "teams.parquet")
+
+
+def write_processed(teams, salary, version: int, data_dir: Path = DATA_DIR, seasons=None):
+    """
+    Writes the dataset and its manifest to data/processed/.
+
+    Salary partitions are never overwritten in place: each season is written
+    as <year>.<content digest>.parquet and the manifest names the file of
+    every season. Another process may still hold the previous manifest's
+    snapshot and read its files on demand, so a superseded file is deleted
+    only once a newer manifest has replaced the one that named it, i.e. on the
+    write after next.
+
+    Args:
+        teams (pd.DataFrame): Team panel.
+        salary (Mapping): Season -> that season's salary rows.
+        version (int): Data version the dataset was built for.
+        data_dir (Path): Directory holding the data files.
+        seasons (iterable): Seasons whose salary partitions changed, or None to
+            rewrite every partition. Only these seasons are read from salary.
+    """
+    out = data_dir / PROCESSED_DIR_NAME
+    partitions = out / SALARY_PARTITIONS
+    partitions.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(out) or {}
+    previous = _partition_files(out)
+    # Rewritten seasons are derived, so only the others keep their differences.
+    differences = []
+    if seasons is not None and manifest.get("partitions") is not None:
+        files = dict(manifest["partitions"])
+        rewritten = {str(int(y)) for y in seasons}
+        differences = [
+            line
+            for line in manifest.get("published_differences", [])
+            if line.split()[1] not in rewritten
+        ]
+    else:
+        files = {}
+        seasons = list(salary.keys())
+    for year in sorted(int(y) for y in seasons):
+        season = salary[year] if year in salary else None
+        if season is None or season.empty:
+            files.pop(str(year), None)
+        else:
+            files[str(year)] = _write_partition(partitions, year, season)
+    _write_teams_parquet(out, teams)
+    _write_manifest(out, version, data_dir, differences, files)
+    _retire_partitions(partitions, previous | set(files.values()))
+
+
+def read_partition(path: Path) -> pd.DataFrame:
+    """
+    Reads one season's salary partition.
+
+    Args:
+        path (Path): Partition file.
+
+    Returns:
+        pd.DataFrame: Typed salary rows in SALARY_ORDER.
+    """
+    return pd.read_parquet(path).astype(SALARY_SCHEMA)
+
+
+def read_processed(version: int, data_dir: Path = DATA_DIR):
+    """
+    Locates the processed dataset if it matches the data version and raw inputs.
+
+    Only the team panel is read; salary partitions are listed, not loaded.
+
+    Args:
+        version (int): Expected data version.
+        data_dir (Path): Directory holding the data files.
+
+    Returns:
+        tuple or None: (teams, {season: partition path}), or None if missing
+        or stale.
+    """
+    out = data_dir / PROCESSED_DIR_NAME
+    manifest = _read_manifest(out)
+    if manifest is None:
+        return None
+    partitions = out / SALARY_PARTITIONS
+    if not partitions.is_dir():
+        return None
+    if manifest.get("version") != version or manifest.get("sources") != source_hashes(data_dir):
+        return None
+    named = manifest.get("partitions")
+    if named is None:
+        return None
+    files = {int(year): partitions / name for year, name in named.items()}
+    if not all(path.is_file() for path in files.values()):
+        return None
+    teams = pd.read_parquet(out / "teams.parquet").astype(TEAM_SCHEMA)
+    return teams, dict(sorted(files.items()))
+
+
+def run(data_dir: Path = DATA_DIR, version: int = 0):
+    """
+    Builds the dataset from the raw CSVs in bounded memory and writes it.
+
+    Args:
+        data_dir (Path): Directory holding the data files.
+        version (int): Data version to stamp.
+
+    Returns:
+        tuple: (teams, number of salary rows written).
+    """
+    return build_partitioned(data_dir, version)
+
+
+if __name__ == "__main__":
+    from app.data import read_version
+
+    teams, rows = run(version=read_version())
+    print(f"Wrote {len(teams)} team-seasons and {rows} player-seasons to data/processed/")
+    differences = _read_manifest(DATA_DIR / PROCESSED_DIR_NAME)["published_differences"]
+    if differences:
+        print("Published Teams.csv values kept where the salary rows disagree:")
+        print("\n".join(f"  {line}" for line in differences))
@@ -0,0 +1,176 @@
+"""
+Player search and career lookups for the NHL Salary Inequality Analysis Dash app.
+
+A PlayerIndex is built once per data version. Every word-start of every
+normalized player name ("connor mcdavid", "mcdavid") is stored in one sorted
+array, so a type-ahead prefix query is two bisections and a slice. Each
+player's contracts (season, team, cap hit) are stored contiguously in the
+index as small coded arrays, so a career timeline is a slice of the index and
+never reads a salary partition.
+"""
+
+# app/players.py
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from app.constants import NAVY
+from app.data import empty_salary, per_version
+from app.pipeline import SALARY_SCHEMA
+from app.themes import apply_plot_style
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercases a name and strips accents and punctuation for matching.
+
+    Args:
+        name (str): Player name or query.
+
+    Returns:
+        str: Normalized name with single spaces between words.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    ascii_name = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    cleaned = "".join(ch if ch.isalnum() else " " for ch in ascii_name.lower())
+    return " ".join(cleaned.split())
+
+
+class PlayerIndex:
+    """
+    Prefix index and posting lists over the players in a salary table.
+
+    The index is built one season at a time. It keeps every contract's
+    Season, Team and Year as codes and its Cap Hit, grouped by player, which is
+    all a career lookup needs.
+
+    Args:
+        salary (SalaryPartitions): Cleaned salary table keyed by season.
+    """
+
+    def __init__(self, salary):
+        columns = {
+            c: [np.array([], dtype=object)] for c in ("Season", "Player", "Year", "Team", "Cap Hit")
+        }
+        for season in salary.iter_seasons():
+            for c, parts in columns.items():
+                parts.append(season[c].to_numpy(dtype=object))
+        players = np.concatenate(columns["Player"])
+        names, inverse = np.unique(players, return_inverse=True)
+        self.names = names.tolist()
+
+        order = np.argsort(inverse, kind="stable")
+        self._bounds = np.searchsorted(inverse[order], np.arange(len(names) + 1))
+        self._player_ids = {name: i for i, name in enumerate(self.names)}
+        self._year = np.concatenate(columns["Year"]).astype(np.int16)[order]
+        self._cap_hit = np.concatenate(columns["Cap Hit"]).astype(float)[order]
+        season_codes, self._season_names = pd.factorize(np.concatenate(columns["Season"]))
+        team_codes, self._team_names = pd.factorize(np.concatenate(columns["Team"]))
+        self._season = season_codes.astype(np.int16)[order]
+        self._team = team_codes.astype(np.int16)[order]
+        self._last_year = [
+            int(self._year[lo:hi].max()) for lo, hi in zip(self._bounds[:-1], self._bounds[1:])
+        ]
+
+        entries = []
+        for i, name in enumerate(self.names):
+            words = normalize_name(name).split()
+            for start in range(len(words)):
+                entries.append((" ".join(words[start:]), i))
+        entries.sort()
+        self._keys = [key for key, _ in entries]
+        self._ids = [i for _, i in entries]
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Returns players whose name, or any word in it, starts with the query.
+
+        Matches are ordered by most recent season, then name.
+
+        Args:
+            query (str): Search text.
+            limit (int): Maximum number of names to return.
+
+        Returns:
+            list: Matching player names.
+        """
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\uffff", lo)
+        ids = set(self._ids[lo:hi])
+        ranked = sorted(ids, key=lambda i: (-self._last_year[i], self.names[i]))
+        return [self.names[i] for i in ranked[:limit]]
+
+    def career(self, player: str):
+        """
+        Returns a player's salary rows across seasons and teams.
+
+        Args:
+            player (str): Exact player name.
+
+        Returns:
+            pd.DataFrame: Salary rows sorted by Year, empty if the player is unknown.
+        """
+        i = self._player_ids.get(player)
+        if i is None:
+            return empty_salary()
+        rows = slice(self._bounds[i], self._bounds[i + 1])
+        career = pd.DataFrame(
+            {
+                "Season": self._season_names[self._season[rows]],
+                "Player": player,
+                "Year": self._year[rows],
+                "Team": self._team_names[self._team[rows]],
+                "Cap Hit": self._cap_hit[rows],
+            }
+        ).astype(SALARY_SCHEMA)
+        return career.sort_values(["Year", "Cap Hit"], kind="stable")
+
+
+@per_version
+def get_player_index(data) -> PlayerIndex:
+    """
+    Returns the player index for the current data version, building it once.
+
+    Returns:
+        PlayerIndex: Index over the current salary table.
+    """
+    return PlayerIndex(data.salary)
+
+
+def player_career_fig(player: str):
+    """
+    Creates a cap hit timeline for one player across teams and seasons.
+
+    Args:
+        player (str): Exact player name.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Plotly figure object.
+    """
+    career = get_player_index().career(player)
+    if career.empty:
+        fig = go.Figure()
+        fig.update_layout(title=f"No salary data for {player}")
+        return apply_plot_style(fig)
+
+    fig = go.Figure(
+        go.Scatter(
+            x=career["Year"],
+            y=career["Cap Hit"],
+            mode="lines+markers+text",
+            text=career["Team"],
+            textposition="top center",
+            line=dict(color=NAVY),
+            marker=dict(color=NAVY, size=9),
+            hovertemplate="%{x} — %{text}<br>Cap Hit $%{y:,.0f}<extra></extra>",
+        )
+    )
+    fig.update_xaxes(dtick=1, title=None)
+    fig.update_yaxes(tickprefix="$", separatethousands=True, title="Cap Hit (USD)")
+    fig = apply_plot_style(fig, title=f"{player} Cap Hit by Season")
+    return fig
@@ -0,0 +1,376 @@
+"""
+Opt-in callback profiling and memory metrics for the NHL Salary Inequality Analysis Dash app.
+
+When enabled, a callback request is run under a stack sampler: a helper thread
+reads the request thread's Python stack every few milliseconds. Each profiled
+request writes two files named after the callback's outputs:
+
+    <time>-<outputs>.folded   collapsed stacks ("a;b;c count") for flamegraph
+                              tools such as flamegraph.pl, speedscope or inferno
+    <time>-<outputs>.txt      wall time and the hottest functions by self and
+                              total samples
+
+Sampling covers everything Dash does for the request, including the callback
+itself and the JSON encoding of its outputs. Only the newest PROFILE_MAX_FILES
+files are kept.
+
+Environment:
+    PROFILE_CALLBACKS   "1" to profile every callback request, or a fraction
+                        such as "0.05" to sample requests at random.
+    PROFILE_TOKEN       If set, a request carrying the header
+                        "X-Profile: <token>" is always profiled.
+    PROFILE_DIR         Output directory (default .cache/profiles).
+    PROFILE_INTERVAL_MS Sampling interval (default 5).
+    PROFILE_MAX_FILES   Files to retain (default 200).
+
+MemoryTracker is the memory counterpart. With MEMORY_METRICS=1 it runs
+tracemalloc and records, per callback, the peak memory traced above the level
+at entry (transient allocations such as DataFrame copies and figure trees)
+and the memory still held on return, plus the process RSS after every
+request. A least-squares fit over the recent RSS samples flags steady growth.
+Both are reported at /metrics. Cumulative allocation is not measured:
+tracemalloc only tracks live blocks, so memory allocated and freed again
+below the peak is not counted. tracemalloc's counters are process-wide, so
+measured callbacks run one at a time per worker; together with tracemalloc's
+own slowdown of allocation-heavy code, this makes the mode one for load
+replays, not normal serving.
+"""
+
+# app/profiling.py
+import functools
+import os
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from pathlib import Path
+
+import flask
+import numpy as np
+import psutil
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", REPO_ROOT / ".cache" / "profiles"))
+PROFILE_RATE = float(os.getenv("PROFILE_CALLBACKS", "0") or 0)
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+TOP_FUNCTIONS = 25
+
+MEMORY_METRICS = os.getenv("MEMORY_METRICS") == "1"
+RSS_WINDOW = 500
+RSS_MIN_SAMPLES = 50
+# Sustained RSS growth above this many bytes per request is reported as growing.
+RSS_GROWTH_LIMIT = 16 * 1024
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack from a helper thread until stopped.
+
+    Args:
+        thread_id (int): Identifier of the thread to sample.
+        interval (float): Seconds between samples.
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return False
+
+    def collapsed(self) -> str:
+        """
+        Returns the samples in collapsed-stack format, one stack per line.
+
+        Returns:
+            str: Lines of "root;...;leaf count".
+        """
+        return "".join(f"{';'.join(stack)} {n}\n" for stack, n in self.stacks.most_common())
+
+    def summary(self, name: str) -> str:
+        """
+        Returns a plain-text report of the hottest functions.
+
+        Args:
+            name (str): Callback outputs, for the header.
+
+        Returns:
+            str: Wall time, sample count and top functions by self and total samples.
+        """
+        own, total = Counter(), Counter()
+        for stack, n in self.stacks.items():
+            own[stack[-1]] += n
+            for label in set(stack):
+                total[label] += n
+        samples = sum(self.stacks.values())
+        lines = [
+            f"callback: {name}",
+            f"wall: {self.elapsed * 1000:.1f} ms, {samples} samples every {self.interval * 1000:g} ms",
+            "",
+        ]
+        for title, counts in (("self", own), ("total", total)):
+            lines.append(f"top functions by {title} samples:")
+            for label, n in counts.most_common(TOP_FUNCTIONS):
+                lines.append(f"  {n:6d}  {n / samples:6.1%}  {label}")
+            lines.append("")
+        return "\n".join(lines)
+
+
+class CallbackProfiler:
+    """
+    Wraps Dash's callback endpoint so selected requests run under a StackSampler.
+
+    Args:
+        rate (float): Fraction of callback requests to profile; 1 for all.
+        token (str): Value of the X-Profile header that forces profiling.
+        directory (Path): Output directory.
+        max_files (int): Number of profile files to retain.
+    """
+
+    def __init__(
+        self,
+        rate=PROFILE_RATE,
+        token=PROFILE_TOKEN,
+        directory=PROFILE_DIR,
+        max_files=PROFILE_MAX_FILES,
+    ):
+        self.rate = rate
+        self.token = token
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0 or bool(self.token)
+
+    def wanted(self, request) -> bool:
+        """Returns whether this request should be profiled."""
+        if self.token and request.headers.get("X-Profile") == self.token:
+            return True
+        return self.rate > 0 and random.random() < self.rate
+
+    def write(self, name: str, sampler: StackSampler):
+        """
+        Writes a sampler's collapsed stacks and summary, then prunes old files.
+
+        Args:
+            name (str): Callback outputs.
+            sampler (StackSampler): Finished sampler.
+        """
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-")[:80] or "callback"
+        now = time.time_ns()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now // 10**9))
+        stem = f"{stamp}-{now % 10**9:09d}-{slug}"
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{stem}.folded").write_text(sampler.collapsed())
+            (self.directory / f"{stem}.txt").write_text(sampler.summary(name))
+            # Names start with the timestamp, so name order is age order.
+            files = sorted(self.directory.glob("*-*.*"), key=lambda p: p.name)
+            for old in files[: max(len(files) - self.max_files, 0)]:
+                old.unlink(missing_ok=True)
+
+    def install(self, app):
+        """
+        Wraps the app's /_dash-update-component view. Does nothing when disabled.
+
+        Args:
+            app (Dash): Application whose callbacks are profiled.
+        """
+        if not self.enabled:
+            return
+        endpoint = app.config.routes_pathname_prefix + "_dash-update-component"
+        view = app.server.view_functions[endpoint]
+
+        @functools.wraps(view)
+        def profiled(*args, **kwargs):
+            request = flask.request
+            if not self.wanted(request):
+                return view(*args, **kwargs)
+            body = request.get_json(silent=True) or {}
+            with StackSampler(threading.get_ident()) as sampler:
+                response = view(*args, **kwargs)
+            self.write(str(body.get("output", "callback")), sampler)
+            return response
+
+        app.server.view_functions[endpoint] = profiled
+
+
+class MemoryTracker:
+    """
+    Per-callback peak and retained traced memory, and process RSS trend.
+
+    Args:
+        enabled (bool): Install the tracker; tracemalloc starts on install.
+        window (int): Number of recent RSS samples used for growth detection.
+    """
+
+    def __init__(self, enabled=MEMORY_METRICS, window=RSS_WINDOW):
+        self.enabled = enabled
+        self.requests = 0
+        self._callbacks = {}
+        self._rss = deque(maxlen=window)
+        self._process = None
+        self._lock = threading.Lock()
+        # Serializes measured calls: tracemalloc's peak is process-wide.
+        self._measuring = threading.Lock()
+
+    def _current_rss(self) -> int:
+        # psutil.Process binds a pid, so rebind after a fork.
+        if self._process is None or self._process.pid != os.getpid():
+            self._process = psutil.Process()
+        return self._process.memory_info().rss
+
+    def measure(self, name: str, call):
+        """
+        Runs call() and records its peak above entry and retained memory under name.
+
+        tracemalloc keeps one peak counter for the whole process, and
+        reset_peak() in one thread would clear another thread's peak. Calls are
+        therefore measured one at a time: other request threads wait here, so
+        each figure covers exactly one callback.
+
+        Args:
+            name (str): Callback outputs.
+            call (callable): Zero-argument function to run.
+
+        Returns:
+            Any: call()'s return value.
+        """
+        with self._measuring:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            try:
+                return call()
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                self.record(name, max(peak - before, 0), current - before, self._current_rss())
+
+    def record(self, name: str, peak_above_entry: int, retained: int, rss: int):
+        """
+        Adds one invocation's numbers to the aggregates.
+
+        Args:
+            name (str): Callback outputs.
+            peak_above_entry (int): Peak traced bytes above the level at entry.
+            retained (int): Traced bytes still held on return.
+            rss (int): Process RSS after the call.
+        """
+        with self._lock:
+            stats = self._callbacks.setdefault(
+                name,
+                {
+                    "calls": 0,
+                    "peak_above_entry_total": 0,
+                    "peak_above_entry_max": 0,
+                    "retained_total": 0,
+                },
+            )
+            stats["calls"] += 1
+            stats["peak_above_entry_total"] += peak_above_entry
+            stats["peak_above_entry_max"] = max(stats["peak_above_entry_max"], peak_above_entry)
+            stats["retained_total"] += retained
+            self.requests += 1
+            self._rss.append((self.requests, rss))
+
+    def rss_trend(self) -> dict:
+        """
+        Fits RSS against request count over the recent window.
+
+        Returns:
+            dict: Current RSS, samples, slope in bytes per request, correlation,
+            and whether growth is steady and above RSS_GROWTH_LIMIT.
+        """
+        with self._lock:
+            samples = np.array(self._rss, dtype=float)
+        trend = {"rss": int(samples[-1, 1]) if len(samples) else None, "samples": len(samples)}
+        if len(samples) < RSS_MIN_SAMPLES or np.ptp(samples[:, 1]) == 0:
+            trend.update(slope=0.0, correlation=0.0, growing=False)
+            return trend
+        slope = float(np.polyfit(samples[:, 0], samples[:, 1], 1)[0])
+        correlation = float(np.corrcoef(samples[:, 0], samples[:, 1])[0, 1])
+        trend.update(
+            slope=slope,
+            correlation=correlation,
+            growing=slope > RSS_GROWTH_LIMIT and correlation > 0.8,
+        )
+        return trend
+
+    def report(self) -> dict:
+        """
+        Returns the aggregates for the metrics endpoint.
+
+        Returns:
+            dict: "callbacks" (heaviest peak first, sizes in KiB) and "rss".
+        """
+        with self._lock:
+            items = sorted(
+                self._callbacks.items(), key=lambda kv: -kv[1]["peak_above_entry_total"]
+            )
+            callbacks = [
+                {
+                    "callback": name,
+                    "calls": s["calls"],
+                    "mean_peak_above_entry_kib": round(
+                        s["peak_above_entry_total"] / s["calls"] / 1024, 1
+                    ),
+                    "max_peak_above_entry_kib": round(s["peak_above_entry_max"] / 1024, 1),
+                    "mean_retained_kib": round(s["retained_total"] / s["calls"] / 1024, 1),
+                }
+                for name, s in items
+            ]
+        return {"enabled": self.enabled, "callbacks": callbacks, "rss": self.rss_trend()}
+
+    def install(self, app):
+        """
+        Starts tracemalloc and wraps the app's /_dash-update-component view.
+        Does nothing when disabled.
+
+        Args:
+            app (Dash): Application whose callbacks are measured.
+        """
+        if not self.enabled:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        endpoint = app.config.routes_pathname_prefix + "_dash-update-component"
+        view = app.server.view_functions[endpoint]
+
+        @functools.wraps(view)
+        def measured(*args, **kwargs):
+            body = flask.request.get_json(silent=True) or {}
+            name = str(body.get("output", "callback"))
+            return self.measure(name, lambda: view(*args, **kwargs))
+
+        app.server.view_functions[endpoint] = measured
@@ -0,0 +1,271 @@
+"""
+Pre-serialized and memoized HTTP responses for the NHL Salary Inequality Analysis Dash app.
+
+Dash answers every /_dash-layout request by walking the component tree and
+encoding it to JSON. The layout only changes when a season is ingested, so its
+JSON is encoded once per data version, compressed once with gzip and (when the
+brotli package is installed) brotli, and served from memory. Clients that send
+the version's ETag back get a bodiless 304.
+
+Callback requests are memoized the same way one level up: the callback inputs
+come from a small set of teams, seasons and ranges, so identical
+/_dash-update-component bodies recur across users. CallbackMemo keys each body
+by a canonical hash plus the data version and replays the stored gzip bytes
+without dispatching to the callback.
+"""
+
+# app/responses.py
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import diskcache
+import flask
+from plotly.io.json import to_json_plotly
+
+from app.data import current, per_version
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is always available.
+    brotli = None
+
+
+class EncodedPayload:
+    """
+    One JSON body held in every content encoding the server can send.
+
+    Args:
+        body (bytes): Uncompressed JSON.
+    """
+
+    def __init__(self, body: bytes):
+        self.bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body, quality=11)
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    def encoding_for(self, request) -> str:
+        """
+        Picks the smallest encoding the client accepts.
+
+        Args:
+            request (flask.Request): Incoming request.
+
+        Returns:
+            str: "br", "gzip" or "identity".
+        """
+        accepted = request.accept_encodings
+        for encoding in ("br", "gzip"):
+            if encoding in self.bodies and accepted[encoding]:
+                return encoding
+        return "identity"
+
+    def response(self, request, mimetype: str = "application/json") -> flask.Response:
+        """
+        Builds the response for a request, honouring If-None-Match.
+
+        The ETag is weak because the same entity is sent in several encodings.
+
+        Args:
+            request (flask.Request): Incoming request.
+            mimetype (str): Content type of the body.
+
+        Returns:
+            flask.Response: 304 when the client's copy is current, else the body.
+        """
+        if request.if_none_match.contains_weak(self.etag):
+            response = flask.Response(status=304)
+        else:
+            encoding = self.encoding_for(request)
+            response = flask.Response(self.bodies[encoding], mimetype=mimetype)
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(self.etag, weak=True)
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+@per_version
+def layout_payload(data, app) -> EncodedPayload:
+    """
+    Returns the encoded layout for the current data version, building it once.
+
+    Args:
+        app (Dash): Application whose layout (with any layout hooks) is served.
+
+    Returns:
+        EncodedPayload: Layout JSON in every supported encoding.
+    """
+    layout = app.get_layout() if hasattr(app, "get_layout") else app._layout_value()
+    return EncodedPayload(to_json_plotly(layout).encode("utf-8"))
+
+
+MEMO_MAX_BYTES = int(os.getenv("RESPONSE_MEMO_BYTES", 64 * 1024 * 1024))
+# Set to a directory to share memoized responses between workers on one machine.
+MEMO_DIR = os.getenv("RESPONSE_CACHE_DIR")
+MEMO_DIR_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CallbackMemo:
+    """
+    Response cache in front of Dash's callback dispatch.
+
+    Entries are gzip-compressed response bodies held in a byte-bounded LRU
+    map, optionally backed by a diskcache directory shared by every worker.
+    Only 200 JSON responses are stored; callbacks whose outputs are listed in
+    `exclude` (server-side session state, background jobs) always run.
+
+    Args:
+        exclude (set): "component-id.property" outputs that must not be memoized.
+        max_bytes (int): Memory budget for compressed bodies.
+        directory (str): Optional diskcache directory for the shared tier.
+    """
+
+    def __init__(self, exclude=(), max_bytes=MEMO_MAX_BYTES, directory=MEMO_DIR):
+        self.exclude = frozenset(exclude)
+        self.max_bytes = max_bytes
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.disk = None
+        if directory:
+            self.disk = diskcache.Cache(str(Path(directory)), size_limit=MEMO_DIR_MAX_BYTES)
+
+    def key(self, body: dict):
+        """
+        Returns the cache key for a callback request body, or None if uncacheable.
+
+        The key covers everything the callback can observe: outputs, inputs,
+        state and which props triggered it (for ctx.triggered_id).
+
+        Args:
+            body (dict): Parsed /_dash-update-component request body.
+
+        Returns:
+            str or None: Data version and body hash.
+        """
+        outputs = body.get("outputs")
+        outputs = outputs if isinstance(outputs, list) else [outputs]
+        for output in outputs:
+            if not isinstance(output, dict):
+                return None
+            if f"{output.get('id')}.{output.get('property')}" in self.exclude:
+                return None
+        canonical = json.dumps(
+            [
+                body.get("output"),
+                outputs,
+                body.get("inputs"),
+                body.get("state", []),
+                sorted(body.get("changedPropIds", [])),
+            ],
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=20).hexdigest()
+        return f"{current().version}:{digest}"
+
+    def get(self, key: str):
+        """Returns the gzip body stored under key, or None."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+        body = self.disk.get(key) if self.disk is not None else None
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, body)
+        return body
+
+    def put(self, key: str, body: bytes):
+        """Compresses and stores a response body under key."""
+        compressed = gzip.compress(body, compresslevel=6, mtime=0)
+        self._remember(key, compressed)
+        if self.disk is not None:
+            self.disk.set(key, compressed)
+
+    def _remember(self, key, compressed):
+        version = key.split(":", 1)[0]
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._bytes = 0
+                self._version = version
+            if key in self._entries or len(compressed) > self.max_bytes:
+                return
+            self._entries[key] = compressed
+            self._bytes += len(compressed)
+            while self._bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= len(old)
+
+    def stats(self) -> dict:
+        """
+        Returns hit, miss and size counters for the metrics endpoint.
+
+        Returns:
+            dict: hits, misses, entries and bytes held in memory.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def install(self, app):
+        """
+        Registers the lookup and store hooks on the app's Flask server.
+
+        Args:
+            app (Dash): Application whose callback endpoint is memoized.
+        """
+        path = app.config.routes_pathname_prefix + "_dash-update-component"
+
+        @app.server.before_request
+        def _replay():
+            request = flask.request
+            # Background callback polls carry their job in the query string.
+            if request.method != "POST" or request.path != path or request.query_string:
+                return None
+            body = request.get_json(silent=True)
+            key = self.key(body) if isinstance(body, dict) else None
+            if key is None:
+                return None
+            compressed = self.get(key)
+            if compressed is None:
+                flask.g.memo_key = key
+                return None
+            if request.accept_encodings["gzip"]:
+                response = flask.Response(compressed, mimetype="application/json")
+                response.headers["Content-Encoding"] = "gzip"
+            else:
+                response = flask.Response(gzip.decompress(compressed), mimetype="application/json")
+            response.headers["Vary"] = "Accept-Encoding"
+            return response
+
+        @app.server.after_request
+        def _store(response):
+            key = flask.g.pop("memo_key", None)
+            if (
+                key is not None
+                and response.status_code == 200
+                and response.mimetype == "application/json"
+                and "Content-Encoding" not in response.headers
+                and not response.direct_passthrough
+            ):
+                self.put(key, response.get_data())
+            return response
@@ -0,0 +1,103 @@
+"""
+Similar-roster search for the NHL Salary Inequality Analysis Dash app.
+
+Each team-season's payroll shape is summarized by the quantiles of its cap hits
+divided by the team's mean cap hit, so two rosters match when their salaries
+are spread the same way regardless of the cap level of their season. The
+feature vectors of all team-seasons form one float32 matrix with precomputed
+squared norms; a top-k query is a single matrix-vector product and an
+argpartition.
+"""
+
+# app/similar.py
+import numpy as np
+import pandas as pd
+
+from app.data import per_version
+
+QUANTILE_POINTS = 21
+
+
+class SimilarRosters:
+    """
+    Brute-force nearest-neighbour index over team-season payroll shapes.
+
+    Features are computed one salary frame at a time, so every team-season
+    must lie within a single frame (season partitions satisfy this).
+
+    Args:
+        seasons (iterable): Cleaned salary frames, e.g. SalaryPartitions.iter_seasons().
+        teams (pd.DataFrame): Team panel with ROW and Gini.
+        quantile_points (int): Number of evenly spaced quantiles per roster.
+    """
+
+    def __init__(self, seasons, teams, quantile_points: int = QUANTILE_POINTS):
+        probs = np.linspace(0.0, 1.0, quantile_points)
+        keys, features = [], []
+        for salary in seasons:
+            salary = salary[salary["Cap Hit"] > 0].sort_values(["Team", "Year", "Cap Hit"])
+            sizes = salary.groupby(["Team", "Year"], sort=True).size()
+            keys += [(team, int(year)) for team, year in sizes.index]
+
+            x = salary["Cap Hit"].to_numpy(dtype=float)
+            bounds = np.r_[0, np.cumsum(sizes.to_numpy())]
+            for i in range(len(sizes)):
+                cap = x[bounds[i] : bounds[i + 1]]
+                features.append(np.quantile(cap / cap.mean(), probs))
+
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self._rows = {key: i for i, key in enumerate(self.keys)}
+        self.features = np.array([features[i] for i in order], dtype=np.float32).reshape(
+            len(order), quantile_points
+        )
+        self._sq_norms = np.einsum("ij,ij->i", self.features, self.features)
+
+        index = pd.MultiIndex.from_tuples(self.keys, names=["Team", "Year"])
+        panel = teams.set_index(["Team", "Year"]).reindex(index)
+        self.row = panel["ROW"].to_numpy(dtype=float)
+        self.gini = panel["Gini"].to_numpy(dtype=float)
+
+    def nearest(self, team: str, year: int, k: int = 5) -> list:
+        """
+        Returns the k team-seasons whose payroll shape is closest to one roster.
+
+        Args:
+            team (str): Team abbreviation.
+            year (int): Season start year.
+            k (int): Number of neighbours.
+
+        Returns:
+            list: Dicts with Team, Year, Gini, ROW and Distance, nearest first;
+            empty if the team-season is not in the index.
+        """
+        i = self._rows.get((team, int(year)))
+        if i is None:
+            return []
+        query = self.features[i]
+        dist2 = self._sq_norms - 2 * (self.features @ query) + self._sq_norms[i]
+        dist2[i] = np.inf
+        k = min(k, len(self.keys) - 1)
+        top = np.argpartition(dist2, k)[:k]
+        top = top[np.argsort(dist2[top])]
+        return [
+            {
+                "Team": self.keys[j][0],
+                "Year": self.keys[j][1],
+                "Gini": float(self.gini[j]) if self.gini[j] == self.gini[j] else None,
+                "ROW": float(self.row[j]) if self.row[j] == self.row[j] else None,
+                "Distance": float(np.sqrt(max(dist2[j], 0.0))),
+            }
+            for j in top
+        ]
+
+
+@per_version
+def get_similar_rosters(data) -> SimilarRosters:
+    """
+    Returns the similar-roster index for the current data version, building it once.
+
+    Returns:
+        SimilarRosters: Index over the current salary table, built season by season.
+    """
+    return SimilarRosters(data.salary.iter_seasons(), data.teams)
@@ -0,0 +1,149 @@
+"""
+Monte Carlo simulation of next-season ROW for the NHL Salary Inequality Analysis Dash app.
+
+Draws GLM coefficients from their sampling distribution and then Poisson outcomes
+given those coefficients, so the predictive distribution reflects both parameter
+and outcome uncertainty. Draws are generated in fixed-size chunks and reduced to
+integer ROW counts immediately, so memory stays bounded by the chunk size no
+matter how many draws are requested.
+"""
+
+# app/simulation.py
+import numpy as np
+import plotly.graph_objects as go
+
+from app.constants import LIGHT_RED, NAVY
+from app.data import per_version
+from app.figures import glm_coefficients, predict_row
+from app.themes import apply_plot_style
+
+DEFAULT_DRAWS = 200_000
+CHUNK_SIZE = 50_000
+MAX_ROW = 82
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+@per_version
+def glm_covariance(data) -> np.ndarray:
+    """
+    Returns the covariance of the GLM coefficient estimates, once per version.
+
+    The published results carry only standard errors, so the full matrix is
+    rebuilt as a Poisson GLM's cov_params() would be: the inverse Fisher
+    information (X'WX)^-1 over the modelling sample, with W the fitted means
+    at the published estimates.
+
+    Args:
+        data (Dataset): Active data snapshot.
+
+    Returns:
+        np.ndarray: (4, 4) covariance for Intercept, Gini, Gini2 and Prev_ROW.
+    """
+    sample = data.model_sample
+    gini = sample["Gini"].to_numpy(dtype=float)
+    row_prev = sample["ROW_prev_actual"].to_numpy(dtype=float)
+    design = np.column_stack([np.ones_like(gini), gini, gini**2, row_prev])
+    weights = predict_row(gini, row_prev)
+    return np.linalg.pinv((design * weights[:, None]).T @ design, hermitian=True)
+
+
+def glm_coefficient_draws(size: int, rng) -> np.ndarray:
+    """
+    Samples GLM coefficient vectors from a multivariate normal at the estimates.
+
+    Args:
+        size (int): Number of coefficient vectors.
+        rng (np.random.Generator): Random generator.
+
+    Returns:
+        np.ndarray: (size, 4) draws for Intercept, Gini, Gini2 and Prev_ROW.
+    """
+    return rng.multivariate_normal(np.array(glm_coefficients()), glm_covariance(), size=size)
+
+
+def simulate_row_counts(
+    gini: float,
+    row_prev: float,
+    draws: int = DEFAULT_DRAWS,
+    chunk_size: int = CHUNK_SIZE,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Simulates the predictive distribution of ROW as a histogram of counts.
+
+    Args:
+        gini (float): Team Gini coefficient.
+        row_prev (float): Previous season ROW.
+        draws (int): Total number of simulated seasons.
+        chunk_size (int): Draws generated per vectorized batch.
+        seed (int): Random seed.
+
+    Returns:
+        np.ndarray: counts[k] = number of draws with ROW == k, for k in 0..MAX_ROW.
+    """
+    rng = np.random.default_rng(seed)
+    design = np.array([1.0, gini, gini**2, row_prev])
+    counts = np.zeros(MAX_ROW + 1, dtype=np.int64)
+    remaining = int(draws)
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        lam = np.exp(glm_coefficient_draws(size, rng) @ design)
+        outcomes = np.minimum(rng.poisson(lam), MAX_ROW)
+        counts += np.bincount(outcomes, minlength=MAX_ROW + 1)
+        remaining -= size
+    return counts
+
+
+def row_quantiles(counts: np.ndarray, quantiles=QUANTILES) -> dict:
+    """
+    Reads quantiles off a ROW count histogram.
+
+    Args:
+        counts (np.ndarray): Histogram from simulate_row_counts.
+        quantiles (tuple): Probabilities in [0, 1].
+
+    Returns:
+        dict: Probability -> ROW value, plus "mean".
+    """
+    cdf = np.cumsum(counts) / counts.sum()
+    result = {q: int(np.searchsorted(cdf, q)) for q in quantiles}
+    result["mean"] = float(np.arange(len(counts)) @ counts / counts.sum())
+    return result
+
+
+def row_distribution_fig(counts: np.ndarray, title: str):
+    """
+    Creates a bar chart of the simulated ROW distribution with a 90% band.
+
+    Args:
+        counts (np.ndarray): Histogram from simulate_row_counts.
+        title (str): Figure title.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Plotly figure object.
+    """
+    q = row_quantiles(counts)
+    rows = np.arange(len(counts))
+    probs = counts / counts.sum()
+    keep = counts > 0
+
+    fig = go.Figure(
+        go.Bar(
+            x=rows[keep],
+            y=probs[keep],
+            marker_color=NAVY,
+            hovertemplate="ROW %{x}<br>Probability %{y:.3f}<extra></extra>",
+        )
+    )
+    fig.add_vrect(
+        x0=q[0.05] - 0.5,
+        x1=q[0.95] + 0.5,
+        fillcolor=LIGHT_RED,
+        opacity=0.08,
+        line_width=0,
+    )
+    fig.add_vline(x=q[0.5], line=dict(color=LIGHT_RED, width=2))
+    fig.update_xaxes(title="ROW")
+    fig.update_yaxes(title="Probability", tickformat=".0%")
+    fig = apply_plot_style(fig, title=title)
+    return fig
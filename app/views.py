@@ -0,0 +1,208 @@
+"""
+Output bundles for the NHL Salary Inequality Analysis Dash app.
+
+Each function returns the values one callback writes for a given selection.
+The callbacks call them on user input, and the layout calls them once per data
+version with the default selections, so the first page view arrives fully
+rendered and fires no callback requests.
+"""
+
+# app/views.py
+from app.cube import salary_distribution_trend_fig, salary_range_summary
+from app.export import export_url
+from app.figures import *
+from app.optimizer import optimize_roster
+from app.similar import get_similar_rosters
+from app.simulation import row_distribution_fig, row_quantiles, simulate_row_counts
+from app.whatif import whatif_summary
+
+# How close a roster's Gini must come to the band's low edge to be reported there.
+GINI_EDGE_EPS = 1e-4
+
+
+def team_salary_view(team: str, year: int) -> tuple:
+    """
+    Returns the salary histogram and info box lines for one team-season.
+
+    Args:
+        team (str): Team abbreviation.
+        year (int): Year.
+
+    Returns:
+        tuple: (figure, info line, roster line).
+    """
+    if not team or not year:
+        return {}, "", ""
+    year = int(year)
+    fig = salary_histogram(team, year)
+    name = TEAM_NAME_MAP.get(team, team)
+    g = get_gini(team, year)
+    roster_size = get_roster_size(team, year)
+    info = f"{name} — Gini Coefficient: {g:.3f}" if g == g else f"{name}"
+    roster = (
+        f"Roster Size: {roster_size} players" if roster_size else "Roster Size: N/A"
+    )
+    return fig, info, roster
+
+
+def similar_rosters_view(team: str, year: int) -> list:
+    """
+    Returns the rows of the similar payroll shapes table for one team-season.
+
+    Args:
+        team (str): Team abbreviation.
+        year (int): Year.
+
+    Returns:
+        list: Table records, most similar first.
+    """
+    if not team or not year:
+        return []
+    return get_similar_rosters().nearest(team, int(year), k=5)
+
+
+def whatif_view(roster, team: str, year: int) -> tuple:
+    """
+    Returns the what-if player options and summary line for a roster.
+
+    Args:
+        roster (RosterGini): Roster, edited or not.
+        team (str): Team abbreviation.
+        year (int): Year.
+
+    Returns:
+        tuple: (player dropdown options, summary line).
+    """
+    options = [{"label": p, "value": p} for p in sorted(roster.salaries)]
+    return options, whatif_summary(roster, team, int(year))
+
+
+def row_simulation_view(roster, team: str, year: int) -> tuple:
+    """
+    Returns the simulated ROW distribution and interval line for a roster.
+
+    Args:
+        roster (RosterGini): Roster, edited or not.
+        team (str): Team abbreviation.
+        year (int): Year.
+
+    Returns:
+        tuple: (figure, interval line).
+    """
+    counts = simulate_row_counts(roster.gini, get_prev_row(team, year))
+    q = row_quantiles(counts)
+    name = TEAM_NAME_MAP.get(team, team)
+    fig = row_distribution_fig(
+        counts, title=f"{name} Simulated ROW Distribution — Gini {roster.gini:.3f}"
+    )
+    line = (
+        f"Median ROW {q[0.5]}, 50% interval {q[0.25]}–{q[0.75]}, "
+        f"90% interval {q[0.05]}–{q[0.95]}"
+    )
+    return fig, line
+
+
+def team_trends_view(team: str, year_range: list, metric: str, compare=None, compare_all=None) -> tuple:
+    """
+    Returns the ROW and metric trend figures for a team, or for several teams.
+
+    Args:
+        team (str): Team abbreviation.
+        year_range (list): [start_year, end_year].
+        metric (str): Inequality column name.
+        compare (list): Extra team abbreviations to overlay.
+        compare_all (list): Non-empty to overlay every team.
+
+    Returns:
+        tuple: (ROW figure, metric figure).
+    """
+    if not team or not year_range:
+        return {}, {}
+    if compare_all:
+        compare = [opt["value"] for opt in get_team_options()]
+    if compare:
+        teams = list(dict.fromkeys([team] + list(compare)))
+        return team_comparison_figures(teams, year_range, metric or "Gini")
+    return team_trend_figures(team, year_range, metric or "Gini")
+
+
+def salary_trend_view(team: str, year_range: list) -> tuple:
+    """
+    Returns the cap hit distribution trend and its summary line for a team.
+
+    Args:
+        team (str): Team abbreviation.
+        year_range (list): [start_year, end_year].
+
+    Returns:
+        tuple: (figure, summary line).
+    """
+    if not team or not year_range:
+        return {}, ""
+    name = TEAM_NAME_MAP.get(team, team)
+    fig = salary_distribution_trend_fig(team, year_range, name)
+    return fig, f"{name} — {salary_range_summary(team, year_range)}"
+
+
+def export_links_view(team: str, year_range: list) -> tuple:
+    """
+    Returns the download links for the trend charts' selection.
+
+    Args:
+        team (str): Team abbreviation.
+        year_range (list): [start_year, end_year].
+
+    Returns:
+        tuple: (salary CSV, salary Parquet, team panel CSV, team panel Parquet) links.
+    """
+    return (
+        export_url("salary", "csv", team, year_range),
+        export_url("salary", "parquet", team, year_range),
+        export_url("teams", "csv", None, year_range),
+        export_url("teams", "parquet", None, year_range),
+    )
+
+
+def roster_builder_view(year: int, target: float, size_range: list, row_prev, progress=None) -> tuple:
+    """
+    Runs the roster optimizer and formats its result for the roster builder.
+
+    Args:
+        year (int): Season whose contracts form the player pool.
+        target (float): Target Gini coefficient.
+        size_range (list): [min_size, max_size].
+        row_prev (float): Previous season ROW, or None.
+        progress (callable): Optional progress(done, total) hook.
+
+    Returns:
+        tuple: (figure, info line, detail line).
+    """
+    if not year or target is None or not size_range:
+        return {}, "", ""
+    result = optimize_roster(
+        int(year),
+        target_gini=float(target),
+        row_prev=float(row_prev) if row_prev is not None else None,
+        min_size=size_range[0],
+        max_size=size_range[1],
+        progress=progress,
+    )
+    fig = roster_builder_fig(
+        result["roster"], title=f"Optimized Roster — {int(year)} Contracts"
+    )
+    info = (
+        f"Gini: {result['gini']:.3f} — Predicted ROW: {result['predicted_row']:.1f}"
+    )
+    detail = (
+        f"{result['size']} players, ${result['total']:,.0f} of a "
+        f"${result['cap']:,.0f} cap"
+    )
+    if not result["feasible"]:
+        detail += " (target not reachable within the constraints)"
+    elif result["gini"] <= float(target) - result["gini_tol"] + GINI_EDGE_EPS:
+        # Predicted ROW falls as Gini rises, so the search takes the band's low edge.
+        detail += (
+            f"; Gini sits at the lower edge of the ±{result['gini_tol']:.3f} band, "
+            "where predicted ROW is highest"
+        )
+    return fig, info, detail
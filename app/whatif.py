@@ -0,0 +1,331 @@
+"""
+Incremental Gini tracking for the what-if salary panel.
+
+A roster's Gini coefficient is kept in sync under player inserts, removals and
+cap hit edits without re-sorting. With D the sum of pairwise absolute salary
+differences and S the payroll,
+
+    G = D / (n * S)
+
+and inserting (or removing) a salary v changes D by sum_j |v - x_j|, which is
+answered from the count and sum of salaries below v. Those prefix queries are
+served by two Fenwick trees over slots of a fixed, sorted key space of observed
+cap hits; a slot holds every salary between its key and the next, and only the
+slot containing v is scanned. Every edit therefore costs O(log U) plus the
+occupancy of one slot, with no rebuilds when unseen cap hits are entered.
+"""
+
+# app/whatif.py
+import threading
+import uuid
+from bisect import bisect_right
+from collections import OrderedDict
+
+import numpy as np
+
+from app.data import current, per_version
+from app.figures import get_prev_row, predict_row
+
+MAX_SESSIONS = 512
+
+
+@per_version
+def _default_keys(data):
+    """
+    Returns every distinct cap hit in the salary data, sorted, once per version.
+
+    Using observed contracts as slot boundaries keeps almost every slot down to
+    a single distinct value.
+    """
+    keys = set()
+    for season in data.salary.iter_seasons():
+        keys.update(season["Cap Hit"].tolist())
+    return sorted(keys)
+
+
+class _Fenwick:
+    """Binary indexed tree holding a count and a sum per key slot."""
+
+    def __init__(self, size):
+        self.size = size
+        self.counts = [0] * (size + 1)
+        self.sums = [0.0] * (size + 1)
+
+    def add(self, index, count, amount):
+        i = index + 1
+        while i <= self.size:
+            self.counts[i] += count
+            self.sums[i] += amount
+            i += i & -i
+
+    def prefix(self, index):
+        """Returns (count, sum) over slots [0, index)."""
+        count, total = 0, 0.0
+        i = index
+        while i > 0:
+            count += self.counts[i]
+            total += self.sums[i]
+            i -= i & -i
+        return count, total
+
+    def copy(self):
+        tree = _Fenwick.__new__(_Fenwick)
+        tree.size, tree.counts, tree.sums = self.size, list(self.counts), list(self.sums)
+        return tree
+
+
+class RosterGini:
+    """
+    Order-statistics view of one roster with an always-current Gini coefficient.
+
+    Args:
+        salaries (dict): Player name -> cap hit.
+        keys (list): Sorted cap hits that delimit the Fenwick slots.
+    """
+
+    def __init__(self, salaries=None, keys=None):
+        self.salaries = {}
+        self.n = 0
+        self.total = 0.0
+        self.pair_sum = 0.0
+        self._keys = keys if keys is not None else _default_keys()
+        self._slots = {}
+        self._tree = _Fenwick(max(len(self._keys), 1))
+        for player, salary in (salaries or {}).items():
+            self.insert(player, salary)
+
+    @classmethod
+    def from_team(cls, team: str, year: int):
+        """
+        Builds the structure from a team's contracts for a season.
+
+        Args:
+            team (str): Team abbreviation.
+            year (int): Year.
+
+        Returns:
+            RosterGini: Structure holding the team's roster.
+        """
+        df_salary = current().salary.season(year)
+        sub = df_salary[df_salary["Team"] == team]
+        return cls(dict(zip(sub["Player"], sub["Cap Hit"])))
+
+    @property
+    def gini(self) -> float:
+        if self.n == 0 or self.total <= 0:
+            return 0.0
+        return self.pair_sum / (self.n * self.total)
+
+    def predicted_row(self, row_prev: float) -> float:
+        """
+        Returns the GLM-predicted ROW for the roster's current Gini.
+
+        Args:
+            row_prev (float): Previous season ROW.
+
+        Returns:
+            float: Predicted ROW.
+        """
+        return float(predict_row(self.gini, row_prev))
+
+    def _slot(self, salary):
+        return max(bisect_right(self._keys, salary) - 1, 0)
+
+    def _abs_dev_sum(self, salary):
+        """Returns sum_j |salary - x_j| over the current roster."""
+        slot = self._slot(salary)
+        below_count, below_sum = self._tree.prefix(slot)
+        for x in self._slots.get(slot, ()):
+            if x <= salary:
+                below_count += 1
+                below_sum += x
+        above_count = self.n - below_count
+        above_sum = self.total - below_sum
+        return (
+            salary * below_count - below_sum + above_sum - salary * above_count
+        )
+
+    def insert(self, player: str, salary: float):
+        """
+        Adds a player to the roster.
+
+        Args:
+            player (str): Player name; must not already be on the roster.
+            salary (float): Cap hit.
+        """
+        if player in self.salaries:
+            raise KeyError(f"{player} is already on the roster.")
+        salary = float(salary)
+        slot = self._slot(salary)
+        self.pair_sum += self._abs_dev_sum(salary)
+        self._tree.add(slot, 1, salary)
+        self._slots.setdefault(slot, []).append(salary)
+        self.salaries[player] = salary
+        self.n += 1
+        self.total += salary
+
+    def remove(self, player: str):
+        """
+        Drops a player from the roster.
+
+        Args:
+            player (str): Player name.
+        """
+        salary = self.salaries.pop(player)
+        slot = self._slot(salary)
+        self._tree.add(slot, -1, -salary)
+        self._slots[slot].remove(salary)
+        self.n -= 1
+        self.total -= salary
+        self.pair_sum -= self._abs_dev_sum(salary)
+
+    def update(self, player: str, salary: float):
+        """
+        Changes a player's cap hit.
+
+        Args:
+            player (str): Player name.
+            salary (float): New cap hit.
+        """
+        if self.salaries.get(player) == float(salary):
+            return
+        self.remove(player)
+        self.insert(player, salary)
+
+    def copy(self):
+        """
+        Returns an independent copy that can be edited without affecting this one.
+
+        Returns:
+            RosterGini: Copy of the roster.
+        """
+        clone = RosterGini.__new__(RosterGini)
+        clone.salaries = dict(self.salaries)
+        clone.n, clone.total, clone.pair_sum = self.n, self.total, self.pair_sum
+        clone._keys = self._keys
+        clone._slots = {slot: list(xs) for slot, xs in self._slots.items()}
+        clone._tree = self._tree.copy()
+        return clone
+
+    def recompute_gini(self) -> float:
+        """
+        Computes the Gini coefficient from scratch; used to check the incremental value.
+
+        Returns:
+            float: Gini coefficient.
+        """
+        x = np.sort(np.fromiter(self.salaries.values(), dtype=float))
+        n, total = len(x), x.sum()
+        if n == 0 or total <= 0:
+            return 0.0
+        return float(np.sum((2 * np.arange(1, n + 1) - n - 1) * x) / (n * total))
+
+
+class WhatIfSessions:
+    """
+    Bounded, thread-safe map of session id -> RosterGini.
+
+    Clients keep the session id, team, year and their edit log; a worker that
+    has not seen the session (or has evicted it) replays the edits once.
+    Edits are copy-on-write: a roster handed out is never mutated again, so
+    callbacks on other threads can read it without locking.
+    """
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, team: str, year: int) -> dict:
+        """
+        Opens a new what-if session on a team's roster.
+
+        Args:
+            team (str): Team abbreviation.
+            year (int): Year.
+
+        Returns:
+            dict: Client-side session state (id, team, year, edits).
+        """
+        state = {"id": uuid.uuid4().hex, "team": team, "year": int(year), "edits": []}
+        self.get(state)
+        return state
+
+    def get(self, state: dict) -> RosterGini:
+        """
+        Returns the live roster for a session, rebuilding it if needed.
+
+        Args:
+            state (dict): Client-side session state.
+
+        Returns:
+            RosterGini: The session's roster.
+        """
+        with self._lock:
+            roster = self._sessions.get(state["id"])
+            if roster is not None:
+                self._sessions.move_to_end(state["id"])
+                return roster
+        roster = RosterGini.from_team(state["team"], state["year"])
+        for player, salary in state["edits"]:
+            _apply(roster, player, salary)
+        with self._lock:
+            self._sessions[state["id"]] = roster
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return roster
+
+    def edit(self, state: dict, player: str, salary) -> RosterGini:
+        """
+        Applies one edit: a new cap hit, a new player, or removal when salary is None.
+
+        Args:
+            state (dict): Client-side session state; its edit log is appended to.
+            player (str): Player name.
+            salary (float or None): Cap hit, or None to remove the player.
+
+        Returns:
+            RosterGini: The updated roster.
+        """
+        roster = self.get(state)
+        if salary is not None and roster.salaries.get(player) == float(salary):
+            return roster
+        with self._lock:
+            roster = self._sessions.get(state["id"], roster).copy()
+            _apply(roster, player, salary)
+            self._sessions[state["id"]] = roster
+        state["edits"].append([player, salary])
+        return roster
+
+
+def _apply(roster, player, salary):
+    if salary is None:
+        if player in roster.salaries:
+            roster.remove(player)
+    elif player in roster.salaries:
+        roster.update(player, salary)
+    else:
+        roster.insert(player, salary)
+
+
+sessions = WhatIfSessions()
+
+
+def whatif_summary(roster: RosterGini, team: str, year: int) -> str:
+    """
+    Formats the live Gini and predicted ROW line for the what-if panel.
+
+    Args:
+        roster (RosterGini): Edited roster.
+        team (str): Team abbreviation.
+        year (int): Year.
+
+    Returns:
+        str: Summary text.
+    """
+    row_prev = get_prev_row(team, year)
+    return (
+        f"What-if Gini: {roster.gini:.3f} — Predicted ROW: "
+        f"{roster.predicted_row(row_prev):.1f} — "
+        f"{roster.n} players, ${roster.total:,.0f}"
+    )
@@ -0,0 +1,13 @@
+# gunicorn.conf.py
+# Load data and warm caches once in the master; workers fork with them in place.
+preload_app = True
+
+
+def post_fork(server, worker):
+    # SQLite connections must not cross a fork; the stores reopen lazily.
+    from app.app import callback_memo
+    from app.jobs import background_manager
+
+    background_manager.handle.close()
+    if callback_memo.disk is not None:
+        callback_memo.disk.close()
@@ -0,0 +1,184 @@
+"""
+Replays first page views and reports server load and time-to-interactive.
+
+Usage:
+    python tests/bench_pageview.py [--views N] [--rtt MS]
+
+A page view is replayed the way the Dash renderer issues it: the index page,
+then /_dash-layout and /_dash-dependencies, then rounds of callback requests.
+The first round holds every callback without prevent_initial_call whose input
+components are in the layout; a callback whose inputs are outputs of another
+pending callback waits for it, as in the renderer. Each response's changed
+outputs trigger the callbacks listening to them in the next round.
+
+Reported per page view (median over N views, after one warm-up view):
+
+- requests, callback requests, rounds and bytes sent;
+- server time: wall time spent in the Flask app for all requests, i.e. the
+  load one page view puts on a worker;
+- time-to-interactive: the request waterfall's critical path, with every
+  phase paying one network round trip (--rtt) plus its slowest request,
+  assuming a browser's parallel connections and a server thread per request.
+  JavaScript parsing and rendering are not included; no browser is driven.
+"""
+
+# tests/bench_pageview.py
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("SKIP_WARMUP", "1")
+
+from app.app import server  # noqa: E402
+
+MAX_ROUNDS = 20
+
+
+def _walk(node, values, ids):
+    """Collects the ids and initial props of every component with a string id."""
+    if isinstance(node, list):
+        for child in node:
+            _walk(child, values, ids)
+    elif isinstance(node, dict):
+        props = node.get("props") if "type" in node else None
+        if props is None:
+            for child in node.values():
+                _walk(child, values, ids)
+            return
+        if isinstance(props.get("id"), str):
+            ids.add(props["id"])
+            for name, value in props.items():
+                values[f"{props['id']}.{name}"] = value
+        for child in props.values():
+            _walk(child, values, ids)
+
+
+def _outputs(dep) -> list:
+    output = dep["output"]
+    return output.strip(".").split("...") if output.startswith("..") else [output]
+
+
+def _request(client, dep, values, changed):
+    def prop(item):
+        key = f"{item['id']}.{item['property']}"
+        return dict(item, value=values.get(key))
+
+    outputs = [dict(zip(("id", "property"), o.split("."))) for o in _outputs(dep)]
+    body = {
+        "output": dep["output"],
+        "outputs": outputs if dep["output"].startswith("..") else outputs[0],
+        "inputs": [prop(i) for i in dep["inputs"]],
+        "state": [prop(s) for s in dep["state"]],
+        "changedPropIds": sorted(changed),
+    }
+    start = time.perf_counter()
+    response = client.post("/_dash-update-component", json=body)
+    elapsed = time.perf_counter() - start
+    updates = {}
+    if response.status_code == 200 and response.mimetype == "application/json":
+        for component, props in (response.get_json().get("response") or {}).items():
+            for name, value in props.items():
+                updates[f"{component}.{name}"] = value
+    return elapsed, len(response.get_data()), updates
+
+
+def page_view(client) -> dict:
+    """
+    Replays one first page view.
+
+    Returns:
+        dict: requests, callbacks, rounds, bytes, server_ms and the critical
+        path of server time per phase (phases).
+    """
+    stats = {"requests": 0, "callbacks": 0, "rounds": 0, "bytes": 0, "server_ms": 0.0}
+    phases = []
+
+    def get(path):
+        start = time.perf_counter()
+        response = client.get(path)
+        elapsed = time.perf_counter() - start
+        stats["requests"] += 1
+        stats["bytes"] += len(response.get_data())
+        stats["server_ms"] += elapsed * 1000
+        return response, elapsed
+
+    _, index_time = get("/")
+    phases.append(index_time)
+    layout, layout_time = get("/_dash-layout")
+    dependencies, deps_time = get("/_dash-dependencies")
+    phases.append(max(layout_time, deps_time))
+
+    values, ids = {}, set()
+    _walk(json.loads(layout.get_data()), values, ids)
+    deps = [d for d in dependencies.get_json() if not d.get("clientside_function")]
+
+    def present(dep):
+        return all(i["id"] in ids for i in dep["inputs"])
+
+    pending = {i: set() for i, d in enumerate(deps) if not d.get("prevent_initial_call") and present(d)}
+    while pending and stats["rounds"] < MAX_ROUNDS:
+        produced = {out: i for i in pending for out in _outputs(deps[i])}
+        ready = [
+            i
+            for i in pending
+            if not any(
+                produced.get(f"{inp['id']}.{inp['property']}", i) != i for inp in deps[i]["inputs"]
+            )
+        ] or list(pending)
+        changed_props = {}
+        slowest = 0.0
+        for i in ready:
+            elapsed, size, updates = _request(client, deps[i], values, pending.pop(i))
+            stats["callbacks"] += 1
+            stats["requests"] += 1
+            stats["bytes"] += size
+            stats["server_ms"] += elapsed * 1000
+            slowest = max(slowest, elapsed)
+            for key, value in updates.items():
+                if values.get(key) != value:
+                    changed_props[key] = value
+        values.update(changed_props)
+        stats["rounds"] += 1
+        phases.append(slowest)
+        for i, dep in enumerate(deps):
+            triggers = {
+                f"{inp['id']}.{inp['property']}"
+                for inp in dep["inputs"]
+                if f"{inp['id']}.{inp['property']}" in changed_props
+            }
+            if triggers:
+                pending.setdefault(i, set()).update(triggers)
+    stats["phases"] = phases
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--views", type=int, default=20, help="page views to replay")
+    parser.add_argument("--rtt", type=float, default=50.0, help="network round trip, ms")
+    args = parser.parse_args()
+
+    client = server.test_client()
+    page_view(client)
+    views = [page_view(client) for _ in range(args.views)]
+    for view in views:
+        view["tti_ms"] = sum(args.rtt + phase * 1000 for phase in view["phases"])
+
+    def median(key):
+        return statistics.median(view[key] for view in views)
+
+    print(f"{args.views} page views, rtt {args.rtt:g} ms (medians)")
+    print(f"  requests            {median('requests'):.0f}")
+    print(f"  callback requests   {median('callbacks'):.0f} in {median('rounds'):.0f} rounds")
+    print(f"  bytes sent          {median('bytes'):,.0f} (uncompressed)")
+    print(f"  server time         {median('server_ms'):.1f} ms per page view")
+    print(f"  time-to-interactive {median('tti_ms'):.1f} ms (request waterfall)")
+
+
+if __name__ == "__main__":
+    main()
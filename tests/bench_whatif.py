@@ -0,0 +1,66 @@
+"""
+Times RosterGini edits against recomputing the Gini from scratch.
+
+Usage:
+    python tests/bench_whatif.py [--edits N]
+
+For each roster size, applies the same random cap hit updates twice: once
+through RosterGini.update (incremental) and once by updating a plain dict and
+calling recompute_gini (full sort), and reports microseconds per edit.
+"""
+
+# tests/bench_whatif.py
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.data import current  # noqa: E402
+from app.whatif import RosterGini  # noqa: E402
+
+SIZES = (25, 100, 1_000, 10_000)
+
+
+def bench(size: int, edits: int, rng: random.Random) -> tuple:
+    """
+    Returns (incremental, recompute) microseconds per edit for one roster size.
+
+    Args:
+        size (int): Players on the roster.
+        edits (int): Updates to apply.
+        rng (random.Random): Source of players and cap hits.
+    """
+    pool = [x for season in current().salary.iter_seasons() for x in season["Cap Hit"].tolist()]
+    roster = RosterGini({f"p{i}": rng.choice(pool) for i in range(size)})
+    plan = [(f"p{rng.randrange(size)}", rng.choice(pool)) for _ in range(edits)]
+
+    start = time.perf_counter()
+    for player, salary in plan:
+        roster.update(player, salary)
+        roster.gini
+    incremental = (time.perf_counter() - start) / edits * 1e6
+
+    start = time.perf_counter()
+    for player, salary in plan:
+        roster.salaries[player] = salary
+        roster.recompute_gini()
+    recompute = (time.perf_counter() - start) / edits * 1e6
+    return incremental, recompute
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--edits", type=int, default=2_000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    print(f"{'players':>8} {'incremental us':>15} {'recompute us':>13} {'speed-up':>9}")
+    for size in SIZES:
+        incremental, recompute = bench(size, args.edits, rng)
+        print(f"{size:>8} {incremental:>15.1f} {recompute:>13.1f} {recompute / incremental:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# Lets `pytest` import the app package without installing it.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,131 @@
+"""
+Stress test: callbacks run in parallel threads return the same bytes as serially.
+
+Builds a mix of callback requests from /_dash-dependencies, runs it through
+thread pools of several sizes, then serially, and compares response bodies.
+The response memo is disabled so every request executes its callback, and the
+parallel passes run first so per-version caches are built under contention.
+Callbacks holding server-side state (what-if sessions) or running as
+background jobs are left out, since their responses legitimately differ.
+"""
+
+# tests/test_concurrency.py
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+os.environ.setdefault("SKIP_WARMUP", "1")
+
+from app.app import callback_memo, server  # noqa: E402
+from app.callbacks import UNMEMOIZED_OUTPUTS  # noqa: E402
+from app.figures import get_available_years, get_team_options  # noqa: E402
+from app.players import get_player_index  # noqa: E402
+
+THREADS = (4, 8)
+ROUNDS = 6
+
+
+def _dependency(deps, output):
+    return next(d for d in deps if output in d["output"])
+
+
+def _body(dep, changed, values):
+    def prop(item):
+        return dict(item, value=values.get(f"{item['id']}.{item['property']}"))
+
+    output = dep["output"]
+    if output.startswith(".."):
+        outputs = [dict(zip(("id", "property"), o.split("."))) for o in output.strip(".").split("...")]
+    else:
+        outputs = dict(zip(("id", "property"), output.split(".")))
+    return {
+        "output": output,
+        "outputs": outputs,
+        "inputs": [prop(i) for i in dep["inputs"]],
+        "state": [prop(s) for s in dep.get("state", [])],
+        "changedPropIds": [changed],
+    }
+
+
+def _requests(deps, rng):
+    teams = [o["value"] for o in get_team_options()]
+    years = sorted(int(y) for y in get_available_years())
+    players = get_player_index().search("a")[:20]
+    select = _dependency(deps, "ts-team.value")
+    scatter = _dependency(deps, "logo-scatter-graph.figure")
+    lorenz = _dependency(deps, "lorenz-graph.figure")
+    contracts = _dependency(deps, "contracts-graph.figure")
+    career = _dependency(deps, "player-career-graph.figure")
+    tabs = _dependency(deps, "model-tab-content.children")
+    for dep in (select, scatter, lorenz, contracts, career, tabs):
+        # The team selection also resets the what-if panel, through duplicate
+        # ("@hash") outputs the memo does not exclude.
+        assert not set(dep["output"].strip(".").split("...")) & UNMEMOIZED_OUTPUTS
+
+    bodies = []
+    for _ in range(ROUNDS):
+        team, year = rng.choice(teams), rng.choice(years)
+        start = rng.choice(years[:-1])
+        selection = {
+            "ts-team.value": team,
+            "ts-year.value": year,
+            "trend-team.value": team,
+            "trend-years.value": [start, rng.choice([y for y in years if y > start])],
+            "trend-metric.value": rng.choice(["Gini", "Theil", "HHI"]),
+            "trend-compare.value": rng.sample(teams, rng.choice([0, 2])),
+            "trend-compare-all.value": [],
+        }
+        click = {"points": [{"customdata": [rng.choice(teams), year]}]}
+        bodies += [
+            _body(select, "ts-team.value", selection),
+            _body(select, "trend-metric.value", selection),
+            _body(select, "logo-scatter-graph.clickData", dict(selection, **{"logo-scatter-graph.clickData": click})),
+            _body(
+                scatter,
+                "logo-metric-dropdown.value",
+                {
+                    "logo-year-dropdown.value": year,
+                    "logo-metric-dropdown.value": rng.choice(["Gini", "Top3Share"]),
+                    "logo-animate.value": rng.choice([[], ["on"]]),
+                },
+            ),
+            _body(
+                lorenz,
+                "lorenz-teams.value",
+                {"lorenz-teams.value": rng.sample(teams, 2), "lorenz-years.value": [year]},
+            ),
+            _body(contracts, "contracts-x.value", {"contracts-x.value": rng.choice(["ROW", "Gini"])}),
+            _body(career, "player-search.value", {"player-search.value": rng.choice(players)}),
+            _body(tabs, "model-tabs.value", {"model-tabs.value": rng.choice(["overview", "glm", "gmm"])}),
+        ]
+    rng.shuffle(bodies)
+    return bodies
+
+
+def _post(body):
+    response = server.test_client().post("/_dash-update-component", json=body)
+    assert response.status_code == 200, response.get_data()[:300]
+    return response.get_data()
+
+
+@pytest.fixture
+def no_memo(monkeypatch):
+    monkeypatch.setattr(callback_memo, "max_bytes", 0)
+    monkeypatch.setattr(callback_memo, "disk", None)
+
+
+def test_parallel_callbacks_match_serial(no_memo):
+    deps = server.test_client().get("/_dash-dependencies").get_json()
+    bodies = _requests(deps, random.Random(0))
+
+    parallel = {}
+    for threads in THREADS:
+        with ThreadPoolExecutor(threads) as pool:
+            parallel[threads] = list(pool.map(_post, bodies))
+    serial = [_post(body) for body in bodies]
+
+    for threads, results in parallel.items():
+        mismatches = [body["output"] for body, a, b in zip(bodies, results, serial) if a != b]
+        assert not mismatches, f"{threads} threads: {len(mismatches)} mismatches: {mismatches[:3]}"
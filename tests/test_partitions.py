@@ -0,0 +1,164 @@
+"""
+Checks the season-partitioned salary table and the aggregates built from it.
+
+Aggregates are built one season at a time; each must match a build over the
+whole table in one frame, and salary exports must match filtering that table.
+Partition files written for one version must stay readable until the version
+after the next one is written.
+"""
+
+# tests/test_partitions.py
+import io
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.cube import SalaryCube
+from app.data import SalaryPartitions, _replace_raw_season, current
+from app.export import csv_chunks, salary_selections
+from app.lorenz import LorenzCurves
+from app.players import PlayerIndex
+from app.pipeline import (
+    DATA_DIR,
+    SALARY_FILE,
+    SALARY_SCHEMA,
+    TEAMS_FILE,
+    read_processed,
+    write_processed,
+)
+from app.similar import SimilarRosters
+
+
+@pytest.fixture(scope="module")
+def whole():
+    return pd.concat(list(current().salary.iter_seasons()), ignore_index=True)
+
+
+def test_partitions_cover_the_table(whole):
+    salary = current().salary
+    assert list(salary) == sorted(whole["Year"].unique())
+    for year in salary:
+        season = salary[year]
+        assert (season["Year"] == year).all()
+        assert season.dtypes.to_dict() == {c: season[c].dtype for c in SALARY_SCHEMA}
+    empty = salary.season(1900)
+    assert empty.empty and list(empty.columns) == list(SALARY_SCHEMA)
+    with pytest.raises(KeyError):
+        salary[1900]
+
+
+def test_cube_matches_one_frame(whole):
+    by_season = SalaryCube(current().salary.iter_seasons())
+    one = SalaryCube([whole])
+    assert by_season.teams == one.teams
+    np.testing.assert_array_equal(by_season.years, one.years)
+    np.testing.assert_array_equal(by_season.count, one.count)
+    np.testing.assert_array_equal(by_season.sketch, one.sketch)
+    np.testing.assert_allclose(by_season.total, one.total)
+    np.testing.assert_allclose(by_season.sumsq, one.sumsq)
+
+
+def test_curves_and_features_match_one_frame(whole):
+    seasons = list(current().salary.iter_seasons())
+    lorenz, lorenz_one = LorenzCurves(seasons), LorenzCurves([whole])
+    assert lorenz.keys == lorenz_one.keys
+    np.testing.assert_array_equal(lorenz.curves, lorenz_one.curves)
+    teams = current().teams
+    similar, similar_one = SimilarRosters(seasons, teams), SimilarRosters([whole], teams)
+    assert similar.keys == similar_one.keys
+    np.testing.assert_array_equal(similar.features, similar_one.features)
+    team, year = similar.keys[0]
+    assert similar.nearest(team, year) == similar_one.nearest(team, year)
+
+
+@pytest.mark.parametrize("team, year_range", [(None, None), ("NYR", None), ("PIT", (2018, 2020))])
+def test_salary_export_matches_filter(whole, team, year_range):
+    selections = salary_selections(current().salary, team, year_range)
+    exported = pd.read_csv(io.BytesIO(b"".join(csv_chunks(whole, selections))))
+    expected = whole
+    if team is not None:
+        expected = expected[expected["Team"] == team]
+    if year_range is not None:
+        expected = expected[expected["Year"].between(*year_range)]
+    if team is not None:
+        expected = expected.sort_values(["Team", "Year"], kind="stable")
+    assert exported["Player"].tolist() == expected["Player"].astype(str).tolist()
+    np.testing.assert_array_equal(exported["Cap Hit"], expected["Cap Hit"])
+
+
+def test_cache_is_bounded(tmp_path, whole):
+    years = sorted(whole["Year"].unique())[:4]
+    sources = {}
+    for year in years:
+        path = tmp_path / f"{year}.parquet"
+        whole[whole["Year"] == year].to_parquet(path, index=False)
+        sources[year] = path
+    salary = SalaryPartitions(sources, cache_size=2)
+    for year in years:
+        salary[year]
+    assert list(salary._cache) == years[-2:]
+    list(salary.iter_seasons())
+    assert list(salary._cache) == years[-2:]
+
+    year = years[0]
+    replaced = salary.replace(year, salary[year].iloc[:3])
+    assert len(replaced[year]) == 3 and len(salary[year]) > 3
+    assert year not in salary.replace(year, salary[year].iloc[:0])
+
+
+def test_superseded_partition_outlives_one_manifest(tmp_path, whole):
+    for name in (SALARY_FILE, TEAMS_FILE):
+        shutil.copy(DATA_DIR / name, tmp_path / name)
+    teams = current().teams
+    years = sorted(whole["Year"].unique())[:3]
+    seasons = {year: whole[whole["Year"] == year].reset_index(drop=True) for year in years}
+    write_processed(teams, seasons, 1, tmp_path)
+    _, files_v1 = read_processed(1, tmp_path)
+
+    year = years[0]
+    write_processed(teams, {year: seasons[year].iloc[:3]}, 2, tmp_path, seasons=[year])
+    _, files_v2 = read_processed(2, tmp_path)
+    assert files_v2[year] != files_v1[year]
+    assert files_v2[years[1]] == files_v1[years[1]]
+    # A reader still on version 1 keeps reading version 1 rows.
+    pd.testing.assert_frame_equal(
+        SalaryPartitions(files_v1)[year].reset_index(drop=True), seasons[year]
+    )
+    assert len(SalaryPartitions(files_v2)[year]) == 3
+
+    write_processed(teams, {}, 3, tmp_path, seasons=[year])
+    _, files_v3 = read_processed(3, tmp_path)
+    assert year not in files_v3
+    assert files_v2[year].is_file() and not files_v1[year].is_file()
+
+
+def test_career_matches_filter_without_reading_partitions(whole, monkeypatch):
+    index = PlayerIndex(current().salary)
+    monkeypatch.setattr("app.data.read_partition", lambda path: pytest.fail("partition read"))
+    for player in index.names[::97]:
+        expected = whole[whole["Player"] == player].sort_values(["Year", "Cap Hit"], kind="stable")
+        pd.testing.assert_frame_equal(
+            index.career(player).reset_index(drop=True), expected.reset_index(drop=True)
+        )
+    assert index.career("No Such Player").empty
+
+
+def test_raw_rewrite_copies_other_seasons_verbatim(tmp_path):
+    source = DATA_DIR / SALARY_FILE
+    lines = source.read_text(encoding="utf-8-sig").splitlines()
+    year = 2019
+    contracts = pd.DataFrame(
+        {
+            "Season": ["2019-20"],
+            "Player": ["New Player"],
+            "Year": [year],
+            "Team": ["ANA"],
+            "Cap Hit": [750000],
+        }
+    )
+    _replace_raw_season(source, year, contracts, tmp_path / SALARY_FILE)
+    written = (tmp_path / SALARY_FILE).read_text(encoding="utf-8-sig").splitlines()
+    kept = [line for line in lines[1:] if line.split(",")[2] != str(year)]
+    assert written == [lines[0], *kept, "2019-20,New Player,2019,ANA,750000"]
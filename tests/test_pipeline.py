@@ -0,0 +1,42 @@
+"""
+Checks that clean_salary drops malformed raw rows instead of failing on them.
+"""
+
+# tests/test_pipeline.py
+import pandas as pd
+import pytest
+
+from app.pipeline import clean_salary
+
+
+def _raw(**overrides):
+    rows = {
+        "Season": ["2024-25", "2024-25", "2024-25"],
+        "Player": ["Player A", "Player B", "Player C"],
+        "Year": [2024, 2024, 2024],
+        "Team": ["NYR", "NYR", "NYR"],
+        "Cap Hit": ["$8,625,000", "$1,000,000", "$775,000"],
+    }
+    for column, values in overrides.items():
+        rows[column] = values
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("year", [None, "", "TBD"])
+def test_bad_year_row_is_dropped(year):
+    salary = clean_salary(_raw(Year=[2024, year, 2024]))
+    assert salary["Player"].tolist() == ["Player A", "Player C"]
+    assert salary["Season"].tolist() == ["2024-25", "2024-25"]
+
+
+def test_bad_year_row_without_season_is_dropped():
+    salary = clean_salary(_raw(Year=[2024, None, 2024]).drop(columns="Season"))
+    assert salary["Player"].tolist() == ["Player A", "Player C"]
+    assert salary["Season"].tolist() == ["2024-25", "2024-25"]
+
+
+@pytest.mark.parametrize("cap_hit", [None, "N/A", ""])
+def test_bad_cap_hit_row_is_dropped(cap_hit):
+    salary = clean_salary(_raw(**{"Cap Hit": ["$8,625,000", cap_hit, "$775,000"]}))
+    assert salary["Player"].tolist() == ["Player A", "Player C"]
+    assert salary["Cap Hit"].tolist() == [8_625_000.0, 775_000.0]
@@ -0,0 +1,71 @@
+"""
+Checks the incremental Gini of RosterGini against a full recomputation.
+"""
+
+# tests/test_whatif.py
+import random
+
+import pytest
+
+from app.data import current
+from app.whatif import RosterGini
+
+EDITS = 2_000
+
+
+def _random_edits(roster, rng, salaries, edits=EDITS):
+    """Applies random inserts, removals and updates, checking the Gini after each."""
+    next_id = 0
+    for _ in range(edits):
+        op = rng.random()
+        if op < 0.4 or roster.n == 0:
+            next_id += 1
+            roster.insert(f"player-{next_id}", rng.choice(salaries))
+        elif op < 0.7:
+            roster.remove(rng.choice(list(roster.salaries)))
+        else:
+            roster.update(rng.choice(list(roster.salaries)), rng.choice(salaries))
+        assert roster.gini == pytest.approx(roster.recompute_gini(), abs=1e-9)
+        assert roster.n == len(roster.salaries)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edits_on_team_roster(seed):
+    rng = random.Random(seed)
+    teams = current().teams
+    team, year = teams.sample(1, random_state=seed)[["Team", "Year"]].iloc[0]
+    roster = RosterGini.from_team(team, int(year))
+    assert roster.gini == pytest.approx(roster.recompute_gini(), abs=1e-12)
+    observed = [x for season in current().salary.iter_seasons() for x in season["Cap Hit"].tolist()]
+    # Observed contracts, plus values between, below and above the slot keys.
+    salaries = observed + [rng.uniform(0, 2e7) for _ in range(200)] + [0.0, 1.0, 5e7]
+    _random_edits(roster, rng, salaries)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_edits_with_coarse_slots(seed):
+    # Few keys put many salaries in each slot, exercising the in-slot scan.
+    rng = random.Random(seed)
+    roster = RosterGini(keys=[0.0, 1e6, 5e6])
+    salaries = [round(rng.uniform(0, 1.2e7), -3) for _ in range(50)]
+    _random_edits(roster, rng, salaries)
+
+
+def test_copy_is_independent():
+    roster = RosterGini({"a": 1e6, "b": 3e6, "c": 8e6})
+    clone = roster.copy()
+    clone.update("a", 9e6)
+    clone.remove("b")
+    assert roster.gini == pytest.approx(roster.recompute_gini(), abs=1e-12)
+    assert clone.gini == pytest.approx(clone.recompute_gini(), abs=1e-12)
+    assert roster.salaries == {"a": 1e6, "b": 3e6, "c": 8e6}
+
+
+def test_empty_and_duplicate_player():
+    roster = RosterGini()
+    assert roster.gini == 0.0
+    roster.insert("a", 1e6)
+    with pytest.raises(KeyError):
+        roster.insert("a", 2e6)
+    roster.remove("a")
+    assert roster.gini == 0.0 and roster.n == 0